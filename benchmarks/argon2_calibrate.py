@@ -0,0 +1,45 @@
+"""
+Pick argon2 parameters for THIS machine: the largest time_cost whose
+hash stays within a latency budget ( memory is lowered only when even
+time_cost=1 is over it ). Prints the ARGON2_* lines for the .env read
+by utils/password_hashing.py.
+
+Run on the production hardware, not a laptop:
+
+    python -m benchmarks.argon2_calibrate --target-ms 250 --memory-mib 64 --parallelism 4
+
+Stored hashes made with other parameters keep working and are rehashed
+on the next successful login.
+"""
+import argparse
+
+from structured_files.utils.password_hashing import calibrate, ph
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--memory-mib", type=int, default=64)
+    parser.add_argument("--parallelism", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"current: time_cost={ph.time_cost} memory_cost={ph.memory_cost} "
+        f"parallelism={ph.parallelism}"
+    )
+
+    result = calibrate(
+        args.target_ms,
+        memory_cost=args.memory_mib * 1024,
+        parallelism=args.parallelism,
+        samples=args.samples,
+    )
+    print(f"hash ≈ {result['hash_ms']} ms ( budget {args.target_ms} ms )")
+    print(f"ARGON2_TIME_COST={result['time_cost']}")
+    print(f"ARGON2_MEMORY_COST={result['memory_cost']}")
+    print(f"ARGON2_PARALLELISM={result['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+p50 / p95 of /get/category/feed on a seeded category.
+
+Needs the same .env as the API ( for --seed / --cleanup ) and a running API.
+Run it once on the commit before the parallel-bucket change and once after,
+with the same seed data:
+
+    python -m benchmarks.category_feed_latency --auth-token <token> \\
+        --category <title> --user-ids <u1> <u2> ... --seed --label before
+    python -m benchmarks.category_feed_latency --auth-token <token> \\
+        --category <title> --label after --cleanup
+
+--seed inserts --posts posts spread over the last 48h across the given
+authors ( few authors → the creator cap rejects a lot, which is what the
+over-fetch is for ), --cleanup deletes every post this script inserted
+( they are tagged with BENCH_TITLE ).
+
+Every request sends a distinct last_seen so it misses the shared bucket
+cache and measures the database path; --warm measures the cached path.
+Server-side stage timings come from the endpoint's debug output.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from structured_files.config.supabase_config import supabase
+from structured_files.services.category_registry import registry
+
+from .load import summarize, print_row, percentile
+
+BENCH_TITLE = "__bench_category_feed__"
+
+
+async def seed(category: str, user_ids, total: int):
+    cat = await registry.resolve(category)
+    if not cat:
+        raise SystemExit(f"category '{category}' not found")
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for _ in range(total):
+        ts = (now - timedelta(minutes=random.randint(1, 48 * 60 - 1))).isoformat()
+        uid = random.choice(user_ids)
+        rows.append({
+            "post_id": str(uuid.uuid4()),
+            "post_title": BENCH_TITLE,
+            "post_content": "benchmark post",
+            "category": cat["cat_id"],
+            "user_id": uid,
+            "created_at": ts,
+            "modified_at": ts,
+            "created_by": uid,
+            "modified_by": uid,
+        })
+
+    for i in range(0, len(rows), 500):
+        await supabase.table("posts").insert(rows[i:i + 500]).execute()
+
+
+async def cleanup():
+    await supabase.table("posts").delete().eq("post_title", BENCH_TITLE).execute()
+
+
+async def measure(args):
+    url = f"{args.base_url}/get/category/feed"
+    headers = {"auth_token": args.auth_token}
+    latencies, buckets_ms, errors = [], [], 0
+    base = datetime.now(timezone.utc) - timedelta(hours=72)
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        started = time.perf_counter()
+        for i in range(args.iterations):
+            body = {"category": args.category, "session_seed": f"bench-{i}", "debug": True}
+            if not args.warm:
+                # a new last_seen every call → new bucket cache key
+                body["last_seen"] = (base + timedelta(minutes=i)).isoformat()
+
+            start = time.perf_counter()
+            res = await client.post(url, json=body, headers=headers)
+            latencies.append(time.perf_counter() - start)
+
+            if res.status_code >= 400:
+                errors += 1
+                continue
+            debug = res.json().get("debug") or {}
+            if "buckets" in debug.get("timings_ms", {}):
+                buckets_ms.append(debug["timings_ms"]["buckets"])
+
+        stats = summarize(latencies, errors, time.perf_counter() - started)
+
+    print_row(f"category feed [{args.label}]", stats)
+    if buckets_ms:
+        buckets_ms.sort()
+        print(f"    buckets stage  p50={percentile(buckets_ms, 50):.1f}ms  p95={percentile(buckets_ms, 95):.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--auth-token", required=True)
+    parser.add_argument("--category", required=True)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warm", action="store_true")
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--user-ids", nargs="+", default=[])
+    parser.add_argument("--posts", type=int, default=600)
+    parser.add_argument("--cleanup", action="store_true")
+    args = parser.parse_args()
+
+    if args.seed:
+        if not args.user_ids:
+            raise SystemExit("--seed needs --user-ids")
+        await seed(args.category, args.user_ids, args.posts)
+
+    try:
+        await measure(args)
+    finally:
+        if args.cleanup:
+            await cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
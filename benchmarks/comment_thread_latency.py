@@ -0,0 +1,126 @@
+"""
+Latency of building one /comment/comment_list page on a post with 500 comments:
+the old 1 + 3xN query pattern vs the get_comment_thread_page RPC.
+
+Needs the same .env as the API ( SUPABASE_URL, api_key_bypass ) and an
+existing post / user to attach the seeded comments to:
+
+    python -m benchmarks.comment_thread_latency --post-id <post> --user-id <user> --seed --cleanup
+
+--seed inserts 500 top-level comments ( every 10th one gets 5 replies ),
+--cleanup deletes everything the run inserted.
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from structured_files.config.supabase_config import supabase
+
+from .load import summarize, print_row
+
+
+async def seed(post_id: str, user_id: str, total: int = 500, reply_every: int = 10, replies: int = 5):
+    base = datetime.now(timezone.utc) - timedelta(days=1)
+    rows, seeded_ids = [], []
+
+    for i in range(total):
+        cid = str(uuid.uuid4())
+        seeded_ids.append(cid)
+        rows.append(_comment(cid, post_id, user_id, None, base + timedelta(seconds=i)))
+
+        if i % reply_every == 0:
+            for j in range(replies):
+                rid = str(uuid.uuid4())
+                seeded_ids.append(rid)
+                rows.append(_comment(rid, post_id, user_id, cid, base + timedelta(seconds=i, milliseconds=j + 1)))
+
+    for i in range(0, len(rows), 500):
+        # parents before replies: rows are generated in that order
+        await supabase.table("comments").insert(rows[i:i + 500]).execute()
+
+    return seeded_ids
+
+
+def _comment(comment_id, post_id, user_id, parent_id, created_at):
+    ts = created_at.isoformat()
+    return {
+        "comment_id": comment_id,
+        "post_id": post_id,
+        "user_id": user_id,
+        "parent_comment_id": parent_id,
+        "comment_text": "benchmark comment",
+        "comment_for": "support",
+        "created_by": user_id,
+        "created_at": ts,
+        "modified_by": user_id,
+        "modified_at": ts,
+    }
+
+
+async def legacy_page(post_id: str, skip: int, limit: int):
+    """The pre-RPC query pattern: 1 page query + per comment (author, replies, count) + per reply author"""
+    res = (
+        await supabase.table("comments")
+        .select("*")
+        .eq("post_id", post_id)
+        .is_("parent_comment_id", None)
+        .order("created_at", desc=False)
+        .range(skip, skip + limit - 1)
+        .execute()
+    )
+    for c in res.data or []:
+        await supabase.table("users").select("user_name, profile_img_url").eq("user_id", c["user_id"]).single().execute()
+        replies = (
+            await supabase.table("comments").select("*").eq("parent_comment_id", c["comment_id"])
+            .order("created_at", desc=False).limit(2).execute()
+        ).data or []
+        for r in replies:
+            await supabase.table("users").select("user_name, profile_img_url").eq("user_id", r["user_id"]).single().execute()
+        await supabase.table("comments").select("comment_id", count="exact").eq("parent_comment_id", c["comment_id"]).execute()
+
+
+async def rpc_page(post_id: str, skip: int, limit: int):
+    await supabase.rpc(
+        "get_comment_thread_page",
+        {"p_post_id": post_id, "p_skip": skip, "p_limit": limit, "p_reply_limit": 2},
+    ).execute()
+
+
+async def measure(fn, post_id, iterations, limit):
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        skip = (i * limit) % 500   # walk through the whole thread
+        start = time.perf_counter()
+        await fn(post_id, skip, limit)
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, 0, time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--post-id", required=True)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--seed", action="store_true")
+    parser.add_argument("--cleanup", action="store_true")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    seeded = await seed(args.post_id, args.user_id) if args.seed else []
+
+    try:
+        print_row("legacy 1+3N queries", await measure(legacy_page, args.post_id, args.iterations, args.limit))
+        print_row("get_comment_thread_page", await measure(rpc_page, args.post_id, args.iterations, args.limit))
+    finally:
+        if args.cleanup and seeded:
+            # reversed → replies are deleted before their parent
+            doomed = seeded[::-1]
+            for i in range(0, len(doomed), 200):
+                await supabase.table("comments").delete().in_("comment_id", doomed[i:i + 200]).execute()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""
+Requests/sec of the feed endpoints at 50 and 200 concurrent clients.
+
+Start the API (uvicorn main:app --workers 1) once on the commit *before* the
+async data-access change and once after it, then run:
+
+    python -m benchmarks.feed_throughput --base-url http://127.0.0.1:8000 --auth-token <token>
+
+With the old sync client every PostgREST round trip blocks the event loop, so
+rps stays flat (~1 / query latency) no matter how many clients are connected.
+With the async client the worker keeps serving other requests while a query
+is in flight, so rps scales with concurrency until the database saturates.
+"""
+import argparse
+import asyncio
+
+from .load import run_load, print_row
+
+
+def make_senders(base_url: str, token: str, category: str):
+    headers = {"auth_token": token}
+
+    async def feed(client):
+        return await client.post(f"{base_url}/trending_post/feed", json={"skip": 0, "limit": 20}, headers=headers)
+
+    async def category_feed(client):
+        return await client.post(
+            f"{base_url}/get/category/feed",
+            json={"category": category, "session_seed": "bench"},
+            headers=headers,
+        )
+
+    return {"/trending_post/feed": feed, "/get/category/feed": category_feed}
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--auth-token", required=True)
+    parser.add_argument("--category", default="general")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+    args = parser.parse_args()
+
+    for route, send in make_senders(args.base_url, args.auth_token, args.category).items():
+        for c in args.concurrency:
+            stats = await run_load(send, concurrency=c, duration=args.duration)
+            print_row(f"{route} c={c}", stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
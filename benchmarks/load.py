@@ -0,0 +1,75 @@
+"""
+Small closed-loop load generator shared by the benchmark scripts.
+
+Every "client" is a coroutine that fires one request, waits for the answer
+and immediately fires the next one, so `concurrency` is the number of
+requests in flight at any moment.
+"""
+import asyncio
+import time
+from statistics import quantiles
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    if len(samples) == 1:
+        return samples[0]
+    # quantiles(n=100) returns the 1st..99th percentile cut points
+    return quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies_ms = sorted(l * 1000 for l in latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(latencies_ms, 50), 1),
+        "p95_ms": round(percentile(latencies_ms, 95), 1),
+        "p99_ms": round(percentile(latencies_ms, 99), 1),
+    }
+
+
+async def run_load(send, concurrency: int, duration: float = 15.0, timeout: float = 30.0):
+    """
+    send(client) -> awaitable httpx.Response
+    Runs `concurrency` clients for `duration` seconds and returns summarize(...)
+    """
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    res = await send(client)
+                    if res.status_code >= 400:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, errors, elapsed)
+
+
+def print_row(label, stats):
+    print(
+        f"{label:<28} rps={stats['rps']:<8} p50={stats['p50_ms']:<8} "
+        f"p95={stats['p95_ms']:<8} p99={stats['p99_ms']:<8} "
+        f"ok={stats['requests']:<7} errors={stats['errors']}"
+    )
@@ -0,0 +1,125 @@
+"""
+Login storm: what argon2 does to everything else in the worker.
+
+local  → in-process, no server: N concurrent password verifies run
+         inline on the event loop vs through utils/password_hashing,
+         while a probe coroutine measures how late the loop wakes it
+         ( loop lag = what every other request would wait )
+
+    python -m benchmarks.login_storm local --logins 200
+
+http   → against a running API: `storm` clients hammer /auth/login
+         while `probe` clients hit /pool-stats ( no database work ),
+         so the probe latency shows the stall
+
+    python -m benchmarks.login_storm http --email a@b.c --password x --label pool
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from .load import run_load, summarize, print_row, percentile
+
+
+# ---------------- local ----------------
+
+async def probe_loop_lag(stop: asyncio.Event, interval: float = 0.005):
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+async def storm(verify, hashed, logins):
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(stop))
+
+    latencies, errors = [], 0
+    started = time.perf_counter()
+
+    async def one():
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            await verify(hashed, "correct horse battery staple")
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors += 1
+
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lags = sorted(l * 1000 for l in await probe)
+    return summarize(latencies, errors, elapsed), lags
+
+
+async def run_local(args):
+    from structured_files.utils import password_hashing
+
+    hashed = password_hashing.ph.hash("correct horse battery staple")
+
+    async def inline(h, p):
+        return password_hashing.ph.verify(h, p)
+
+    for label, verify in (("inline on event loop", inline), ("hashing pool", password_hashing.verify_password)):
+        stats, lags = await storm(verify, hashed, args.logins)
+        print_row(label, stats)
+        print(f"{'':<28} loop lag p50={percentile(lags, 50):.1f}ms p99={percentile(lags, 99):.1f}ms max={max(lags, default=0):.1f}ms")
+
+    print(password_hashing.pool.stats())
+    password_hashing.pool.shutdown()
+
+
+# ---------------- http ----------------
+
+async def run_http(args):
+    login_url = f"{args.base_url}/auth/login"
+    probe_url = f"{args.base_url}/pool-stats"
+    body = {"user_email": args.email, "password": args.password}
+
+    async def login(client):
+        return await client.post(login_url, json=body)
+
+    async def probe(client):
+        return await client.get(probe_url)
+
+    idle = await run_load(probe, concurrency=args.probe, duration=args.duration)
+    print_row(f"probe idle [{args.label}]", idle)
+
+    login_stats, probe_stats = await asyncio.gather(
+        run_load(login, concurrency=args.storm, duration=args.duration),
+        run_load(probe, concurrency=args.probe, duration=args.duration),
+    )
+    print_row(f"login c={args.storm} [{args.label}]", login_stats)
+    print_row(f"probe under storm [{args.label}]", probe_stats)
+
+    async with httpx.AsyncClient(timeout=10) as client:
+        print((await client.get(f"{args.base_url}/hash-pool-stats")).json())
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    local = sub.add_parser("local")
+    local.add_argument("--logins", type=int, default=200)
+
+    http = sub.add_parser("http")
+    http.add_argument("--base-url", default="http://127.0.0.1:8000")
+    http.add_argument("--email", required=True)
+    http.add_argument("--password", required=True)
+    http.add_argument("--label", default="run")
+    http.add_argument("--storm", type=int, default=100)
+    http.add_argument("--probe", type=int, default=10)
+    http.add_argument("--duration", type=float, default=15.0)
+
+    args = parser.parse_args()
+    await (run_local(args) if args.mode == "local" else run_http(args))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
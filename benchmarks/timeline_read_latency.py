@@ -0,0 +1,136 @@
+"""
+Read latency of the following feed: fan-out-on-read vs a precomputed timeline.
+
+local  ( no network calls, only needs the .env the API imports with )
+    python -m benchmarks.timeline_read_latency local --following 300 --posts-per-author 50
+
+    Compares, in-process, building one page by merging every followed
+    author's post list ( what the database does for get_following_feed )
+    with reading a slice of an InMemoryTimelineStore timeline.
+
+http
+    Start the API twice, once with TIMELINE_STORE=off and once with
+    TIMELINE_STORE=memory ( or supabase ), then run:
+
+    python -m benchmarks.timeline_read_latency http --auth-token <token> --label off
+    python -m benchmarks.timeline_read_latency http --auth-token <token> --label memory
+
+    The first request of a run builds the timeline in the background, so
+    each run does one warm-up call before measuring.
+"""
+import argparse
+import asyncio
+import heapq
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import httpx
+
+from structured_files.services.timeline_service import InMemoryTimelineStore
+
+from .load import run_load, summarize, print_row
+
+
+# ---------------- local ----------------
+
+def make_authors(following: int, posts_per_author: int):
+    now = datetime.now(timezone.utc)
+    authors = {}
+    for _ in range(following):
+        posts = [
+            (now - timedelta(minutes=random.randint(0, 60 * 24 * 30)), str(uuid.uuid4()))
+            for _ in range(posts_per_author)
+        ]
+        authors[str(uuid.uuid4())] = sorted(posts, reverse=True)
+    return authors
+
+
+def fan_out_on_read(authors, limit):
+    return list(islice(heapq.merge(*authors.values(), reverse=True), limit))
+
+
+async def run_local(args):
+    authors = make_authors(args.following, args.posts_per_author)
+
+    store = InMemoryTimelineStore(max_len=args.max_len)
+    user_id = "bench-user"
+    store._timelines[user_id] = sorted(fan_out_on_read(authors, args.max_len))
+
+    # sanity: both paths return the same first page
+    first = [pid for _, pid in fan_out_on_read(authors, args.limit)]
+    _, _, entries = await store.read(user_id, None, args.limit)
+    assert first == [e["post_id"] for e in entries]
+
+    merge_lat, timeline_lat = [], []
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        fan_out_on_read(authors, args.limit)
+        merge_lat.append(time.perf_counter() - start)
+    print_row(f"fan-out-on-read ({args.following} authors)", summarize(merge_lat, 0, time.perf_counter() - started))
+
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        await store.read(user_id, None, args.limit)
+        timeline_lat.append(time.perf_counter() - start)
+    print_row("timeline slice", summarize(timeline_lat, 0, time.perf_counter() - started))
+
+    # deep page: cursor half way down the timeline
+    mid = store._timelines[user_id][len(store._timelines[user_id]) // 2]
+    cursor = {"created_at": mid[0].isoformat(), "post_id": mid[1]}
+    timeline_lat = []
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        await store.read(user_id, cursor, args.limit)
+        timeline_lat.append(time.perf_counter() - start)
+    print_row("timeline slice ( deep cursor )", summarize(timeline_lat, 0, time.perf_counter() - started))
+
+
+# ---------------- http ----------------
+
+async def run_http(args):
+    headers = {"auth_token": args.auth_token}
+    url = f"{args.base_url}/trending_post/feed"
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        await client.post(url, json={"limit": args.limit}, headers=headers)
+        await asyncio.sleep(2)   # let the background backfill land
+
+    async def feed(client):
+        return await client.post(url, json={"limit": args.limit}, headers=headers)
+
+    for c in args.concurrency:
+        stats = await run_load(feed, concurrency=c, duration=args.duration)
+        print_row(f"feed [{args.label}] c={c}", stats)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    local = sub.add_parser("local")
+    local.add_argument("--following", type=int, default=300)
+    local.add_argument("--posts-per-author", type=int, default=50)
+    local.add_argument("--max-len", type=int, default=800)
+    local.add_argument("--limit", type=int, default=20)
+    local.add_argument("--iterations", type=int, default=500)
+
+    http = sub.add_parser("http")
+    http.add_argument("--base-url", default="http://127.0.0.1:8000")
+    http.add_argument("--auth-token", required=True)
+    http.add_argument("--label", default="run")
+    http.add_argument("--limit", type=int, default=20)
+    http.add_argument("--duration", type=float, default=15.0)
+    http.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+
+    args = parser.parse_args()
+    await (run_local(args) if args.mode == "local" else run_http(args))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
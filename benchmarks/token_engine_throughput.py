@@ -0,0 +1,82 @@
+"""
+Sign / verify throughput of the token engine per algorithm ( RS256,
+ES256, EdDSA ), plus the old way for RS256: PEM strings handed to
+PyJWT on every call.
+
+Runs fully in-process with throwaway keys, no server or database:
+
+    python -m benchmarks.token_engine_throughput --iterations 2000
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+
+def _pems(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+GENERATORS = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+PEMS = {alg: _pems(generate()) for alg, generate in GENERATORS.items()}
+
+# the module level engine needs a legacy key before import
+os.environ["PRIVATE_KEY"], os.environ["PUBLIC_KEY"] = PEMS["RS256"]
+
+from structured_files.utils.token_engine import TokenEngine, load_key   # noqa: E402
+
+from .load import summarize, print_row                                   # noqa: E402
+
+
+def timed(fn, iterations):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, 0, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = {"user_id": "bench-user", "exp": datetime.now(timezone.utc) + timedelta(weeks=1)}
+
+    # old path: PEM parsed by PyJWT on every call
+    private_pem, public_pem = PEMS["RS256"]
+    token = jwt.encode(payload, private_pem, algorithm="RS256")
+    print_row("RS256 sign ( PEM per call )", timed(lambda: jwt.encode(payload, private_pem, algorithm="RS256"), args.iterations))
+    print_row("RS256 verify ( PEM per call )", timed(lambda: jwt.decode(token, public_pem, algorithms=["RS256"]), args.iterations))
+
+    for alg, (private_pem, public_pem) in PEMS.items():
+        engine = TokenEngine([load_key(alg, alg, public_pem, private_pem)], signing_kid=alg)
+        token = engine.encode(payload)
+        assert engine.decode(token)["user_id"] == "bench-user"
+
+        print_row(f"{alg} sign ( engine )", timed(lambda: engine.encode(payload), args.iterations))
+        print_row(f"{alg} verify ( engine )", timed(lambda: engine.decode(token), args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,16 +9,39 @@ from structured_files.controllers import login_router,sign_up,user_update,get_us
 
 
 from structured_files.utils import check_user_name,otp_request
+from structured_files.utils import auth_token_cache, password_hashing
 from structured_files.middleware import otp_verify
 from structured_files.middleware.trigger_js import trigger_express_api
+from structured_files.middleware import load_shedding
+from structured_files.middleware.load_shedding import LoadSheddingMiddleware
 
 from structured_files.config.supabase_config import supabase
+from structured_files.config.http_transport import pool_stats, close_transport
+from structured_files.services import trending_engine, category_registry, follow_stats, like_buffer
 
 app=FastAPI()
 
+
+@app.on_event("startup")
+async def startup():
+    await category_registry.load()
+    trending_engine.start()
+    follow_stats.start()
+    like_buffer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await trending_engine.stop()
+    await follow_stats.stop()
+    # last like flush needs the transport, so before close_transport()
+    await like_buffer.stop()
+    await close_transport()
+    password_hashing.pool.shutdown()
+
 @app.get("/")
-def serverRunning():
-    resposne=supabase.table("server_test").select("*").execute()
+async def serverRunning():
+    resposne=await supabase.table("server_test").select("*").execute()
 
   
     return {
@@ -27,6 +50,30 @@ def serverRunning():
     }
 
 
+# Supabase connection pool stats for this worker ( use it to size the pool )
+@app.get("/pool-stats")
+def supabase_pool_stats():
+    return pool_stats()
+
+
+# verified auth token cache of this worker ( hit rate → RS256 verifies saved )
+@app.get("/auth-cache-stats")
+def auth_cache_stats():
+    return auth_token_cache.stats()
+
+
+# argon2 pool of this worker ( queued / rejected → size PASSWORD_HASH_* )
+@app.get("/hash-pool-stats")
+def hash_pool_stats():
+    return password_hashing.pool.stats()
+
+
+# adaptive route limits of this worker ( limit / queued / shed per route )
+@app.get("/load-shed-stats")
+def load_shed_stats():
+    return load_shedding.stats()
+
+
 
 # =========================
 # Authentication
@@ -86,6 +133,10 @@ app.include_router(vector_search.router, prefix="/search", tags=["Search"])
 app.include_router(feed_post.router, prefix="/trending_post", tags=["User folllowing Posts / Trending post"])
 
 
+# per-route concurrency budgets for the expensive routes ( added before
+# CORS so CORS stays outermost and 503s still carry its headers )
+app.add_middleware(LoadSheddingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  
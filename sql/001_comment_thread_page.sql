@@ -0,0 +1,86 @@
+-- ------------------------------------------------------------
+-- /comment/comment_list in ONE call
+-- page of top-level comments + first N replies of each ( window
+-- function ) + reply counts + author cards
+--
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+-- replies are always looked up by parent, ordered by time
+CREATE INDEX IF NOT EXISTS comments_parent_created_idx
+ON comments (parent_comment_id, created_at);
+
+CREATE INDEX IF NOT EXISTS comments_post_top_created_idx
+ON comments (post_id, created_at)
+WHERE parent_comment_id IS NULL;
+
+
+CREATE OR REPLACE FUNCTION get_comment_thread_page(
+  p_post_id uuid,
+  p_skip int DEFAULT 0,
+  p_limit int DEFAULT 10,
+  p_reply_limit int DEFAULT 2
+)
+RETURNS TABLE (
+  comment_id uuid,
+  user_id uuid,
+  user_name text,
+  profile_img_url text,
+  comment_text text,
+  created_at timestamptz,
+  reply_count bigint,
+  replies jsonb
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH top AS (
+    SELECT c.comment_id, c.user_id, c.comment_text, c.created_at
+    FROM comments c
+    WHERE c.post_id = p_post_id
+      AND c.parent_comment_id IS NULL
+    ORDER BY c.created_at ASC
+    OFFSET p_skip
+    LIMIT p_limit
+  ),
+  ranked AS (
+    SELECT
+      r.comment_id,
+      r.parent_comment_id,
+      r.user_id,
+      r.comment_text,
+      r.created_at,
+      row_number() OVER (PARTITION BY r.parent_comment_id ORDER BY r.created_at ASC) AS rn,
+      count(*) OVER (PARTITION BY r.parent_comment_id) AS total
+    FROM comments r
+    WHERE r.parent_comment_id IN (SELECT t.comment_id FROM top t)
+  )
+  SELECT
+    t.comment_id,
+    t.user_id,
+    u.user_name,
+    u.profile_img_url,
+    t.comment_text,
+    t.created_at,
+    coalesce(max(rk.total), 0) AS reply_count,
+    coalesce(
+      jsonb_agg(
+        jsonb_build_object(
+          'comment_id', rk.comment_id,
+          'user_id', rk.user_id,
+          'user_name', ru.user_name,
+          'profile_img_url', ru.profile_img_url,
+          'comment_text', rk.comment_text,
+          'created_at', rk.created_at
+        )
+        ORDER BY rk.created_at
+      ) FILTER (WHERE rk.comment_id IS NOT NULL),
+      '[]'::jsonb
+    ) AS replies
+  FROM top t
+  LEFT JOIN users u ON u.user_id = t.user_id
+  LEFT JOIN ranked rk ON rk.parent_comment_id = t.comment_id AND rk.rn <= p_reply_limit
+  LEFT JOIN users ru ON ru.user_id = rk.user_id
+  GROUP BY t.comment_id, t.user_id, u.user_name, u.profile_img_url, t.comment_text, t.created_at
+  ORDER BY t.created_at ASC;
+$$;
@@ -0,0 +1,125 @@
+-- ------------------------------------------------------------
+-- post_stats: engagement counters maintained on every write
+-- ( likes insert/delete, comments insert/delete/comment_for change )
+-- so reads never have to pull like / comment rows to count them
+--
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS post_stats (
+  post_id uuid PRIMARY KEY REFERENCES posts(post_id) ON DELETE CASCADE,
+  likes_count bigint NOT NULL DEFAULT 0,
+  comments_count bigint NOT NULL DEFAULT 0,
+  support_count bigint NOT NULL DEFAULT 0,
+  deny_count bigint NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+
+-- ---------------- posts: create the row ----------------
+CREATE OR REPLACE FUNCTION post_stats_on_post() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO post_stats (post_id) VALUES (NEW.post_id)
+  ON CONFLICT (post_id) DO NOTHING;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS post_stats_post_insert ON posts;
+CREATE TRIGGER post_stats_post_insert
+AFTER INSERT ON posts
+FOR EACH ROW EXECUTE FUNCTION post_stats_on_post();
+
+
+-- ---------------- likes ----------------
+CREATE OR REPLACE FUNCTION post_stats_on_like() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO post_stats (post_id, likes_count) VALUES (NEW.post_id, 1)
+    ON CONFLICT (post_id) DO UPDATE
+      SET likes_count = post_stats.likes_count + 1, updated_at = now();
+    RETURN NEW;
+  END IF;
+
+  UPDATE post_stats
+  SET likes_count = greatest(likes_count - 1, 0), updated_at = now()
+  WHERE post_id = OLD.post_id;
+  RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS post_stats_like_change ON likes;
+CREATE TRIGGER post_stats_like_change
+AFTER INSERT OR DELETE ON likes
+FOR EACH ROW EXECUTE FUNCTION post_stats_on_like();
+
+
+-- ---------------- comments ( support / deny ) ----------------
+CREATE OR REPLACE FUNCTION post_stats_on_comment() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  add_support int := 0;
+  add_deny int := 0;
+  add_total int := 0;
+  target uuid;
+BEGIN
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    target := NEW.post_id;
+    add_total := add_total + 1;
+    add_support := add_support + (NEW.comment_for::text = 'support')::int;
+    add_deny := add_deny + (NEW.comment_for::text = 'deny')::int;
+  END IF;
+
+  IF TG_OP IN ('DELETE', 'UPDATE') THEN
+    target := coalesce(target, OLD.post_id);
+    add_total := add_total - 1;
+    add_support := add_support - (OLD.comment_for::text = 'support')::int;
+    add_deny := add_deny - (OLD.comment_for::text = 'deny')::int;
+  END IF;
+
+  -- delete: post ( and its stats row ) may already be going away → update only
+  IF TG_OP = 'DELETE' THEN
+    UPDATE post_stats
+    SET comments_count = greatest(comments_count + add_total, 0),
+        support_count = greatest(support_count + add_support, 0),
+        deny_count = greatest(deny_count + add_deny, 0),
+        updated_at = now()
+    WHERE post_id = target;
+    RETURN NULL;
+  END IF;
+
+  INSERT INTO post_stats (post_id, comments_count, support_count, deny_count)
+  VALUES (target, greatest(add_total, 0), greatest(add_support, 0), greatest(add_deny, 0))
+  ON CONFLICT (post_id) DO UPDATE
+    SET comments_count = greatest(post_stats.comments_count + add_total, 0),
+        support_count = greatest(post_stats.support_count + add_support, 0),
+        deny_count = greatest(post_stats.deny_count + add_deny, 0),
+        updated_at = now();
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS post_stats_comment_change ON comments;
+CREATE TRIGGER post_stats_comment_change
+AFTER INSERT OR DELETE OR UPDATE OF comment_for ON comments
+FOR EACH ROW EXECUTE FUNCTION post_stats_on_comment();
+
+
+-- ---------------- backfill existing posts ----------------
+INSERT INTO post_stats (post_id, likes_count, comments_count, support_count, deny_count)
+SELECT
+  p.post_id,
+  (SELECT count(*) FROM likes l WHERE l.post_id = p.post_id),
+  (SELECT count(*) FROM comments c WHERE c.post_id = p.post_id),
+  (SELECT count(*) FROM comments c WHERE c.post_id = p.post_id AND c.comment_for::text = 'support'),
+  (SELECT count(*) FROM comments c WHERE c.post_id = p.post_id AND c.comment_for::text = 'deny')
+FROM posts p
+ON CONFLICT (post_id) DO UPDATE
+  SET likes_count = EXCLUDED.likes_count,
+      comments_count = EXCLUDED.comments_count,
+      support_count = EXCLUDED.support_count,
+      deny_count = EXCLUDED.deny_count,
+      updated_at = now();
@@ -0,0 +1,13 @@
+-- ------------------------------------------------------------
+-- keyset pagination for the following feed
+-- ( user_id IN (...) ORDER BY created_at desc, post_id desc )
+-- the next page is an index seek instead of OFFSET scanning
+--
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS posts_user_created_post_idx
+  ON posts (user_id, created_at DESC, post_id DESC);
+
+CREATE INDEX IF NOT EXISTS posts_created_post_idx
+  ON posts (created_at DESC, post_id DESC);
@@ -0,0 +1,49 @@
+-- ------------------------------------------------------------
+-- /trending_post/feed following mode in ONE call
+-- has-following check + userfollowing ⋈ posts page, so the
+-- follow list never leaves the database
+-- ( keyset when a cursor is passed, OFFSET for older clients )
+--
+-- needs the posts indexes from 003_posts_keyset_index.sql
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS userfollowing_follower_following_idx
+ON userfollowing (follower_id, following_id);
+
+
+CREATE OR REPLACE FUNCTION get_following_feed(
+  p_user_id uuid,
+  p_limit int DEFAULT 20,
+  p_skip int DEFAULT 0,
+  p_cursor_created_at timestamptz DEFAULT NULL,
+  p_cursor_post_id uuid DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT jsonb_build_object(
+    'has_following', EXISTS (
+      SELECT 1 FROM userfollowing f WHERE f.follower_id = p_user_id
+    ),
+    'posts', COALESCE((
+      SELECT jsonb_agg(to_jsonb(page) ORDER BY page.created_at DESC, page.post_id DESC)
+      FROM (
+        SELECT p.post_id, p.user_id, p.post_title, p.post_content, p.category, p.created_at
+        FROM posts p
+        -- semi-join: a duplicated follow row can't duplicate a post
+        WHERE p.user_id IN (
+            SELECT f.following_id FROM userfollowing f WHERE f.follower_id = p_user_id
+          )
+          AND (
+            p_cursor_created_at IS NULL
+            OR (p.created_at, p.post_id) < (p_cursor_created_at, p_cursor_post_id)
+          )
+        ORDER BY p.created_at DESC, p.post_id DESC
+        OFFSET CASE WHEN p_cursor_created_at IS NULL THEN p_skip ELSE 0 END
+        LIMIT p_limit
+      ) page
+    ), '[]'::jsonb)
+  );
+$$;
@@ -0,0 +1,157 @@
+-- ------------------------------------------------------------
+-- fan-out-on-write timelines ( TIMELINE_STORE=supabase )
+-- every follower keeps a capped list of (created_at, post_id);
+-- /trending_post/feed reads a slice of it instead of merging
+-- all followed authors at read time
+--
+-- authors with >= TIMELINE_CELEBRITY_FOLLOWERS followers are
+-- NOT fanned out ( timeline_celebrities ), their posts are merged
+-- at read time instead
+--
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS timelines (
+  user_id uuid NOT NULL,
+  post_id uuid NOT NULL REFERENCES posts(post_id) ON DELETE CASCADE,
+  created_at timestamptz NOT NULL,
+  PRIMARY KEY (user_id, post_id)
+);
+
+CREATE INDEX IF NOT EXISTS timelines_user_created_post_idx
+ON timelines (user_id, created_at DESC, post_id DESC);
+
+-- one row per materialized timeline
+-- truncated → older entries were trimmed, deeper pages come from posts
+CREATE TABLE IF NOT EXISTS timeline_state (
+  user_id uuid PRIMARY KEY,
+  truncated boolean NOT NULL DEFAULT false,
+  materialized_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS timeline_celebrities (
+  user_id uuid PRIMARY KEY,
+  marked_at timestamptz NOT NULL DEFAULT now()
+);
+
+
+-- ---------------- trim to p_max_len newest entries ----------------
+CREATE OR REPLACE FUNCTION trim_timelines(p_user_ids uuid[], p_max_len int)
+RETURNS void
+LANGUAGE sql
+AS $$
+  WITH ranked AS (
+    SELECT t.user_id, t.post_id,
+           row_number() OVER (
+             PARTITION BY t.user_id ORDER BY t.created_at DESC, t.post_id DESC
+           ) AS rn
+    FROM timelines t
+    WHERE t.user_id = ANY (p_user_ids)
+  ),
+  dropped AS (
+    DELETE FROM timelines t
+    USING ranked r
+    WHERE r.rn > p_max_len
+      AND t.user_id = r.user_id
+      AND t.post_id = r.post_id
+    RETURNING t.user_id
+  )
+  UPDATE timeline_state s
+  SET truncated = true
+  WHERE s.user_id IN (SELECT DISTINCT user_id FROM dropped);
+$$;
+
+
+-- ---------------- fan a new post out to materialized followers ----------------
+CREATE OR REPLACE FUNCTION fanout_post(
+  p_post_id uuid,
+  p_author_id uuid,
+  p_created_at timestamptz,
+  p_max_len int DEFAULT 800
+)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_followers uuid[];
+BEGIN
+  WITH pushed AS (
+    INSERT INTO timelines (user_id, post_id, created_at)
+    SELECT DISTINCT f.follower_id, p_post_id, p_created_at
+    FROM userfollowing f
+    JOIN timeline_state s ON s.user_id = f.follower_id
+    WHERE f.following_id = p_author_id
+    ON CONFLICT (user_id, post_id) DO NOTHING
+    RETURNING user_id
+  )
+  SELECT coalesce(array_agg(user_id), '{}') INTO v_followers FROM pushed;
+
+  PERFORM trim_timelines(v_followers, p_max_len);
+  RETURN coalesce(array_length(v_followers, 1), 0);
+END;
+$$;
+
+
+-- ---------------- build one timeline from the follow graph ----------------
+CREATE OR REPLACE FUNCTION backfill_timeline(p_user_id uuid, p_max_len int DEFAULT 800)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_count int;
+BEGIN
+  INSERT INTO timelines (user_id, post_id, created_at)
+  SELECT p_user_id, p.post_id, p.created_at
+  FROM posts p
+  WHERE p.user_id IN (
+      SELECT f.following_id FROM userfollowing f WHERE f.follower_id = p_user_id
+    )
+    AND p.user_id NOT IN (SELECT c.user_id FROM timeline_celebrities c)
+  ORDER BY p.created_at DESC, p.post_id DESC
+  LIMIT p_max_len
+  ON CONFLICT (user_id, post_id) DO NOTHING;
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+
+  INSERT INTO timeline_state (user_id, truncated)
+  VALUES (p_user_id, v_count >= p_max_len)
+  ON CONFLICT (user_id) DO UPDATE SET truncated = EXCLUDED.truncated;
+
+  RETURN v_count;
+END;
+$$;
+
+
+-- ---------------- one page of a timeline ----------------
+-- { materialized, truncated, entries: [{post_id, created_at}] }
+CREATE OR REPLACE FUNCTION read_timeline(
+  p_user_id uuid,
+  p_limit int DEFAULT 20,
+  p_cursor_created_at timestamptz DEFAULT NULL,
+  p_cursor_post_id uuid DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT jsonb_build_object(
+    'materialized', s.user_id IS NOT NULL,
+    'truncated', coalesce(s.truncated, false),
+    'entries', coalesce((
+      SELECT jsonb_agg(to_jsonb(page) ORDER BY page.created_at DESC, page.post_id DESC)
+      FROM (
+        SELECT t.post_id, t.created_at
+        FROM timelines t
+        WHERE t.user_id = p_user_id
+          AND (
+            p_cursor_created_at IS NULL
+            OR (t.created_at, t.post_id) < (p_cursor_created_at, p_cursor_post_id)
+          )
+        ORDER BY t.created_at DESC, t.post_id DESC
+        LIMIT p_limit
+      ) page
+    ), '[]'::jsonb)
+  )
+  FROM (SELECT p_user_id AS user_id) me
+  LEFT JOIN timeline_state s ON s.user_id = me.user_id;
+$$;
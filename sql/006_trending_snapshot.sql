@@ -0,0 +1,62 @@
+-- ------------------------------------------------------------
+-- trending_snapshot: time-decayed engagement score of every post
+-- with activity since p_since, scored exactly like the in-process
+-- trending engine ( services/trending_engine.py ):
+--
+--   score = sum( weight * 0.5 ^ (age_hours / half_life_hours) )
+--   over the post itself, each like and each comment
+--
+-- the engine reloads from this periodically ( reconciliation ),
+-- live events in between are applied in memory
+--
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS likes_created_idx ON likes (created_at);
+CREATE INDEX IF NOT EXISTS comments_created_idx ON comments (created_at);
+CREATE INDEX IF NOT EXISTS posts_created_idx ON posts (created_at);
+
+
+CREATE OR REPLACE FUNCTION trending_snapshot(
+  p_since timestamptz,
+  p_half_life_hours double precision DEFAULT 12,
+  p_post_weight double precision DEFAULT 1,
+  p_like_weight double precision DEFAULT 1,
+  p_comment_weight double precision DEFAULT 2
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+  WITH events AS (
+    SELECT p.post_id, p_post_weight AS weight, p.created_at AS at
+    FROM posts p
+    WHERE p.created_at >= p_since
+
+    UNION ALL
+
+    SELECT l.post_id, p_like_weight, l.created_at
+    FROM likes l
+    WHERE l.created_at >= p_since
+
+    UNION ALL
+
+    SELECT c.post_id, p_comment_weight, c.created_at
+    FROM comments c
+    WHERE c.created_at >= p_since
+  ),
+  scored AS (
+    SELECT e.post_id,
+           sum(
+             e.weight * power(0.5, extract(epoch FROM (now() - e.at)) / 3600.0 / p_half_life_hours)
+           ) AS score
+    FROM events e
+    GROUP BY e.post_id
+  )
+  SELECT coalesce(
+    jsonb_agg(jsonb_build_object('post_id', s.post_id, 'category', p.category, 'score', s.score)),
+    '[]'::jsonb
+  )
+  FROM scored s
+  JOIN posts p ON p.post_id = s.post_id;
+$$;
@@ -0,0 +1,28 @@
+-- ------------------------------------------------------------
+-- seen-set of a random category feed session ( SEEN_STORE=supabase )
+-- state = { bloom: {capacity, error_rate, count, bits}, high, low }
+-- see structured_files/services/seen_store.py
+--
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS feed_seen_sessions (
+  session_key text PRIMARY KEY,
+  state jsonb NOT NULL,
+  expires_at timestamptz NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS feed_seen_sessions_expires_idx
+ON feed_seen_sessions (expires_at);
+
+-- expired sessions are ignored on read; this keeps the table small
+-- ( schedule it with pg_cron, or run it by hand )
+CREATE OR REPLACE FUNCTION purge_feed_seen_sessions()
+RETURNS int
+LANGUAGE sql
+AS $$
+  WITH purged AS (
+    DELETE FROM feed_seen_sessions WHERE expires_at <= now() RETURNING 1
+  )
+  SELECT count(*)::int FROM purged;
+$$;
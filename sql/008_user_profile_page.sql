@@ -0,0 +1,60 @@
+-- ------------------------------------------------------------
+-- /user/{user_id} in ONE call
+-- profile row + follower / following counts + page of posts with
+-- images and like / comment counters ( read from post_stats, see
+-- 002_post_stats.sql )
+-- returns {"user": null, ...} for an unknown user_id
+--
+-- needs the posts (user_id, created_at) index from
+-- 003_posts_keyset_index.sql
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS userfollowing_following_idx
+ON userfollowing (following_id);
+
+CREATE INDEX IF NOT EXISTS post_images_post_idx
+ON post_images (post_id);
+
+
+CREATE OR REPLACE FUNCTION get_user_profile_page(
+  p_user_id uuid,
+  p_limit int DEFAULT 20,
+  p_skip int DEFAULT 0
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT jsonb_build_object(
+    'user', (SELECT to_jsonb(u) FROM users u WHERE u.user_id = p_user_id),
+    'followers', (SELECT count(*) FROM userfollowing f WHERE f.following_id = p_user_id),
+    'following', (SELECT count(*) FROM userfollowing f WHERE f.follower_id = p_user_id),
+    'posts', COALESCE((
+      SELECT jsonb_agg(
+        jsonb_build_object(
+          'post_id', page.post_id,
+          'caption', page.post_row ->> 'caption',
+          'created_at', page.created_at,
+          'images', COALESCE((
+            SELECT jsonb_agg(to_jsonb(pi))
+            FROM post_images pi
+            WHERE pi.post_id = page.post_id
+          ), '[]'::jsonb),
+          'likes_count', COALESCE(s.likes_count, 0),
+          'comments_count', COALESCE(s.comments_count, 0)
+        )
+        ORDER BY page.created_at DESC, page.post_id DESC
+      )
+      FROM (
+        SELECT p.post_id, p.created_at, to_jsonb(p) AS post_row
+        FROM posts p
+        WHERE p.user_id = p_user_id
+        ORDER BY p.created_at DESC, p.post_id DESC
+        OFFSET p_skip
+        LIMIT p_limit
+      ) page
+      LEFT JOIN post_stats s ON s.post_id = page.post_id
+    ), '[]'::jsonb)
+  );
+$$;
@@ -0,0 +1,177 @@
+-- ------------------------------------------------------------
+-- user_follow_stats: follower / following counts per user, kept
+-- next to userfollowing so profile views never count follow rows
+--
+-- - follow_user_counted / unfollow_user_counted change the follow
+--   row AND both counters in one transaction ( called from
+--   FollowingRepository.follow_user / unfollow_user )
+-- - reconcile_user_follow_stats() recomputes every counter from
+--   userfollowing and fixes the ones that drifted ( rows written
+--   outside the RPCs, races ); run periodically by
+--   services/follow_stats.py
+-- - get_user_profile_page ( 008 ) is replaced to read the counters
+--
+-- run in the Supabase SQL editor ( after 008_user_profile_page.sql )
+-- ------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS user_follow_stats (
+  user_id uuid PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+  followers_count bigint NOT NULL DEFAULT 0,
+  following_count bigint NOT NULL DEFAULT 0,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+
+-- ---------------- follow ----------------
+-- true → followed now, false → was already following
+CREATE OR REPLACE FUNCTION follow_user_counted(
+  p_follow_id uuid,
+  p_follower_id uuid,
+  p_following_id uuid
+)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM userfollowing
+    WHERE follower_id = p_follower_id AND following_id = p_following_id
+  ) THEN
+    RETURN false;
+  END IF;
+
+  INSERT INTO userfollowing (follow_id, follower_id, following_id, created_at)
+  VALUES (p_follow_id, p_follower_id, p_following_id, now());
+
+  INSERT INTO user_follow_stats (user_id, following_count) VALUES (p_follower_id, 1)
+  ON CONFLICT (user_id) DO UPDATE
+    SET following_count = user_follow_stats.following_count + 1, updated_at = now();
+
+  INSERT INTO user_follow_stats (user_id, followers_count) VALUES (p_following_id, 1)
+  ON CONFLICT (user_id) DO UPDATE
+    SET followers_count = user_follow_stats.followers_count + 1, updated_at = now();
+
+  RETURN true;
+END;
+$$;
+
+
+-- ---------------- unfollow ----------------
+-- number of follow rows removed ( 0 → was not following )
+CREATE OR REPLACE FUNCTION unfollow_user_counted(
+  p_follower_id uuid,
+  p_following_id uuid
+)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  removed int;
+BEGIN
+  DELETE FROM userfollowing
+  WHERE follower_id = p_follower_id AND following_id = p_following_id;
+  GET DIAGNOSTICS removed = ROW_COUNT;
+
+  IF removed > 0 THEN
+    UPDATE user_follow_stats
+    SET following_count = greatest(following_count - removed, 0), updated_at = now()
+    WHERE user_id = p_follower_id;
+
+    UPDATE user_follow_stats
+    SET followers_count = greatest(followers_count - removed, 0), updated_at = now()
+    WHERE user_id = p_following_id;
+  END IF;
+
+  RETURN removed;
+END;
+$$;
+
+
+-- ---------------- drift repair ----------------
+-- returns how many counters were wrong
+CREATE OR REPLACE FUNCTION reconcile_user_follow_stats()
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  repaired int;
+BEGIN
+  WITH actual AS (
+    SELECT u.user_id,
+           coalesce(fr.n, 0) AS followers_count,
+           coalesce(fg.n, 0) AS following_count
+    FROM users u
+    LEFT JOIN (
+      SELECT following_id, count(*) AS n FROM userfollowing GROUP BY following_id
+    ) fr ON fr.following_id = u.user_id
+    LEFT JOIN (
+      SELECT follower_id, count(*) AS n FROM userfollowing GROUP BY follower_id
+    ) fg ON fg.follower_id = u.user_id
+  ),
+  fixed AS (
+    INSERT INTO user_follow_stats AS s (user_id, followers_count, following_count)
+    SELECT a.user_id, a.followers_count, a.following_count
+    FROM actual a
+    LEFT JOIN user_follow_stats cur ON cur.user_id = a.user_id
+    WHERE cur.user_id IS NULL
+       OR cur.followers_count <> a.followers_count
+       OR cur.following_count <> a.following_count
+    ON CONFLICT (user_id) DO UPDATE
+      SET followers_count = EXCLUDED.followers_count,
+          following_count = EXCLUDED.following_count,
+          updated_at = now()
+    RETURNING 1
+  )
+  SELECT count(*) INTO repaired FROM fixed;
+
+  RETURN repaired;
+END;
+$$;
+
+
+-- ---------------- profile page reads the counters ----------------
+CREATE OR REPLACE FUNCTION get_user_profile_page(
+  p_user_id uuid,
+  p_limit int DEFAULT 20,
+  p_skip int DEFAULT 0
+)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT jsonb_build_object(
+    'user', (SELECT to_jsonb(u) FROM users u WHERE u.user_id = p_user_id),
+    'followers', COALESCE((SELECT s.followers_count FROM user_follow_stats s WHERE s.user_id = p_user_id), 0),
+    'following', COALESCE((SELECT s.following_count FROM user_follow_stats s WHERE s.user_id = p_user_id), 0),
+    'posts', COALESCE((
+      SELECT jsonb_agg(
+        jsonb_build_object(
+          'post_id', page.post_id,
+          'caption', page.post_row ->> 'caption',
+          'created_at', page.created_at,
+          'images', COALESCE((
+            SELECT jsonb_agg(to_jsonb(pi))
+            FROM post_images pi
+            WHERE pi.post_id = page.post_id
+          ), '[]'::jsonb),
+          'likes_count', COALESCE(s.likes_count, 0),
+          'comments_count', COALESCE(s.comments_count, 0)
+        )
+        ORDER BY page.created_at DESC, page.post_id DESC
+      )
+      FROM (
+        SELECT p.post_id, p.created_at, to_jsonb(p) AS post_row
+        FROM posts p
+        WHERE p.user_id = p_user_id
+        ORDER BY p.created_at DESC, p.post_id DESC
+        OFFSET p_skip
+        LIMIT p_limit
+      ) page
+      LEFT JOIN post_stats s ON s.post_id = page.post_id
+    ), '[]'::jsonb)
+  );
+$$;
+
+
+-- ---------------- backfill existing users ----------------
+SELECT reconcile_user_follow_stats();
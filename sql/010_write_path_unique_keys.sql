@@ -0,0 +1,82 @@
+-- ------------------------------------------------------------
+-- unique keys for the idempotent write paths, so like / follow /
+-- report are ONE insert ... on conflict do nothing instead of a
+-- select + insert ( and concurrent double taps can't duplicate )
+--
+-- - likes          (user_id, post_id)       → /like/like
+-- - userfollowing  (follower_id, following_id) → /follow/follow
+-- - post_reports   (post_id, user_id)       → /post/report
+--
+-- existing duplicates are removed first ( the oldest row is kept );
+-- likes deletes go through the post_stats trigger, follow counters
+-- are repaired with reconcile_user_follow_stats() at the end
+--
+-- run in the Supabase SQL editor ( after 009_user_follow_stats.sql )
+-- ------------------------------------------------------------
+
+-- ---------------- drop duplicates ----------------
+DELETE FROM likes a
+USING likes b
+WHERE a.user_id = b.user_id
+  AND a.post_id = b.post_id
+  AND (a.created_at, a.ctid) > (b.created_at, b.ctid);
+
+DELETE FROM userfollowing a
+USING userfollowing b
+WHERE a.follower_id = b.follower_id
+  AND a.following_id = b.following_id
+  AND (a.created_at, a.ctid) > (b.created_at, b.ctid);
+
+DELETE FROM post_reports a
+USING post_reports b
+WHERE a.post_id = b.post_id
+  AND a.user_id = b.user_id
+  AND (a.created_at, a.ctid) > (b.created_at, b.ctid);
+
+
+-- ---------------- unique keys ( on_conflict targets ) ----------------
+CREATE UNIQUE INDEX IF NOT EXISTS likes_user_post_key
+ON likes (user_id, post_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS userfollowing_follower_following_key
+ON userfollowing (follower_id, following_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS post_reports_post_user_key
+ON post_reports (post_id, user_id);
+
+-- same columns as the unique key above ( 004_following_feed.sql )
+DROP INDEX IF EXISTS userfollowing_follower_following_idx;
+
+
+-- ---------------- follow: one conditional insert ----------------
+CREATE OR REPLACE FUNCTION follow_user_counted(
+  p_follow_id uuid,
+  p_follower_id uuid,
+  p_following_id uuid
+)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  INSERT INTO userfollowing (follow_id, follower_id, following_id, created_at)
+  VALUES (p_follow_id, p_follower_id, p_following_id, now())
+  ON CONFLICT (follower_id, following_id) DO NOTHING;
+
+  IF NOT FOUND THEN
+    RETURN false;
+  END IF;
+
+  INSERT INTO user_follow_stats (user_id, following_count) VALUES (p_follower_id, 1)
+  ON CONFLICT (user_id) DO UPDATE
+    SET following_count = user_follow_stats.following_count + 1, updated_at = now();
+
+  INSERT INTO user_follow_stats (user_id, followers_count) VALUES (p_following_id, 1)
+  ON CONFLICT (user_id) DO UPDATE
+    SET followers_count = user_follow_stats.followers_count + 1, updated_at = now();
+
+  RETURN true;
+END;
+$$;
+
+
+SELECT reconcile_user_follow_stats();
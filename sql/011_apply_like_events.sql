@@ -0,0 +1,46 @@
+-- ------------------------------------------------------------
+-- apply_like_events: flush of the write-behind like buffer
+-- ( services/like_buffer.py ) in ONE call
+--
+-- p_events = [{like_id, user_id, post_id, liked, at}, ...]
+-- one event per (user_id, post_id), already coalesced in memory:
+--   liked = true  → insert ( no-op if it exists )
+--   liked = false → delete ( no-op if it is gone )
+-- events for deleted posts are skipped instead of failing the batch
+-- post_stats triggers ( 002 ) keep the counters right
+--
+-- needs the likes unique key from 010_write_path_unique_keys.sql
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION apply_like_events(p_events jsonb)
+RETURNS jsonb
+LANGUAGE sql
+AS $$
+  WITH ev AS (
+    SELECT *
+    FROM jsonb_to_recordset(p_events)
+      AS e(like_id uuid, user_id uuid, post_id uuid, liked boolean, at timestamptz)
+  ),
+  removed AS (
+    DELETE FROM likes l
+    USING ev
+    WHERE NOT ev.liked
+      AND l.user_id = ev.user_id
+      AND l.post_id = ev.post_id
+    RETURNING 1
+  ),
+  added AS (
+    INSERT INTO likes (like_id, post_id, user_id, created_at)
+    SELECT ev.like_id, ev.post_id, ev.user_id, coalesce(ev.at, now())
+    FROM ev
+    WHERE ev.liked
+      AND EXISTS (SELECT 1 FROM posts p WHERE p.post_id = ev.post_id)
+    ON CONFLICT (user_id, post_id) DO NOTHING
+    RETURNING 1
+  )
+  SELECT jsonb_build_object(
+    'inserted', (SELECT count(*) FROM added),
+    'deleted', (SELECT count(*) FROM removed)
+  );
+$$;
@@ -0,0 +1,66 @@
+-- ------------------------------------------------------------
+-- keep materialized timelines ( 005_timelines.sql ) in step with
+-- the follow graph ( services/timeline_service.py follow / unfollow )
+--
+-- timeline_add_author: a new follow merges the author's newest
+--   p_max_len posts in; a truncated timeline only takes posts newer
+--   than its oldest entry ( deeper pages come from posts anyway )
+-- timeline_remove_author: an unfollow drops the author's entries
+--
+-- both are no-ops for users without a materialized timeline
+-- deleted posts need nothing here: timelines.post_id cascades
+-- run in the Supabase SQL editor
+-- ------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION timeline_add_author(
+  p_user_id uuid,
+  p_author_id uuid,
+  p_max_len int DEFAULT 800
+)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_floor timestamptz;
+  v_count int;
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM timeline_state s WHERE s.user_id = p_user_id) THEN
+    RETURN 0;
+  END IF;
+
+  SELECT min(t.created_at) INTO v_floor
+  FROM timelines t
+  JOIN timeline_state s ON s.user_id = t.user_id AND s.truncated
+  WHERE t.user_id = p_user_id;
+
+  INSERT INTO timelines (user_id, post_id, created_at)
+  SELECT p_user_id, p.post_id, p.created_at
+  FROM posts p
+  WHERE p.user_id = p_author_id
+    AND (v_floor IS NULL OR p.created_at >= v_floor)
+  ORDER BY p.created_at DESC, p.post_id DESC
+  LIMIT p_max_len
+  ON CONFLICT (user_id, post_id) DO NOTHING;
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+
+  PERFORM trim_timelines(ARRAY[p_user_id], p_max_len);
+  RETURN v_count;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION timeline_remove_author(p_user_id uuid, p_author_id uuid)
+RETURNS int
+LANGUAGE sql
+AS $$
+  WITH dropped AS (
+    DELETE FROM timelines t
+    USING posts p
+    WHERE t.user_id = p_user_id
+      AND p.post_id = t.post_id
+      AND p.user_id = p_author_id
+    RETURNING 1
+  )
+  SELECT count(*)::int FROM dropped;
+$$;
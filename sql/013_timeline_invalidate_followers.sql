@@ -0,0 +1,34 @@
+-- ------------------------------------------------------------
+-- invalidate_follower_timelines: fan-out of a post failed for good
+-- ( services/timeline_service.py fan_out_post )
+--
+-- a materialized timeline is only ever updated by fan-out, so the
+-- author's followers lose theirs instead: without a timeline_state
+-- row read_timeline reports materialized = false, the feed falls
+-- back to get_following_feed and schedules backfill_timeline
+--
+-- run in the Supabase SQL editor ( after 005_timelines.sql )
+-- ------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION invalidate_follower_timelines(p_author_id uuid)
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_count int;
+BEGIN
+  DELETE FROM timeline_state s
+  USING userfollowing f
+  WHERE f.following_id = p_author_id
+    AND s.user_id = f.follower_id;
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+
+  DELETE FROM timelines t
+  USING userfollowing f
+  WHERE f.following_id = p_author_id
+    AND t.user_id = f.follower_id;
+
+  RETURN v_count;
+END;
+$$;
@@ -0,0 +1,145 @@
+#------------------------------------
+# Shared pooled HTTP/2 transport for every Supabase call
+#------------------------------------
+#
+# postgrest and storage3 each overwrite base_url / headers on the httpx client
+# they are given, so they can't share one httpx.AsyncClient. They CAN share one
+# transport: each service gets its own thin AsyncClient on top of the same
+# connection pool, so table, RPC and storage calls reuse the same keep-alive
+# HTTP/2 connections to the Supabase host.
+
+import asyncio
+import os
+import time
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# ---------------- Pool sizing (per worker) ----------------
+POOL_MAX_CONNECTIONS = _env_int("SUPABASE_POOL_MAX_CONNECTIONS", 50)
+POOL_MAX_KEEPALIVE = _env_int("SUPABASE_POOL_MAX_KEEPALIVE", 20)
+POOL_KEEPALIVE_EXPIRY = _env_float("SUPABASE_POOL_KEEPALIVE_EXPIRY", 60.0)
+HTTP2_ENABLED = os.getenv("SUPABASE_HTTP2", "1") == "1"
+
+# ---------------- Timeouts (seconds) ----------------
+CONNECT_TIMEOUT = _env_float("SUPABASE_CONNECT_TIMEOUT", 5.0)
+POOL_TIMEOUT = _env_float("SUPABASE_POOL_TIMEOUT", 5.0)        # waiting for a free connection
+REST_TIMEOUT = _env_float("SUPABASE_REST_TIMEOUT", 15.0)       # table + rpc
+STORAGE_TIMEOUT = _env_float("SUPABASE_STORAGE_TIMEOUT", 60.0) # uploads are slower
+LOOKUP_TIMEOUT = _env_float("SUPABASE_LOOKUP_TIMEOUT", 2.0)    # execute_with_timeout default
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport and keeps request counters for pool_stats()"""
+
+    def __init__(self, inner: httpx.AsyncHTTPTransport):
+        self._inner = inner
+        self.requests_total = 0
+        self.errors_total = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_time = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            return await self._inner.handle_async_request(request)
+        except Exception:
+            self.errors_total += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.requests_total += 1
+            self.total_time += time.perf_counter() - start
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+transport = InstrumentedTransport(
+    httpx.AsyncHTTPTransport(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+        ),
+        retries=1,   # retry once on connect errors ( stale keep-alive sockets )
+    )
+)
+
+
+def make_http_client(read_timeout: float = REST_TIMEOUT) -> httpx.AsyncClient:
+    """New AsyncClient on top of the shared transport ( one per sub-client )"""
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            connect=CONNECT_TIMEOUT,
+            read=read_timeout,
+            write=read_timeout,
+            pool=POOL_TIMEOUT,
+        ),
+        follow_redirects=True,
+    )
+
+
+async def execute_with_timeout(query, timeout: float = LOOKUP_TIMEOUT):
+    """
+    Per-call timeout on top of the client defaults, for cheap lookups that
+    should fail fast instead of holding a request for REST_TIMEOUT:
+        await execute_with_timeout(supabase.table(...).select(...))
+    raises asyncio.TimeoutError
+    """
+    return await asyncio.wait_for(query.execute(), timeout)
+
+
+def pool_stats() -> dict:
+    """Connection pool + request counters for this worker"""
+    pool = getattr(transport._inner, "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+
+    idle = sum(1 for c in connections if c.is_idle())
+    http2 = sum(1 for c in connections if "HTTP/2" in c.info())
+    # requests waiting for a connection ( pool exhausted or connecting )
+    queued = sum(1 for r in getattr(pool, "_requests", []) if r.is_queued())
+
+    return {
+        "limits": {
+            "max_connections": POOL_MAX_CONNECTIONS,
+            "max_keepalive_connections": POOL_MAX_KEEPALIVE,
+            "keepalive_expiry": POOL_KEEPALIVE_EXPIRY,
+            "http2": HTTP2_ENABLED,
+        },
+        "connections": {
+            "open": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "http2": http2,
+            "queued_requests": queued,
+        },
+        "requests": {
+            "total": transport.requests_total,
+            "errors": transport.errors_total,
+            "in_flight": transport.in_flight,
+            "peak_in_flight": transport.peak_in_flight,
+            "avg_ms": round(transport.total_time / transport.requests_total * 1000, 2)
+            if transport.requests_total else 0,
+        },
+    }
+
+
+async def close_transport():
+    await transport.aclose()
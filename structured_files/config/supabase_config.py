@@ -3,7 +3,13 @@
 # This for supabase native package  connection code 
 #------------------------------------
 
-from supabase import create_client,Client
+# Async client: every table / rpc / storage call must be awaited
+# ( await supabase.table(...).execute() ) so the event loop is never blocked
+from supabase import AsyncClient
+from postgrest import AsyncPostgrestClient
+from storage3 import AsyncStorageClient
+
+from .http_transport import make_http_client, REST_TIMEOUT, STORAGE_TIMEOUT
 
 import os
 from dotenv import load_dotenv
@@ -22,7 +28,34 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 
 
 
-supabase:Client = create_client(SUPABASE_URL,API_KEY)
+class PooledAsyncClient(AsyncClient):
+    """
+    AsyncClient whose postgrest ( table + rpc ) and storage sub-clients run on
+    the shared keep-alive / HTTP/2 transport from http_transport.py
+    """
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=None, verify=True, proxy=None, http_client=None):
+        return AsyncPostgrestClient(
+            rest_url,
+            headers=headers,
+            schema=schema,
+            http_client=make_http_client(REST_TIMEOUT),
+        )
+
+    @staticmethod
+    def _init_storage_client(storage_url, headers, storage_client_timeout=None, verify=True, proxy=None, http_client=None):
+        return AsyncStorageClient(
+            url=storage_url,
+            headers=headers,
+            http_client=make_http_client(STORAGE_TIMEOUT),
+        )
+
+
+# AsyncClient.__init__ is synchronous, so the shared client can still be built at
+# import time. ( acreate_client only adds a gotrue session lookup we don't need
+# with the service key )
+supabase: AsyncClient = PooledAsyncClient(SUPABASE_URL, API_KEY)
 
 #------------------------------------
 # This for sqlqclhemy connection code 
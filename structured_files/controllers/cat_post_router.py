@@ -2,10 +2,18 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta, timezone
+import math
+import os
 import random
+import time
 
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..utils.concurrency import gather_bounded, StageTimer
+from ..utils.ttl_cache import TTLCache
+from ..services import trending_engine
+from ..services.post_hydration import hydrate_posts
+from ..services.category_registry import registry as categories
 
 router = APIRouter()
 
@@ -23,6 +31,7 @@ class CategoryFeedRequest(BaseModel):
     cursor: Optional[CategoryCursor] = None
     last_seen: Optional[str] = None   # Client last seen post time
     session_seed: str                 # Seed for shuffle consistency
+    debug: bool = False               # adds per-stage timings to the response
 
 # ============================================================
 # FEED CONFIGURATION
@@ -35,6 +44,19 @@ B3_LIMIT = 5     # 12–48 hours
 BUFFER_MINUTES = 45                 # Prevent refresh duplicates
 MAX_POSTS_PER_CREATOR = 1          # Soft creator fairness cap
 
+# Bucket rows are the same for every viewer of a category / cursor, only
+# the shuffle and liked_by_current_user are per viewer → shared cache.
+# "now" and last_seen are snapped to BUCKET_SLOT_SECONDS so requests in
+# the same slot hit the same key.
+BUCKET_SLOT_SECONDS = int(os.getenv("BUCKET_SLOT_SECONDS", 15))
+bucket_cache = TTLCache(
+    maxsize=int(os.getenv("BUCKET_CACHE_SIZE", 2048)),
+    ttl=BUCKET_SLOT_SECONDS,
+)
+
+# only what ordering / fairness / cursors need, the rest is hydrated
+POST_COLUMNS = "post_id, user_id, created_at"
+
 # ============================================================
 # UTILITY:  LIGHT  SHUFFLE
 # ============================================================
@@ -45,117 +67,114 @@ def light_shuffle(items, seed: str):
     return items
    
 # ============================================================
-# CREATOR FAIRNESS MERGE
+# CREATOR FAIRNESS FILL
+# - walks every bucket newest → oldest, max MAX_POSTS_PER_CREATOR
+#   per creator, up to the bucket quota ( unused quota rolls over
+#   to the next bucket ) and TOTAL_LIMIT overall
+# - returns the picked posts per bucket and how many rows of each
+#   bucket were examined → the cursor is the last EXAMINED row, so
+#   over-fetched rows that were not looked at come back next page
 # ============================================================
 
-def merge_with_creator_soft_cap(buckets, total_limit):
-    final_posts = []
+def fill_with_creator_soft_cap(buckets, quotas, total_limit):
+    picked = [[] for _ in buckets]
+    examined = [0 for _ in buckets]
     creator_count = {}
+    total = 0
+    carry = 0
+
+    for i, bucket in enumerate(buckets):
+        quota = quotas[i] + carry
 
-    for bucket in buckets:
         for post in bucket:
+            if len(picked[i]) >= quota or total >= total_limit:
+                break
+
+            examined[i] += 1
             uid = post["user_id"]
             creator_count.setdefault(uid, 0)
 
             if creator_count[uid] >= MAX_POSTS_PER_CREATOR:
                 continue
 
-            final_posts.append(post)
+            picked[i].append(post)
             creator_count[uid] += 1
+            total += 1
 
-            if len(final_posts) >= total_limit:
-                return final_posts
+        carry = quota - len(picked[i])
 
-    return final_posts
+    return picked, examined
 
 # ============================================================
-# ENRICH POSTS
-# - user info
-# - likes count
-# - comments count
-# - support / deny %
-# - liked_by_current_user
+# ADAPTIVE OVER-FETCH / EMPTY PAGE PREDICTION ( per category )
+# - fetch_factor: EWMA of examined / picked rows → each bucket is
+#   over-fetched by it, so the creator cap still fills the page
+#   in ONE round of ( parallel ) bucket queries
+# - empty_rate: EWMA of "all buckets were empty" → when likely, the
+#   fallback query runs in parallel with the buckets instead of
+#   after them
 # ============================================================
 
-def enrich_posts(posts: list, current_user_id: str):
-    if not posts:
-        return posts
+EWMA_ALPHA = 0.2
+MAX_FETCH_FACTOR = 4
+EMPTY_PREDICT_THRESHOLD = 0.5
 
-    post_ids = [p["post_id"] for p in posts]
-    user_ids = list({p["user_id"] for p in posts})
+fetch_factor = {}   # category_id -> EWMA of examined / picked
+empty_rate = {}     # category_id -> EWMA of empty pages
 
-    # ---------------- USERS ----------------
-    users = (
-        supabase.table("users")
-        .select("user_id, user_name, full_name")
-        .in_("user_id", user_ids)
-        .execute()
-        .data or []
-    )
-    user_map = {u["user_id"]: u for u in users}
 
-    # ---------------- LIKES ----------------
-    likes = (
-        supabase.table("likes")
-        .select("post_id, user_id")
-        .in_("post_id", post_ids)
-        .execute()
-        .data or []
-    )
-
-    likes_count = {}
-    liked_by_user = set()
-    for l in likes:
-        pid = l["post_id"]
-        likes_count[pid] = likes_count.get(pid, 0) + 1
-        if l["user_id"] == current_user_id:
-            liked_by_user.add(pid)
-
-    # ---------------- COMMENTS (SUPPORT / DENY) ----------------
-    comments = (
-        supabase.table("comments")
-        .select("post_id, comment_for")
-        .in_("post_id", post_ids)
-        .execute()
-        .data or []
-    )
-
-    comment_stats = {}
-    for c in comments:
-        pid = c["post_id"]
-        comment_stats.setdefault(pid, {"support": 0, "deny": 0})
-
-        if c["comment_for"] == "support":
-            comment_stats[pid]["support"] += 1
-        elif c["comment_for"] == "deny":
-            comment_stats[pid]["deny"] += 1
+def ewma(table, key, sample, default):
+    table[key] = (1 - EWMA_ALPHA) * table.get(key, default) + EWMA_ALPHA * sample
 
-    # ---------------- MERGE DATA INTO POSTS ----------------
-    for post in posts:
-        uid = post["user_id"]
-        pid = post["post_id"]
 
-        support = comment_stats.get(pid, {}).get("support", 0)
-        deny = comment_stats.get(pid, {}).get("deny", 0)
-        total_comments = support + deny
+def over_fetch_limit(limit, factor):
+    # whole steps only → few distinct bucket cache keys
+    return limit * min(MAX_FETCH_FACTOR, max(1, math.ceil(factor)))
 
-        post["user_name"] = user_map.get(uid, {}).get("user_name")
-        post["full_name"] = user_map.get(uid, {}).get("full_name")
+# ============================================================
+# ENRICH POSTS ( services/post_hydration.py )
+# - post body / images / author
+# - likes count
+# - comments count
+# - support / deny %
+# - liked_by_current_user
+# ============================================================
 
-        post["likes_count"] = likes_count.get(pid, 0)
-        post["comments_count"] = total_comments
-        post["support_count"] = support
-        post["deny_count"] = deny
-        post["liked_by_current_user"] = pid in liked_by_user
+async def enrich_posts(posts: list, current_user_id: str, timer: Optional[StageTimer] = None):
+    if not posts:
+        return posts
 
-        if total_comments > 0:
-            post["support_percentage"] = round((support / total_comments) * 100, 2)
-            post["deny_percentage"] = round((deny / total_comments) * 100, 2)
-        else:
-            post["support_percentage"] = 0
-            post["deny_percentage"] = 0
+    timer = timer or StageTimer()
+    hydrated = await timer.timed(
+        "hydrate", hydrate_posts([p["post_id"] for p in posts], viewer_id=current_user_id)
+    )
 
-    return posts
+    enriched = []
+    for post in hydrated:
+        stats = post["stats"]
+        enriched.append({
+            "post_id": post["post_id"],
+            "user_id": post["user_id"],
+            "post_title": post["post_title"],
+            "post_content": post["post_content"],
+            "category": post["category_id"],
+            "created_at": post["created_at"],
+            "post_images": post["images"],
+
+            "user_name": post["author"]["user_name"],
+            "full_name": post["author"]["full_name"],
+
+            "likes_count": stats["likes_count"],
+            "comments_count": stats["comments_count"],
+            "support_count": stats["support_count"],
+            "deny_count": stats["deny_count"],
+            "liked_by_current_user": post["liked_by_current_user"],
+
+            "support_percentage": post["support_percent"],
+            "deny_percentage": post["deny_percent"],
+        })
+
+    return enriched
 
 # ============================================================
 # CATEGORY FEED ENDPOINT
@@ -167,29 +186,31 @@ async def category_feed(
     user=Depends(auth_guard)
 ):
     user_id = user["user_id"]
-  
+    timer = StageTimer()
 
-    now = datetime.now(timezone.utc)
+    # end of the current slot → shared bucket windows for this slot
+    slot = math.ceil(time.time() / BUCKET_SLOT_SECONDS) * BUCKET_SLOT_SECONDS
+    now = datetime.fromtimestamp(slot, timezone.utc)
 
     # ---------------- STEP 1: Get category ID ----------------
-    cat = (
-        supabase.table("categories")
-        .select("cat_id")
-        .ilike("cat_title", payload.category)
-        .limit(1)
-        .execute()
-        .data
-    )
+    cat = await categories.resolve(payload.category)
 
     if not cat:
         raise HTTPException(status_code=404, detail="Category not found")
 
-    category_id = cat[0]["cat_id"]
+    category_id = cat["cat_id"]
 
     # ---------------- STEP 2: Buffer ----------------
     effective_time = None
     if payload.last_seen:
         effective_time = datetime.fromisoformat(payload.last_seen) - timedelta(minutes=BUFFER_MINUTES)
+        if not effective_time.tzinfo:
+            effective_time = effective_time.replace(tzinfo=timezone.utc)
+        # snapped down → slightly wider buffer, far fewer distinct cache keys
+        effective_time = datetime.fromtimestamp(
+            math.floor(effective_time.timestamp() / BUCKET_SLOT_SECONDS) * BUCKET_SLOT_SECONDS,
+            timezone.utc,
+        )
 
     cursor = payload.cursor or CategoryCursor()
 
@@ -198,23 +219,11 @@ async def category_feed(
     b2_start = now - timedelta(hours=12)
     b3_start = now - timedelta(hours=48)
 
-    # ---------------- STEP 4: Bucket fetch ----------------
-    def fetch_bucket(start, end, cursor_time, limit):
+    # ---------------- STEP 4: Bucket fetch ( shared cache ) ----------------
+    async def query_bucket(start, end, cursor_time, limit):
         q = (
             supabase.table("posts")
-            .select("""
-                post_id,
-                user_id,
-                post_title,
-                post_content,
-                category,
-                created_at,
-                post_images (
-                    image_id,
-                    image_url,
-                    position
-                )
-            """)
+            .select(POST_COLUMNS)
             .eq("category", category_id)
             .gte("created_at", start.isoformat())
             .lt("created_at", end.isoformat())
@@ -226,73 +235,91 @@ async def category_feed(
         if effective_time:
             q = q.gte("created_at", effective_time.isoformat())
 
-        data = q.limit(limit).execute().data or []
+        return (await q.limit(limit).execute()).data or []
+
+    async def fetch_bucket(name, start, end, cursor_time, limit):
+        key = (category_id, name, cursor_time, effective_time, slot, limit)
+        rows = await bucket_cache.get_or_set(key, lambda: query_bucket(start, end, cursor_time, limit))
+        # copies → shuffle / enrich never touch the cached rows
+        return [dict(p) for p in rows]
+
+    async def query_fallback():
+        return (
+            await supabase.table("posts")
+            .select(POST_COLUMNS)
+            .eq("category", category_id)
+            .order("created_at", desc=True)
+            .limit(TOTAL_LIMIT)
+            .execute()
+        ).data or []
 
-        for post in data:
-            post["post_images"] = sorted(post.get("post_images", []), key=lambda x: x["position"])
+    async def fetch_fallback():
+        rows = await bucket_cache.get_or_set((category_id, "fallback", slot), query_fallback)
+        return [dict(p) for p in rows]
 
-        return data
+    # ---------------- STEP 5: Fetch buckets ( parallel, over-fetched ) ----------------
+    quotas = [B1_LIMIT, B2_LIMIT, B3_LIMIT]
+    factor = fetch_factor.get(category_id, 2.0)
+    prefetch_fallback = empty_rate.get(category_id, 0.0) >= EMPTY_PREDICT_THRESHOLD
 
-    # ---------------- STEP 5: Fetch buckets ----------------
-    bucket1 = fetch_bucket(b1_start, now, cursor.b1, B1_LIMIT)
-    bucket2 = fetch_bucket(b2_start, b1_start, cursor.b2, B2_LIMIT)
-    bucket3 = fetch_bucket(b3_start, b2_start, cursor.b3, B3_LIMIT)
+    with timer.stage("buckets"):
+        fetches = [
+            fetch_bucket("b1", b1_start, now, cursor.b1, over_fetch_limit(B1_LIMIT, factor)),
+            fetch_bucket("b2", b2_start, b1_start, cursor.b2, over_fetch_limit(B2_LIMIT, factor)),
+            fetch_bucket("b3", b3_start, b2_start, cursor.b3, over_fetch_limit(B3_LIMIT, factor)),
+        ]
+        if prefetch_fallback:
+            fetches.append(fetch_fallback())
 
-    # ---------------- STEP 6: Shuffle ----------------
-    seed = payload.session_seed
-    bucket1 = light_shuffle(bucket1, seed + "_b1")
-    bucket2 = light_shuffle(bucket2, seed + "_b2")
-    bucket3 = light_shuffle(bucket3, seed + "_b3")
+        results = await gather_bounded(*fetches)
+
+    buckets = results[:3]
+    fallback = results[3] if prefetch_fallback else None
+
+    # ---------------- STEP 6: Fill page with creator fairness ----------------
+    picked, examined = fill_with_creator_soft_cap(buckets, quotas, TOTAL_LIMIT)
 
-    # ---------------- STEP 7: Merge with creator fairness ----------------
-    final_posts = merge_with_creator_soft_cap([bucket1, bucket2, bucket3], TOTAL_LIMIT)
+    if sum(examined):
+        ewma(fetch_factor, category_id, sum(examined) / max(1, sum(len(p) for p in picked)), 2.0)
 
-    # ---------------- STEP 8: Enrich posts ----------------
-    final_posts = enrich_posts(final_posts, current_user_id=user_id)
+    # ---------------- STEP 7: Shuffle ( per bucket, seeded ) ----------------
+    seed = payload.session_seed
+    final_posts = []
+    for i, bucket_posts in enumerate(picked):
+        final_posts.extend(light_shuffle(bucket_posts, seed + f"_b{i + 1}"))
 
-    # ---------------- STEP 9: Fallback if empty ----------------
+    # ---------------- STEP 8: Fallback if empty ----------------
+    ewma(empty_rate, category_id, 0.0 if final_posts else 1.0, 0.0)
     if not final_posts:
-        fallback = (
-            supabase.table("posts")
-            .select("""
-                post_id,
-                user_id,
-                post_title,
-                post_content,
-                category,
-                created_at,
-                post_images (
-                    image_id,
-                    image_url,
-                    position
-                )
-            """)
-            .eq("category", category_id)
-            .order("created_at", desc=True)
-            .limit(TOTAL_LIMIT)
-            .execute()
-            .data or []
-        )
-        for post in fallback:
-            post["post_images"] = sorted(post.get("post_images", []), key=lambda x: x["position"])
-        final_posts = enrich_posts(fallback, current_user_id=user_id)
+        final_posts = fallback if fallback is not None else await fetch_fallback()
+
+    # ---------------- STEP 9: Enrich posts ( once ) ----------------
+    with timer.stage("enrich"):
+        final_posts = await enrich_posts(final_posts, current_user_id=user_id, timer=timer)
 
     # ---------------- STEP 10: Cursor and last_seen ----------------
+    # last examined row per bucket ( rows are newest → oldest )
+    old_cursor = [cursor.b1, cursor.b2, cursor.b3]
     next_cursor = {
-        "b1": bucket1[-1]["created_at"] if bucket1 else cursor.b1,
-        "b2": bucket2[-1]["created_at"] if bucket2 else cursor.b2,
-        "b3": bucket3[-1]["created_at"] if bucket3 else cursor.b3
+        f"b{i + 1}": buckets[i][examined[i] - 1]["created_at"] if examined[i] else old_cursor[i]
+        for i in range(3)
     }
     last_seen_out = max(p["created_at"] for p in final_posts) if final_posts else payload.last_seen
 
     # ---------------- STEP 11: Return response ----------------
-    return {
+    response = {
         "posts": final_posts,
         "next_cursor": next_cursor,
         "last_seen": last_seen_out,
         "has_more": len(final_posts) == TOTAL_LIMIT
         
     }
+    if payload.debug:
+        response["debug"] = timer.report()
+        response["debug"]["bucket_cache"] = bucket_cache.stats()
+        response["debug"]["fetch_factor"] = round(factor, 2)
+        response["debug"]["fallback_prefetched"] = prefetch_fallback
+    return response
 
 
 
@@ -311,42 +338,38 @@ async def trending_by_category(
 ):
 
     # 1️⃣ Get category ID from title
-    category_res = (
-        supabase
-        .table("categories")
-        .select("cat_id")
-        .ilike("cat_title", category_title)
-        .single()
-        .execute()
-    )
+    cat = await categories.resolve(category_title)
 
-    if not category_res.data:
+    if not cat:
         return {"feed": []}
 
-    category_id = category_res.data["cat_id"]
+    category_id = cat["cat_id"]
 
-    # 2️⃣ Call RPC using category_id
-    rpc = supabase.rpc(
-        "get_trending_posts_by_category",
-        {
-            "p_category": category_id,
-            "p_limit": limit
-        }
-    ).execute()
+    # 2️⃣ In-memory top-K for the category ( RPC while the engine is cold )
+    post_ids = trending_engine.top_post_ids(limit, category=category_id)
+    if post_ids is None:
+        rpc = await supabase.rpc(
+            "get_trending_posts_by_category",
+            {
+                "p_category": category_id,
+                "p_limit": limit
+            }
+        ).execute()
 
-    post_ids = [row["post_id"] for row in rpc.data]
+        post_ids = [row["post_id"] for row in rpc.data]
 
     if not post_ids:
         return {"feed": []}
 
-    # 3️⃣ Fetch full post data
-    posts = (
-        supabase.table("posts")
+    # 3️⃣ Fetch full post data ( keep ranking order )
+    rows = (
+        await supabase.table("posts")
         .select("post_id, user_id, post_title, post_content, category, created_at")
         .in_("post_id", post_ids)
         .execute()
-        .data
-    )
+    ).data or []
+    post_map = {p["post_id"]: p for p in rows}
+    posts = [post_map[pid] for pid in post_ids if pid in post_map]
 
     return {
         "category": category_title,
@@ -1,19 +1,71 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
+import secrets
 
 from fastapi import APIRouter, Depends, HTTPException
 from ..middleware.jwt_auth import auth_guard
 from ..config.supabase_config import supabase
+from ..services.category_registry import registry as categories
+from ..services import seen_store
+from ..services.post_hydration import hydrate_posts
 
 #this is for dahan ssaid exclude some post and send remaining post for category feed
 
 
 class CategoryRandomFeedRequest(BaseModel):
     category_title: str
-    exclude_post_ids: List[str] = []
+    session_token: Optional[str] = None   # server-side seen-set ( returned by the first call )
+    exclude_post_ids: List[str] = []      # older clients only
     limit: int = 20
 
 
+# only what the scan needs, bodies / counts / authors are hydrated
+POST_SELECT = "post_id, created_at"
+
+SCAN_BATCH_FACTOR = 2    # rows fetched per round = remaining * factor
+MAX_SCAN_ROUNDS = 3      # bound on round trips when most rows are already seen
+
+
+async def scan_unseen(cat_id, bloom, boundary, newer: bool, want: int):
+    """
+    Walk posts of the category away from `boundary` ( above it when
+    newer, below it otherwise ), skipping what the Bloom filter has seen.
+    Returns (unseen posts, created_at of the first / last examined row).
+    boundary is inclusive on the first round: equal timestamps are
+    handled by the Bloom filter instead of being skipped.
+    """
+    found, first_examined, last_examined = [], None, None
+    edge, inclusive = boundary, True
+
+    for _ in range(MAX_SCAN_ROUNDS):
+        if len(found) >= want:
+            break
+
+        q = supabase.table("posts").select(POST_SELECT).eq("category", cat_id)
+        if edge:
+            if newer:
+                q = q.gte("created_at", edge) if inclusive else q.gt("created_at", edge)
+            else:
+                q = q.lte("created_at", edge) if inclusive else q.lt("created_at", edge)
+
+        batch_size = (want - len(found)) * SCAN_BATCH_FACTOR
+        rows = (await q.order("created_at", desc=not newer).limit(batch_size).execute()).data or []
+
+        for post in rows:
+            if len(found) >= want:
+                break
+            first_examined = first_examined or post["created_at"]
+            last_examined = post["created_at"]
+            if post["post_id"] not in bloom:
+                found.append(post)
+
+        if len(rows) < batch_size:
+            break   # nothing further in that direction
+        edge, inclusive = rows[-1]["created_at"], False
+
+    return found, first_examined, last_examined
+
+
 router = APIRouter()
 
 
@@ -24,76 +76,78 @@ async def get_random_posts_by_category(
 ):
     try:
         # 1️⃣ Get category id from title
-        cat_res = (
-            supabase
-            .table("categories")
-            .select("cat_id")
-            .ilike("cat_title", payload.category_title)
-            .execute()
-        )
-
-        if not cat_res.data or len(cat_res.data) == 0:
+        cat = await categories.resolve(payload.category_title)
+
+        if not cat:
             raise HTTPException(status_code=404, detail="Category not found")
 
-        # ✅ FIX: access first row
-        cat_id = cat_res.data[0]["cat_id"]
-
-        # 2️⃣ Fetch posts with like & comment counts
-        query = (
-            supabase
-            .table("posts")
-            .select("""
-                post_id,
-                post_title,
-                post_content,
-                created_at,
-
-                likes_count:likes(count),
-                comments_count:comments(count),
-
-                users:user_id (
-                    user_id,
-                    user_name,
-                    full_name,
-                    profile_img_url
-                ),
-                post_images (
-                    image_id,
-                    image_url,
-                    position
-                )
-            """)
-            .eq("category", cat_id)
-        )
+        cat_id = cat["cat_id"]
 
-        # 3️⃣ Exclude already fetched posts
-        if payload.exclude_post_ids:
-            query = query.not_.in_("post_id", payload.exclude_post_ids)
+        if payload.exclude_post_ids and not payload.session_token:
+            # older clients → the client-sent exclude list, as before
+            session_token = None
 
-        # 4️⃣ Order + limit
-        query = query.order("created_at", desc=True).limit(payload.limit)
+            # 2️⃣ Fetch posts with like & comment counts
+            query = supabase.table("posts").select(POST_SELECT).eq("category", cat_id)
 
-        res = query.execute()
+            # 3️⃣ Exclude already fetched posts
+            query = query.not_.in_("post_id", payload.exclude_post_ids)
 
-        # 5️⃣ Normalize counts (IMPORTANT)
+            # 4️⃣ Order + limit
+            query = query.order("created_at", desc=True).limit(payload.limit)
+
+            rows = (await query.execute()).data or []
+
+        else:
+            # 2️⃣ Seen-set of this session ( new session → new token )
+            user_id = user["user_id"]
+            session_token = payload.session_token or secrets.token_urlsafe(16)
+            session = await seen_store.load_session(user_id, session_token, cat_id)
+            session.bloom.update(payload.exclude_post_ids)
+
+            # 3️⃣ New posts above `high` first ( oldest first so `high`
+            #    only moves over rows that were examined ), then older
+            #    posts below `low`
+            rows = []
+            if session.high:
+                rows, _, last = await scan_unseen(cat_id, session.bloom, session.high, True, payload.limit)
+                if last:
+                    session.high = last
+
+            if len(rows) < payload.limit:
+                older, first, last = await scan_unseen(
+                    cat_id, session.bloom, session.low, False, payload.limit - len(rows)
+                )
+                rows += older
+                if last:
+                    session.low = last
+                    # first page of the session started at the very top
+                    session.high = session.high or first
+
+            # 4️⃣ Remember what was served, newest first like before
+            session.bloom.update(p["post_id"] for p in rows)
+            await seen_store.save_session(user_id, session_token, cat_id, session)
+            rows.sort(key=lambda p: p["created_at"], reverse=True)
+
+        # 5️⃣ Hydrate ( cached body / images / author / counters )
         posts = []
-        for post in res.data:
-            post["likes_count"] = (
-                post["likes_count"][0]["count"]
-                if post.get("likes_count") and len(post["likes_count"]) > 0
-                else 0
-            )
-            post["comments_count"] = (
-                post["comments_count"][0]["count"]
-                if post.get("comments_count") and len(post["comments_count"]) > 0
-                else 0
-            )
-            posts.append(post)
+        for post in await hydrate_posts([p["post_id"] for p in rows]):
+            posts.append({
+                "post_id": post["post_id"],
+                "post_title": post["post_title"],
+                "post_content": post["post_content"],
+                "created_at": post["created_at"],
+                "likes_count": post["stats"]["likes_count"],
+                "comments_count": post["stats"]["comments_count"],
+                "users": post["author"],
+                "post_images": post["images"],
+            })
 
         return {
             "category": payload.category_title,
             "posts": posts,
-            "count": len(posts)
+            "count": len(posts),
+            "session_token": session_token
         }
 
     except HTTPException:
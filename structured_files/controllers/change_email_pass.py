@@ -2,15 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta, timezone
 import random
-from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
 from ..utils.email_sender import send_otp_email
+from ..utils.password_hashing import verify_password
 
 router = APIRouter()
-ph = PasswordHasher()
 
 
 class RequestEmailChange(BaseModel):
@@ -27,7 +26,7 @@ async def request_email_change(
 
     # 1️⃣ Check if email already exists
     email_check = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("user_id")
         .eq("user_email", payload.new_email)
         .limit(1)
@@ -39,7 +38,7 @@ async def request_email_change(
 
     # 2️⃣ Fetch current password + name
     res = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("password, user_name")
         .eq("user_id", user_id)
         .limit(1)
@@ -53,7 +52,7 @@ async def request_email_change(
 
     # 3️⃣ Verify password
     try:
-        ph.verify(user_row["password"], payload.current_password)
+        await verify_password(user_row["password"], payload.current_password)
     except VerifyMismatchError:
         raise HTTPException(status_code=401, detail="Invalid password")
 
@@ -62,7 +61,7 @@ async def request_email_change(
     otp_expiry = datetime.now(timezone.utc) + timedelta(minutes=10)
 
     # 5️⃣ Store OTP ONLY
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "otp": otp,
         "otp_expiry": otp_expiry.isoformat(),
         "modified_at": datetime.now(timezone.utc).isoformat(),
@@ -78,7 +77,7 @@ async def request_email_change(
         )
     except Exception:
         # rollback OTP
-        supabase.table("users").update({
+        await supabase.table("users").update({
             "otp": None,
             "otp_expiry": None
         }).eq("user_id", user_id).execute()
@@ -106,7 +105,7 @@ async def verify_email_change(
     user_id = user["user_id"]
 
     email_check = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("user_id")
         .eq("user_email", payload.new_email)
         .limit(1)
@@ -120,7 +119,7 @@ async def verify_email_change(
 
     # 1️⃣ Fetch OTP
     res = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("otp, otp_expiry")
         .eq("user_id", user_id)
         .limit(1)
@@ -147,7 +146,7 @@ async def verify_email_change(
         raise HTTPException(status_code=401, detail="Invalid OTP")
 
     # 4️⃣ Update email + clear OTP
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "user_email": payload.new_email,
         "otp": None,
         "otp_expiry": None,
@@ -3,15 +3,14 @@ from pydantic import BaseModel
 from datetime import datetime, timedelta, timezone
 import random
 
-from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
 from ..utils.email_sender import send_otp_email
+from ..utils.password_hashing import hash_password, verify_password
 
 router = APIRouter()
-ph = PasswordHasher()
 
 
 class RequestPasswordChange(BaseModel):
@@ -28,7 +27,7 @@ async def request_password_change(
 
     # 1️⃣ Fetch user data
     res = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("password, user_name, user_email")
         .eq("user_id", user_id)
         .limit(1)
@@ -42,7 +41,7 @@ async def request_password_change(
 
     # 2️⃣ Verify current password
     try:
-        ph.verify(user_row["password"], payload.current_password)
+        await verify_password(user_row["password"], payload.current_password)
     except VerifyMismatchError:
         raise HTTPException(status_code=401, detail="Invalid current password")
 
@@ -53,7 +52,7 @@ async def request_password_change(
    
 
     # 5️⃣ Store OTP + pending password
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "otp": otp,
         "otp_expiry": otp_expiry.isoformat(),
       
@@ -70,7 +69,7 @@ async def request_password_change(
         )
     except Exception:
         # rollback on email failure
-        supabase.table("users").update({
+        await supabase.table("users").update({
             "otp": None,
             "otp_expiry": None,
         }).eq("user_id", user_id).execute()
@@ -100,7 +99,7 @@ async def verify_password_change(
 
     # 1️⃣ Fetch OTP
     res = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("otp, otp_expiry")
         .eq("user_id", user_id)
         .limit(1)
@@ -133,10 +132,10 @@ async def verify_password_change(
         raise HTTPException(status_code=401, detail="Invalid OTP")
 
     # 4️⃣ Hash new password AFTER OTP verification
-    new_hashed_password = ph.hash(payload.new_password)
+    new_hashed_password = await hash_password(payload.new_password)
 
     # 5️⃣ Update password + cleanup
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "password": new_hashed_password,
         "otp": None,
         "otp_expiry": None,
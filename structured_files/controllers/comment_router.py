@@ -6,6 +6,8 @@ from datetime import datetime
 
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..utils.data_loader import RequestLoaders, get_loaders
+from ..services import trending_engine, post_hydration
 
 
 router = APIRouter()
@@ -49,7 +51,7 @@ async def create_comment(payload: CommentPayload, user=Depends(auth_guard)):
 
     parent_id = payload.parent_comment_id or None
 
-    supabase.table("comments").insert({
+    await supabase.table("comments").insert({
         "comment_id": comment_id,
         "post_id": payload.post_id,
         "user_id": user_id,
@@ -65,6 +67,8 @@ async def create_comment(payload: CommentPayload, user=Depends(auth_guard)):
         "modified_by":user_id,
         "modified_at": timestamp
     }).execute()
+    trending_engine.record_comment(payload.post_id)
+    post_hydration.invalidate(payload.post_id)
 
     return {
         "status": "success",
@@ -89,7 +93,7 @@ async def update_comment(payload: UpdateCommentPayload, user=Depends(auth_guard)
 
 
     existing = (
-        supabase.table("comments")
+        await supabase.table("comments")
         .select("user_id")
         .eq("comment_id", payload.comment_id)
         .single()
@@ -104,7 +108,7 @@ async def update_comment(payload: UpdateCommentPayload, user=Depends(auth_guard)
 
     timestamp = datetime.utcnow().isoformat()
 
-    supabase.table("comments").update({
+    await supabase.table("comments").update({
         "comment_text": payload.new_comment_text,
         "modified_by": user_id,
         "modified_at": timestamp
@@ -131,8 +135,8 @@ async def delete_comment(payload: DeleteCommentRequest, user=Depends(auth_guard)
   
 
     existing = (
-        supabase.table("comments")
-        .select("user_id")
+        await supabase.table("comments")
+        .select("user_id, post_id")
         .eq("comment_id", payload.comment_id)
         .single()
         .execute()
@@ -145,10 +149,13 @@ async def delete_comment(payload: DeleteCommentRequest, user=Depends(auth_guard)
         raise HTTPException(status_code=403, detail="You cannot delete this comment")
 
     # delete this comment
-    supabase.table("comments").delete().eq("comment_id", payload.comment_id).execute()
+    await supabase.table("comments").delete().eq("comment_id", payload.comment_id).execute()
     
     # delete replies of this comment
-    supabase.table("comments").delete().eq("parent_comment_id", payload.comment_id).execute()
+    await supabase.table("comments").delete().eq("parent_comment_id", payload.comment_id).execute()
+
+    # comment counter changed for the comment and its replies
+    post_hydration.invalidate(existing["post_id"])
 
     return {
         "status": "success",
@@ -175,87 +182,43 @@ class CommentRepliesPagedRequest(BaseModel):
     skip: int = 0
     limit: int = 2
 
+REPLIES_PREVIEW = 2
+
 @router.post("/comment_list", status_code=status.HTTP_200_OK)
 async def get_comments(payload: PostCommentsPagedRequest, user=Depends(auth_guard)):
     
     user_id = user["user_id"]
 
-    res = (
-        supabase.table("comments")
-        .select("*")
-        .eq("post_id", payload.post_id)
-        .is_("parent_comment_id", None)
-        .order("created_at", desc=False)
-        .range(payload.skip, payload.skip + payload.limit - 1)
-        .execute()
-    )
-
-    original = res.data or []
+    # one round trip: page of comments + first replies + reply counts + authors
+    # ( see sql/001_comment_thread_page.sql )
+    res = await supabase.rpc(
+        "get_comment_thread_page",
+        {
+            "p_post_id": payload.post_id,
+            "p_skip": payload.skip,
+            "p_limit": payload.limit,
+            "p_reply_limit": REPLIES_PREVIEW
+        }
+    ).execute()
+
+    def to_item(row):
+        return {
+            "comment_id": row["comment_id"],
+            "user_name": row.get("user_name"),
+            "profile_img_url": row.get("profile_img_url"),
+            "text": row.get("comment_text"),
+            "created_at": row.get("created_at"),   # <- raw timestamp
+            "owned_by_me": (row["user_id"] == user_id),
+        }
 
     final_comments = []
 
-    for c in original:
-        
-        comment_owner_id = c["user_id"]
-
-        user_info = (
-            supabase.table("users")
-            .select("user_name, profile_img_url")
-            .eq("user_id", comment_owner_id)
-            .single()
-            .execute()
-        )
-
-        final_comment = {
-            "comment_id": c["comment_id"],
-            "user_name": user_info.data.get("user_name"),
-            "profile_img_url": user_info.data.get("profile_img_url"),
-            "text": c.get("comment_text"),
-            "created_at": c.get("created_at"),   # <- raw timestamp
-            "owned_by_me": (comment_owner_id == user_id),
-        }
+    for c in res.data or []:
 
-        replies_res = (
-            supabase.table("comments")
-            .select("*")
-            .eq("parent_comment_id", c["comment_id"])
-            .order("created_at", desc=False)
-            .limit(2)
-            .execute()
-        )
-
-        replies = replies_res.data or []
-        final_replies = []
-
-        for r in replies:
-            reply_user_info = (
-                supabase.table("users")
-                .select("user_name, profile_img_url")
-                .eq("user_id", r["user_id"])
-                .single()
-                .execute()
-            )
-
-            final_replies.append({
-                "comment_id": r["comment_id"],
-                "user_name": reply_user_info.data.get("user_name"),
-                "profile_img_url": reply_user_info.data.get("profile_img_url"),
-                "text": r.get("comment_text"),
-                "created_at": r.get("created_at"),  # <- raw timestamp
-                "owned_by_me": (r["user_id"] == user_id),
-            })
-
-        final_comment["replies"] = final_replies
-
-        count_res = (
-            supabase.table("comments")
-            .select("comment_id", count="exact")
-            .eq("parent_comment_id", c["comment_id"])
-            .execute()
-        )
-
-        final_comment["reply_count"] = count_res.count
-        final_comment["show_more_replies"] = count_res.count > 2
+        final_comment = to_item(c)
+        final_comment["replies"] = [to_item(r) for r in c.get("replies") or []]
+        final_comment["reply_count"] = c["reply_count"]
+        final_comment["show_more_replies"] = c["reply_count"] > REPLIES_PREVIEW
 
         final_comments.append(final_comment)
 
@@ -267,13 +230,17 @@ async def get_comments(payload: PostCommentsPagedRequest, user=Depends(auth_guar
 
 #load the replies -----------------------------------
 @router.post("/more_replies", status_code=status.HTTP_200_OK)
-async def get_more_replies(payload: CommentRepliesPagedRequest, user=Depends(auth_guard)):
+async def get_more_replies(
+    payload: CommentRepliesPagedRequest,
+    user=Depends(auth_guard),
+    loaders: RequestLoaders = Depends(get_loaders)
+):
     
     user_id = user["user_id"]
 
 
     res = (
-        supabase.table("comments")
+        await supabase.table("comments")
         .select("*")
         .eq("parent_comment_id", payload.comment_id)
         .order("created_at", desc=False)
@@ -283,22 +250,18 @@ async def get_more_replies(payload: CommentRepliesPagedRequest, user=Depends(aut
 
     replies = res.data or []
 
-    final_replies = []
+    # one users query for the whole page
+    authors = await loaders.users.load_many([r["user_id"] for r in replies])
 
-    for r in replies:
+    final_replies = []
 
-        user_info = (
-            supabase.table("users")
-            .select("user_name, profile_img_url")
-            .eq("user_id", r["user_id"])
-            .single()
-            .execute()
-        )
+    for r, author in zip(replies, authors):
+        author = author or {}
 
         final_replies.append({
             "comment_id": r["comment_id"],
-            "user_name": user_info.data.get("user_name"),
-            "profile_img_url": user_info.data.get("profile_img_url"),
+            "user_name": author.get("user_name"),
+            "profile_img_url": author.get("profile_img_url"),
             "text": r.get("comment_text"),
             "created_at": r.get("created_at"),    # raw ISO timestamp
             "owned_by_me": (r.get("user_id") == user_id),
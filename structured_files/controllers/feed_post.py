@@ -1,193 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from pydantic import BaseModel
+from typing import Optional
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..utils.concurrency import StageTimer
+from ..utils.feed_cursor import encode_cursor, decode_cursor
+from ..services import timeline_service, trending_engine
+from ..services.post_hydration import hydrate_posts
 
 router = APIRouter()
 
 class FeedRequest(BaseModel):
-    skip: int = 0
+    skip: int = 0                   # legacy offset paging ( older clients )
     limit: int = 20
+    cursor: Optional[str] = None    # next_cursor from the previous page ( wins over skip )
+    debug: bool = False   # adds per-stage timings to the response
 
 @router.post("/feed")
-async def get_feed(payload: FeedRequest, user=Depends(auth_guard)):
+async def get_feed(payload: FeedRequest, background_tasks: BackgroundTasks, user=Depends(auth_guard)):
+    # bad cursor → 400 ( decoded before the 500 catch-all below )
+    cursor = decode_cursor(payload.cursor) if payload.cursor else None
+
     try:
         user_id = user["user_id"]
 
 
         skip = payload.skip
         limit = payload.limit
+        timer = StageTimer()
 
         # --------------------------------------------------
-        # 1️⃣ Check if user follows anyone
-        # --------------------------------------------------
-        following_check = (
-            supabase.table("userfollowing")
-            .select("following_id")
-            .eq("follower_id", user_id)
-            .limit(1)
-            .execute()
-        )
-        has_following = bool(following_check.data)
-
-        # --------------------------------------------------
-        # 2️⃣ Get posts
+        # 0️⃣ Precomputed timeline ( fan-out-on-write, TIMELINE_STORE )
         # --------------------------------------------------
-        if has_following:
-            following_ids = [
-                f["following_id"]
-                for f in supabase.table("userfollowing")
-                .select("following_id")
-                .eq("follower_id", user_id)
-                .execute()
-                .data
-            ]
-
-            posts = (
-                supabase.table("posts")
-                .select("post_id, user_id, post_title, post_content, category, created_at")
-                .in_("user_id", following_ids)
-                .order("created_at", desc=True)
-                .range(skip, skip + limit - 1)
-                .execute()
-                .data or []
+        timeline_posts = None
+        if timeline_service.enabled() and (cursor or skip == 0):
+            timeline_posts, materialized = await timer.timed(
+                "timeline", timeline_service.read_following_page(user_id, cursor, limit)
             )
-            # Keep order as-is
-            post_ids = [p["post_id"] for p in posts]
+            if not materialized:
+                # first read → build the timeline after this response
+                background_tasks.add_task(timeline_service.backfill, user_id)
+
+        # empty first page → let the RPC decide following vs trending
+        if timeline_posts is not None and (timeline_posts or cursor):
+            has_following = True
+            posts = timeline_posts
 
         else:
-            trending = supabase.rpc(
-                "get_trending_post_ids",
-                {"p_offset": skip, "p_limit": limit}
-            ).execute()
-            post_ids = [p["post_id"] for p in trending.data]
-
-            # Fetch full post data preserving RPC order
-            posts_data = (
-                supabase.table("posts")
-                .select("post_id, user_id, post_title, post_content, category, created_at")
-                .in_("post_id", post_ids)
-                .execute()
-                .data or []
-            )
-            post_map = {p["post_id"]: p for p in posts_data}
-            posts = [post_map[pid] for pid in post_ids if pid in post_map]
+            # --------------------------------------------------
+            # 1️⃣ Following check + following posts in ONE call
+            #    ( userfollowing ⋈ posts runs inside the database,
+            #      no follow-id list travels through the URL )
+            # --------------------------------------------------
+            following_feed = (await timer.timed("following_feed", supabase.rpc(
+                "get_following_feed",
+                {
+                    "p_user_id": user_id,
+                    "p_limit": limit,
+                    "p_skip": skip,
+                    "p_cursor_created_at": cursor["created_at"] if cursor else None,
+                    "p_cursor_post_id": cursor["post_id"] if cursor else None,
+                }
+            ).execute())).data or {}
+            has_following = bool(following_feed.get("has_following"))
+
+            # --------------------------------------------------
+            # 2️⃣ Get posts
+            # --------------------------------------------------
+            with timer.stage("posts"):
+                if has_following:
+                    # already ordered (created_at desc, post_id desc)
+                    posts = following_feed.get("posts") or []
+
+                else:
+                    # in-memory ranking when warm, otherwise the RPC
+                    post_ids = trending_engine.top_post_ids(limit, skip)
+                    if post_ids is None:
+                        trending = await supabase.rpc(
+                            "get_trending_post_ids",
+                            {"p_offset": skip, "p_limit": limit}
+                        ).execute()
+                        post_ids = [p["post_id"] for p in trending.data]
+
+                    # ranking order; bodies come from the hydration cache
+                    posts = [{"post_id": pid} for pid in post_ids]
 
         if not posts:
             return {
                 
-                "feed": []
+                "feed": [],
+                "next_cursor": None
             }
 
-        post_ids = [p["post_id"] for p in posts]
-        user_ids = list({p["user_id"] for p in posts})
-        category_ids = list({p["category"] for p in posts})
-
         # --------------------------------------------------
-        # 3️⃣ Batch Fetch Related Data
+        # 3️⃣ Hydrate ( cached post / author / category / counters
+        #    + the viewer's own likes )
         # --------------------------------------------------
-        users = (
-            supabase.table("users")
-            .select("user_id, user_name, full_name, profile_img_url")
-            .in_("user_id", user_ids)
-            .execute()
-            .data or []
-        )
-        user_map = {u["user_id"]: u for u in users}
-
-        categories = (
-            supabase.table("categories")
-            .select("cat_id, cat_title")
-            .in_("cat_id", category_ids)
-            .execute()
-            .data or []
-        )
-        category_map = {c["cat_id"]: c["cat_title"] for c in categories}
-
-        comments = (
-            supabase.table("comments")
-            .select("post_id, comment_for")
-            .in_("post_id", post_ids)
-            .execute()
-            .data or []
+        hydrated = await timer.timed(
+            "hydrate", hydrate_posts([p["post_id"] for p in posts], viewer_id=user_id)
         )
 
-        likes = (
-            supabase.table("likes")
-            .select("post_id, user_id")
-            .in_("post_id", post_ids)
-            .execute()
-            .data or []
-        )
-
-        images = (
-            supabase.table("post_images")
-            .select("post_id, image_url, position")
-            .in_("post_id", post_ids)
-            .order("position")
-            .execute()
-            .data or []
-        )
-        image_map = {}
-        for img in images:
-            image_map.setdefault(img["post_id"], []).append({
-                "image_url": img["image_url"],
-                "position": img["position"]
-            })
-
-        # --------------------------------------------------
-        # 4️⃣ Compute Stats
         # --------------------------------------------------
-        comment_stats = {}
-        for c in comments:
-            pid = c["post_id"]
-            comment_stats.setdefault(pid, {"support": 0, "deny": 0})
-            if c["comment_for"] == "support":
-                comment_stats[pid]["support"] += 1
-            elif c["comment_for"] == "deny":
-                comment_stats[pid]["deny"] += 1
-
-        likes_count = {}
-        liked_by_user = set()
-        for l in likes:
-            likes_count[l["post_id"]] = likes_count.get(l["post_id"], 0) + 1
-            if l["user_id"] == user_id:
-                liked_by_user.add(l["post_id"])
-
-        # --------------------------------------------------
-        # 5️⃣ Build Final Response
+        # 4️⃣ Build Final Response
         # --------------------------------------------------
         feed = []
-        for post in posts:
-            pid = post["post_id"]
-            stats = comment_stats.get(pid, {"support": 0, "deny": 0})
-            total_comments = stats["support"] + stats["deny"]
-
-            support_percent = round((stats["support"] / total_comments) * 100, 2) if total_comments else 0
-            deny_percent = round((stats["deny"] / total_comments) * 100, 2) if total_comments else 0
-
+        for post in hydrated:
             feed.append({
-                "post_id": pid,
-                "user": user_map.get(post["user_id"]),
+                "post_id": post["post_id"],
+                "user": post["author"],
                 "post_title": post["post_title"],
                 "post_content": post["post_content"],
                 "category": {
-                    "cat_id": post["category"],
-                    "cat_title": category_map.get(post["category"])
+                    "cat_id": post["category_id"],
+                    "cat_title": post["category"]
                 },
-                "images": image_map.get(pid, []),
-                "likes_count": likes_count.get(pid, 0),
-                "comments_count": total_comments,
-                "support_percent": support_percent,
-                "deny_percent": deny_percent,
-                "liked_by_current_user": pid in liked_by_user,
+                "images": [
+                    {"image_url": img["image_url"], "position": img["position"]}
+                    for img in post["images"]
+                ],
+                "likes_count": post["stats"]["likes_count"],
+                "comments_count": post["stats"]["comments_count"],
+                "support_percent": post["support_percent"],
+                "deny_percent": post["deny_percent"],
+                "liked_by_current_user": post["liked_by_current_user"],
                 "created_at": post["created_at"]
             })
 
-        return {
+        # keyset cursor only for the following feed ( trending is ranked by the RPC )
+        next_cursor = encode_cursor(posts[-1]) if has_following and len(posts) == limit else None
+
+        response = {
            
-            "feed": feed
+            "feed": feed,
+            "next_cursor": next_cursor
         }
+        if payload.debug:
+            response["debug"] = timer.report()
+        return response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"FEED_ERROR: {str(e)}")
@@ -1,12 +1,13 @@
 
 
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
 from pydantic import BaseModel
-from uuid import uuid4
 
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..repositories.follow_repository import FollowingRepository
+from ..services import timeline_service, user_cards
 
 router = APIRouter()
 
@@ -18,7 +19,7 @@ class FollowPayload(BaseModel):
 
 # ----------------- Follow a user -----------------
 @router.post("/follow", status_code=status.HTTP_200_OK)
-def follow_user(payload: FollowPayload, user=Depends(auth_guard)):
+async def follow_user(payload: FollowPayload, background_tasks: BackgroundTasks, user=Depends(auth_guard)):
 
     follower_id= user["user_id"]
     
@@ -32,35 +33,22 @@ def follow_user(payload: FollowPayload, user=Depends(auth_guard)):
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
 
     try:
-        existing = (
-            supabase.table("userfollowing")
-            .select("*")
-            .eq("follower_id", follower_id)
-            .eq("following_id", following_id)
-            .execute()
-        )
-
-        if existing.data:
+        # follow row + follower / following counters in one call
+        result = await FollowingRepository.follow_user(follower_id, following_id)
+
+        if result["already_following"]:
             return {
                 "status": "success",
                 "message": "Already following"
             }
 
-        follow_id = str(uuid4())
-        result = (
-            supabase.table("userfollowing")
-            .insert({
-                "follow_id": follow_id,
-                "follower_id": follower_id,
-                "following_id": following_id
-            })
-            .execute()
-        )
+        # older posts of the new author show up in the following feed
+        background_tasks.add_task(timeline_service.follow, follower_id, following_id)
 
         return {
             "status": "success",
             "message": "Followed successfully",
-            "follow_id": follow_id
+            "follow_id": result["follow_id"]
            
         }
 
@@ -70,7 +58,7 @@ def follow_user(payload: FollowPayload, user=Depends(auth_guard)):
 
 # ----------------- Unfollow a user -----------------
 @router.post("/unfollow", status_code=status.HTTP_200_OK)
-def unfollow_user(payload: FollowPayload,user=Depends(auth_guard)):
+async def unfollow_user(payload: FollowPayload, background_tasks: BackgroundTasks, user=Depends(auth_guard)):
 
     follower_id=user["user_id"]
     following_id = payload.following_id
@@ -78,13 +66,8 @@ def unfollow_user(payload: FollowPayload,user=Depends(auth_guard)):
     
    
     try:
-        result = (
-            supabase.table("userfollowing")
-            .delete()
-            .eq("follower_id", follower_id)
-            .eq("following_id", following_id)
-            .execute()
-        )
+        if await FollowingRepository.unfollow_user(follower_id, following_id):
+            background_tasks.add_task(timeline_service.unfollow, follower_id, following_id)
 
         return {
             "status": "success",
@@ -105,14 +88,14 @@ class PagingPayload(BaseModel):
     
 
 @router.post("/followers", status_code=status.HTTP_200_OK)
-def get_followers(payload: PagingPayload, user=Depends(auth_guard)):
+async def get_followers(payload: PagingPayload, user=Depends(auth_guard)):
 
     user_id = user["user_id"]
   
 
     # Step 1) Get only follower_id
     res = (
-        supabase.table("userfollowing")
+        await supabase.table("userfollowing")
         .select("follower_id")
         .eq("following_id", user_id)
         .range(payload.skip, payload.skip + payload.limit - 1)
@@ -130,17 +113,12 @@ def get_followers(payload: PagingPayload, user=Depends(auth_guard)):
           
         }
 
-    # Step 2) Fetch full user data
-    user_res = (
-        supabase.table("users")
-        .select("user_id, user_name, full_name,profile_img_url")
-        .in_("user_id", follower_ids)
-        .execute()
-    )
+    # Step 2) Fetch full user data ( card cache )
+    cards = await user_cards.get_cards(follower_ids)
 
     return {
         "status": "success",
-        "followers": user_res.data,
+        "followers": [cards[uid] for uid in follower_ids if cards[uid]],
         "skip": payload.skip,
         "limit": payload.limit
        
@@ -151,14 +129,14 @@ def get_followers(payload: PagingPayload, user=Depends(auth_guard)):
 
 
 @router.post("/following", status_code=status.HTTP_200_OK)
-def get_following(payload: PagingPayload, user=Depends(auth_guard)):
+async def get_following(payload: PagingPayload, user=Depends(auth_guard)):
     
     user_id = user["user_id"]
     
 
     # Step 1) Get only following_id
     res = (
-        supabase.table("userfollowing")
+        await supabase.table("userfollowing")
         .select("following_id")
         .eq("follower_id", user_id)
         .range(payload.skip, payload.skip + payload.limit - 1)
@@ -175,17 +153,12 @@ def get_following(payload: PagingPayload, user=Depends(auth_guard)):
             "limit": payload.limit
         }
 
-    # Step 2) Fetch profile info
-    user_res = (
-        supabase.table("users")
-        .select("user_id, user_name, full_name, profile_img_url")
-        .in_("user_id", following_ids)
-        .execute()
-    )
+    # Step 2) Fetch profile info ( card cache )
+    cards = await user_cards.get_cards(following_ids)
 
     return {
         "status": "success",
-        "following": user_res.data,
+        "following": [cards[uid] for uid in following_ids if cards[uid]],
         "skip": payload.skip,
         "limit": payload.limit
     }
@@ -3,14 +3,13 @@ from pydantic import BaseModel
 from datetime import datetime, timedelta, timezone
 import random
 
-from argon2 import PasswordHasher
 
 from ..config.supabase_config import supabase
 from ..utils.email_sender import send_otp_email
+from ..utils.password_hashing import hash_password
 
 
 router = APIRouter()
-ph = PasswordHasher()
 
 
 
@@ -27,7 +26,7 @@ async def forgot_password_request(payload: ForgotPasswordRequest):
 
 
     res = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("user_id, user_name, user_email")
         .or_(
             f"user_email.ilike.{identifier},"
@@ -52,7 +51,7 @@ async def forgot_password_request(payload: ForgotPasswordRequest):
     otp = str(random.randint(100000, 999999))
     otp_expiry = datetime.now(timezone.utc) + timedelta(minutes=10)
 
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "otp": otp,
         "otp_expiry": otp_expiry.isoformat(),
         "modified_at": datetime.now(timezone.utc).isoformat()
@@ -87,7 +86,7 @@ async def forgot_password_verify(payload: ForgotPasswordVerify):
     identifier = payload.identifier.strip()
 
     res = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("user_id, otp, otp_expiry")
         .or_(
             f"user_email.ilike.{identifier},"
@@ -119,9 +118,9 @@ async def forgot_password_verify(payload: ForgotPasswordVerify):
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
     # Hash new password
-    hashed_password = ph.hash(payload.new_password)
+    hashed_password = await hash_password(payload.new_password)
 
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "password": hashed_password,
         "otp": None,
         "otp_expiry": None,
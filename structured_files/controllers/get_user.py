@@ -47,72 +47,48 @@ async def get_user_data(
     current_user_id = user["user_id"]
     
     # -------------------------
-    # 1) Get user profile
+    # 1) Profile + counts + post page in ONE call
+    #    ( see sql/008_user_profile_page.sql )
     # -------------------------
     try:
-        user_res = (
-            supabase.table("users")
-            .select("*")
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        )
+        res = await supabase.rpc(
+            "get_user_profile_page",
+            {"p_user_id": user_id, "p_limit": limit, "p_skip": skip}
+        ).execute()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching user: {e}")
 
-    if not user_res.data:
-        raise HTTPException(status_code=404, detail="User not found")
+    page = res.data or {}
+    user_data = page.get("user")
 
-    user_data = user_res.data
+    if not user_data:
+        raise HTTPException(status_code=404, detail="User not found")
 
     # -------------------------
-    # 2) Get posts with pagination
+    # 2) Build post items
     # -------------------------
-    try:
-        posts_res = (
-            supabase.table("posts")
-            .select("*, post_images(*)")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .range(skip, skip + limit - 1)
-            .execute()
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching posts: {e}")
-
     posts_list = []
 
-    for post in posts_res.data or []:
+    for post in page.get("posts") or []:
         # Sort post images by order_number
-        images = post.get("post_images") or []
-        images.sort(key=lambda x: x.get("order_number", 0))
+        images = post.get("images") or []
+        images.sort(key=lambda x: x.get("order_number") or 0)
         post_images = [PostImage(**img) for img in images]
 
-        # Likes count
-        like_res = supabase.table("likes").select("*", count="exact").eq("post_id", post["post_id"]).execute()
-        likes_count = like_res.count
-
-        # Comments count
-        comment_res = supabase.table("comments").select("*", count="exact").eq("post_id", post["post_id"]).execute()
-        comments_count = comment_res.count
-
         posts_list.append(PostItem(
             post_id=post["post_id"],
             caption=post.get("caption"),
             created_at=post.get("created_at"),
             images=post_images,
-            likes_count=likes_count,
-            comments_count=comments_count
+            likes_count=post.get("likes_count") or 0,
+            comments_count=post.get("comments_count") or 0
         ))
 
     # -------------------------
-    # 3) Get followers and following counts
+    # 3) Followers and following counts ( already in the page )
     # -------------------------
-    followers_res = supabase.table("userfollowing").select("*", count="exact").eq("following_id", user_id).execute()
-    following_res = supabase.table("userfollowing").select("*", count="exact").eq("follower_id", user_id).execute()
-
-    followers_count = followers_res.count or 0
-    following_count = following_res.count or 0
+    followers_count = page.get("followers") or 0
+    following_count = page.get("following") or 0
 
     # -------------------------
     # 4) Return response
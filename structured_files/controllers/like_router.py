@@ -4,6 +4,7 @@ from uuid import uuid4
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
 from ..dtos.like_follow import LikeRequest, PostLikePayload
+from ..services import trending_engine, post_hydration, like_buffer
 
 router = APIRouter()
 
@@ -18,29 +19,45 @@ class PostLikePayload(BaseModel):
 
 #like the post --------------------------
 @router.post("/like", status_code=status.HTTP_201_CREATED)
-def like_post(payload: LikeRequest, user=Depends(auth_guard)):
+async def like_post(payload: LikeRequest, user=Depends(auth_guard)):
     try:
         user_id = user["user_id"]
        
 
-        existing = (
-            supabase.table("likes")
-            .select("like_id")
-            .eq("user_id", user_id)
-            .eq("post_id", payload.post_id)
+        # write-behind: buffered, written in bulk by the flush loop
+        if like_buffer.enabled():
+            like_id = await like_buffer.buffer.like(user_id, payload.post_id)
+            if like_id is None:
+                raise HTTPException(status_code=400, detail="Post already liked")
+            trending_engine.record_like(payload.post_id, user_id)
+
+            return {
+                "status": "success",
+                "status_code": status.HTTP_201_CREATED,
+                "message": "Post liked successfully",
+                "post_id": payload.post_id,
+                "like_id": like_id
+            }
+
+        like_id = str(uuid4())
+
+        # one round trip: insert unless ( user_id, post_id ) already exists
+        # ( unique key from sql/010_write_path_unique_keys.sql )
+        inserted = (
+            await supabase.table("likes")
+            .upsert({
+                "like_id": like_id,
+                "post_id": payload.post_id,
+                "user_id": user_id,
+            }, on_conflict="user_id,post_id", ignore_duplicates=True)
             .execute()
         )
 
-        if existing.data:
+        if not inserted.data:
             raise HTTPException(status_code=400, detail="Post already liked")
 
-        like_id = str(uuid4())
-
-        supabase.table("likes").insert({
-            "like_id": like_id,
-            "post_id": payload.post_id,
-            "user_id": user_id,
-        }).execute()
+        trending_engine.record_like(payload.post_id, user_id)
+        post_hydration.invalidate(payload.post_id)
 
         return {
             "status": "success",
@@ -55,12 +72,25 @@ def like_post(payload: LikeRequest, user=Depends(auth_guard)):
     
 #unlike the post-------------------
 @router.post("/unlike", status_code=status.HTTP_200_OK)
-def unlike_post(payload: LikeRequest, user=Depends(auth_guard)):
+async def unlike_post(payload: LikeRequest, user=Depends(auth_guard)):
     try:        
         user_id = user["user_id"]
       
+        # write-behind: buffered, written in bulk by the flush loop
+        if like_buffer.enabled():
+            if not await like_buffer.buffer.unlike(user_id, payload.post_id):
+                raise HTTPException(status_code=404, detail="Like not found")
+            trending_engine.record_unlike(payload.post_id, user_id)
+
+            return {
+                "status": "success",
+                "status_code": status.HTTP_200_OK,
+                "message": "Post unliked successfully",
+                "post_id": payload.post_id
+            }
+
         res = (
-            supabase.table("likes")
+            await supabase.table("likes")
             .delete()
             .eq("user_id", user_id)
             .eq("post_id", payload.post_id)
@@ -69,6 +99,8 @@ def unlike_post(payload: LikeRequest, user=Depends(auth_guard)):
 
         if not res.data:
             raise HTTPException(status_code=404, detail="Like not found")
+        trending_engine.record_unlike(payload.post_id, user_id)
+        post_hydration.invalidate(payload.post_id)
 
         return {
             "status": "success",
@@ -100,7 +132,7 @@ async def get_users_who_liked_post(data: LikeListPayload, user=Depends(auth_guar
         
 
         liked_users = (
-            supabase.table("likes")
+            await supabase.table("likes")
             .select("user_id")
             .eq("post_id", data.post_id)
             .range(data.skip, data.skip + data.limit - 1)
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel, EmailStr
-from argon2 import PasswordHasher, exceptions
+from argon2 import exceptions
 from datetime import datetime, timedelta, timezone
 import jwt
 
 from ..config.supabase_config import supabase
 from ..utils.rsa_keys import PRIVATE_KEY, ALGORITHM
 from ..utils.jwt_utils import create_auth_token ,create_refresh_token
+from ..utils.password_hashing import verify_password, needs_rehash
+from ..services.auth_service import upgrade_password_hash
 router = APIRouter()
-ph = PasswordHasher()
 
 
 # -----------------------------------------
@@ -23,11 +24,11 @@ class LoginPayload(BaseModel):
 # ✅ LOGIN ENDPOINT — with complete & correct error handling
 # ----------------------------------------------------------------
 @router.post("/login")
-async def login(payload: LoginPayload):
+async def login(payload: LoginPayload, background_tasks: BackgroundTasks):
     try:
         # 1️⃣ Fetch user by email
         resp = (
-            supabase.table("users")
+            await supabase.table("users")
             .select("user_id,user_email,password,verified,last_sign_in")
             .eq("user_email",payload.user_email)
             .execute()
@@ -43,11 +44,13 @@ async def login(payload: LoginPayload):
         hashed_pass = user["password"]
         verified = user["verified"]
 
-        # 2️⃣ Verify password
+        # 2️⃣ Verify password ( hashing pool, 503 when saturated )
         try:
-            ph.verify(hashed_pass, payload.password)
+            await verify_password(hashed_pass, payload.password)
         except exceptions.VerifyMismatchError:
             raise HTTPException(status_code=400, detail="Invalid email or password")
+        except HTTPException:
+            raise
         except Exception:
             raise HTTPException(status_code=500, detail="Password check failed")
 
@@ -55,9 +58,14 @@ async def login(payload: LoginPayload):
         if not verified:
             raise HTTPException(status_code=403, detail="Email not verified")
 
+        # 3️⃣.1 Hash made with older argon2 parameters → upgrade it
+        #      after the response ( see utils/password_hashing.py )
+        if needs_rehash(hashed_pass):
+            background_tasks.add_task(upgrade_password_hash, user_id, hashed_pass, payload.password)
+
         # 4️⃣ Update last_sign_in
         try:
-            supabase.table("users").update({
+            await supabase.table("users").update({
                 "last_sign_in": datetime.now(timezone.utc).isoformat()
             }).eq("user_id", user_id).execute()
         except:
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, UploadFile, File, Form, status
 from typing import List, Optional
 from datetime import datetime
 import uuid
 from pydantic import BaseModel
 from ..middleware.jwt_auth import auth_guard
 from ..config.supabase_config import supabase
+from ..services import timeline_service, trending_engine
+from ..services.category_registry import registry as categories
+from ..services.post_hydration import hydrate_posts
+from ..services import post_hydration
 
 router = APIRouter()
 STORAGE_BUCKET = "users"
@@ -15,6 +19,7 @@ STORAGE_BUCKET = "users"
 # ============================
 @router.post("/create", status_code=status.HTTP_201_CREATED)
 async def create_post(
+    background_tasks: BackgroundTasks,
     post_title: str = Form(...),
     content: str = Form(...),
     cat_title: str = Form(...),   # 👈 category title
@@ -29,23 +34,18 @@ async def create_post(
         timestamp = datetime.utcnow().isoformat()
 
         # 1️⃣ Category lookup
-        cat_res = (
-            supabase.table("categories")
-            .select("cat_id, cat_title")
-            .ilike("cat_title", cat_title)
-            .execute()
-        )
+        cat = await categories.resolve(cat_title)
 
-        if not cat_res.data:
+        if not cat:
             return {
                 "status": "failed",
                 "message": f"Category '{cat_title}' not found"
             }
 
-        cat_id = cat_res.data[0]["cat_id"]
+        cat_id = cat["cat_id"]
 
         # 2️⃣ Insert post record
-        supabase.table("posts").insert({
+        await supabase.table("posts").insert({
             "post_id": post_id,
             "post_title": post_title,
             "post_content": content,
@@ -56,6 +56,7 @@ async def create_post(
             "created_by": user_id,
             "modified_by": user_id
         }).execute()
+        trending_engine.record_post(post_id, cat_id, timestamp)
 
         # 3️⃣ Image uploads
         image_urls = []
@@ -70,16 +71,16 @@ async def create_post(
 
                 file_bytes = await img.read()
 
-                supabase.storage.from_(STORAGE_BUCKET).upload(
+                await supabase.storage.from_(STORAGE_BUCKET).upload(
                     file_path,
                     file_bytes,
                     {"content-type": img.content_type}
                 )
 
-                public_url = supabase.storage.from_(STORAGE_BUCKET).get_public_url(file_path)
+                public_url = await supabase.storage.from_(STORAGE_BUCKET).get_public_url(file_path)
                 image_urls.append(public_url)
 
-                supabase.table("post_images").insert({
+                await supabase.table("post_images").insert({
                     "image_id": image_id,
                     "post_id": post_id,
                     "image_url": public_url,
@@ -88,6 +89,10 @@ async def create_post(
 
                 position_index += 1
 
+        # 4️⃣ Push into followers' timelines after the response is sent
+        if timeline_service.enabled():
+            background_tasks.add_task(timeline_service.fan_out_post, post_id, user_id, timestamp)
+
         return {
             "status": "success",
             "status_code": status.HTTP_201_CREATED,
@@ -125,7 +130,7 @@ async def update_post(
         new_refresh = user["new_refresh"]
         post_id = payload.post_id
 
-        post = supabase.table("posts") \
+        post = await supabase.table("posts") \
             .select("post_id") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -134,12 +139,13 @@ async def update_post(
         if not post.data:
             raise HTTPException(status_code=404, detail="Post not found or unauthorized")
 
-        supabase.table("posts").update({
+        await supabase.table("posts").update({
             "post_title": payload.post_title,
             "post_content": payload.content,
             "modified_at": datetime.utcnow().isoformat(),
             "modified_by": user_id
         }).eq("post_id", post_id).execute()
+        post_hydration.invalidate(post_id)
 
         return {
             "status": "success",
@@ -166,7 +172,7 @@ async def delete_post(payload: DeletePostPayload, user=Depends(auth_guard)):
         post_id = payload.post_id
         user_id = user["user_id"]
 
-        post = supabase.table("posts") \
+        post = await supabase.table("posts") \
             .select("*") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -175,7 +181,7 @@ async def delete_post(payload: DeletePostPayload, user=Depends(auth_guard)):
         if not post.data:
             raise HTTPException(status_code=404, detail="Post not found or unauthorized")
 
-        img_rows = supabase.table("post_images").select("*").eq("post_id", post_id).execute()
+        img_rows = await supabase.table("post_images").select("*").eq("post_id", post_id).execute()
 
         delete_filepaths = []
 
@@ -188,12 +194,15 @@ async def delete_post(payload: DeletePostPayload, user=Depends(auth_guard)):
             delete_filepaths.append(file_path)
 
         if delete_filepaths:
-            supabase.storage.from_(STORAGE_BUCKET).remove(delete_filepaths)
+            await supabase.storage.from_(STORAGE_BUCKET).remove(delete_filepaths)
 
-        supabase.table("post_images").delete().eq("post_id", post_id).execute()
-        supabase.table("comments").delete().eq("post_id", post_id).execute()
-        supabase.table("likes").delete().eq("post_id", post_id).execute()
-        supabase.table("posts").delete().eq("post_id", post_id).execute()
+        await supabase.table("post_images").delete().eq("post_id", post_id).execute()
+        await supabase.table("comments").delete().eq("post_id", post_id).execute()
+        await supabase.table("likes").delete().eq("post_id", post_id).execute()
+        await supabase.table("posts").delete().eq("post_id", post_id).execute()
+        post_hydration.invalidate(post_id)
+        await timeline_service.remove_post(post_id)
+        trending_engine.remove_post(post_id)
 
         return {
             "status": "success",
@@ -219,97 +228,16 @@ async def get_single_post(payload: GetPostRequest, user=Depends(auth_guard)):
 
         post_id = payload.post_id
 
-        # 1️⃣ Fetch post 
-        post = supabase.table("posts") \
-            .select("*") \
-            .eq("post_id", post_id) \
-            .execute()
+        # 1️⃣ Post + owner + category + images + counters ( hydration cache )
+        #    + whether this user liked it
+        hydrated = await hydrate_posts([post_id], viewer_id=user_id)
 
-        if not post.data:
+        if not hydrated:
             raise HTTPException(status_code=404, detail="Post not found")
 
-        post_data = post.data[0]
-        post_owner_id = post_data["user_id"]
-
-        # ⭐ 1.1 Fetch user info of the post owner
-        user_row = supabase.table("users") \
-            .select("user_name, full_name, profile_img_url") \
-            .eq("user_id", post_owner_id) \
-            .execute()
-
-        user_info = user_row.data[0] if user_row.data else {
-            "user_name": None,
-            "full_name": None,
-            "profile_img_url": None
-        }
-
-        # 2️⃣ resolve category title
-        category = None
-        if "category" in post_data and post_data["category"]:
-            cat_row = supabase.table("categories") \
-                .select("cat_title") \
-                .eq("cat_id", post_data["category"]) \
-                .execute()
-
-            if cat_row.data:
-                category = cat_row.data[0]["cat_title"]
-
-        # 3️⃣ Fetch post_images with position
-        img_rows = supabase.table("post_images") \
-            .select("image_url, position") \
-            .eq("post_id", post_id) \
-            .order("position", desc=False) \
-            .execute()
-
-        images = []
-        if img_rows.data:
-            for img in img_rows.data:
-                images.append({
-                    "image_url": img["image_url"],
-                    "position": img["position"]
-                })
-
-        # 4️⃣ Count likes
-        likes = supabase.table("likes") \
-            .select("like_id") \
-            .eq("post_id", post_id) \
-            .execute()
-
-        likes_count = len(likes.data)
-
-        # 5️⃣ Count comments + support/deny percentages
-        comments = supabase.table("comments") \
-            .select("comment_id, comment_for") \
-            .eq("post_id", post_id) \
-            .execute()
-
-        total_comments = len(comments.data)
-
-        support_count = 0
-        deny_count = 0
-        
-        for c in comments.data:
-            if c["comment_for"] == "support":
-                support_count += 1
-            elif c["comment_for"] == "deny":
-                deny_count += 1
-
-        # Percentages
-        if total_comments > 0:
-            support_percentage = round((support_count / total_comments) * 100, 2)
-            deny_percentage = round((deny_count / total_comments) * 100, 2)
-        else:
-            support_percentage = 0
-            deny_percentage = 0
-
-        # 6️⃣ Check if user liked
-        user_like = supabase.table("likes") \
-            .select("like_id") \
-            .eq("post_id", post_id) \
-            .eq("user_id", user_id) \
-            .execute()
-
-        is_liked_by_user = True if user_like.data else False
+        post_data = hydrated[0]
+        user_info = post_data["author"]
+        stats = post_data["stats"]
 
         return {
             "status": "success",
@@ -324,27 +252,30 @@ async def get_single_post(payload: GetPostRequest, user=Depends(auth_guard)):
             },
             "post": {
                 "post_id": post_data["post_id"],
-                "user_id": post_owner_id,
+                "user_id": post_data["user_id"],
                 "post_title": post_data["post_title"],
                 "post_content": post_data["post_content"],
-                "category_id": post_data["category"],
-                "category": category,
+                "category_id": post_data["category_id"],
+                "category": post_data["category"],
                 "created_at": post_data["created_at"],
                 "modified_at": post_data["modified_at"],
 
                
             },
-            "images": images,
+            "images": [
+                {"image_url": img["image_url"], "position": img["position"]}
+                for img in post_data["images"]
+            ],
             "counts": {
-                "likes": likes_count,
-                "comments": total_comments,
-                "support_count": support_count,
-                "deny_count": deny_count,
-                "support_percentage": support_percentage,
-                "deny_percentage": deny_percentage
+                "likes": stats["likes_count"],
+                "comments": stats["comments_count"],
+                "support_count": stats["support_count"],
+                "deny_count": stats["deny_count"],
+                "support_percentage": post_data["support_percent"],
+                "deny_percentage": post_data["deny_percent"]
             },
             "user_actions": {
-                "liked_by_user": is_liked_by_user
+                "liked_by_user": post_data["liked_by_current_user"]
             }
         }
 
@@ -2,13 +2,17 @@ from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form,st
 from pydantic import BaseModel
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..repositories.post_stats_repository import PostStatsRepository
 import uuid
 
 router =APIRouter()
 
+FOREIGN_KEY_VIOLATION = "23503"   # postgres error code
+
 class PostReportModel(BaseModel):
     post_id: str
     report_post_report_id: str
+    report_reason: str
 
 
 @router.post("/report", status_code=status.HTTP_201_CREATED)
@@ -23,32 +27,25 @@ async def report_post(
         post_id = payload.post_id
         report_reason = payload.report_reason
 
-        # Check if post exists
-        post = supabase.table("posts").select("*").eq("post_id", post_id).execute()
-        if not post.data:
-            raise HTTPException(status_code=404, detail="Post not found")
-
-        # Check if user already reported this post
-        existing = supabase.table("post_reports") \
-            .select("*") \
-            .eq("post_id", post_id) \
-            .eq("user_id", user_id) \
-            .execute()
-
-        if existing.data:
-            raise HTTPException(status_code=400, detail="You already reported this post")
-
         post_post_report_id = str(uuid.uuid4())
 
-        # Insert the new report
-        supabase.table("post_reports").insert({
-            "post_post_report_id": post_post_report_id,
-            "post_id": post_id,
-            "user_id": user_id,
-            "report_reason": report_reason,
-            
-            
-        }).execute()
+        # One round trip: insert unless ( post_id, user_id ) already exists
+        # ( unique key from sql/010_write_path_unique_keys.sql ); a missing
+        # post fails the post_id foreign key
+        try:
+            inserted = await supabase.table("post_reports").upsert({
+                "post_post_report_id": post_post_report_id,
+                "post_id": post_id,
+                "user_id": user_id,
+                "report_reason": report_reason,
+            }, on_conflict="post_id,user_id", ignore_duplicates=True).execute()
+        except Exception as e:
+            if getattr(e, "code", None) == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(status_code=404, detail="Post not found")
+            raise
+
+        if not inserted.data:
+            raise HTTPException(status_code=400, detail="You already reported this post")
 
         return {
             "status": "success",
@@ -74,27 +71,24 @@ async def get_single_post_report(data: SinglePostReportRequest, user=Depends(aut
         post_id = data.post_id
 
         # 1️⃣ validate post exists
-        post = supabase.table("posts").select("*").eq("post_id", post_id).execute()
+        post = await supabase.table("posts").select("*").eq("post_id", post_id).execute()
         if not post.data:
             raise HTTPException(status_code=404, detail="Post not found")
 
         # 2️⃣ get post images with position
-        images = supabase.table("post_images") \
+        images = await supabase.table("post_images") \
             .select("image_url, position") \
             .eq("post_id", post_id) \
             .order("position", desc=False) \
             .execute()
 
-        # 3️⃣ like count
-        likes = supabase.table("likes").select("like_id").eq("post_id", post_id).execute()
-        like_count = len(likes.data)
-
-        # 4️⃣ comment count
-        comments = supabase.table("comments").select("comment_id").eq("post_id", post_id).execute()
-        comment_count = len(comments.data)
+        # 3️⃣ + 4️⃣ like / comment count ( post_stats counters )
+        stats = (await PostStatsRepository.get_stats([post_id]))[post_id]
+        like_count = stats["likes_count"]
+        comment_count = stats["comments_count"]
 
         # 5️⃣ get all reports for this post
-        reports = supabase.table("post_reports") \
+        reports = await supabase.table("post_reports") \
             .select("post_report_id, user_id, report_reason, status, created_at") \
             .eq("post_id", post_id) \
             .order("created_at", desc=True) \
@@ -103,7 +97,7 @@ async def get_single_post_report(data: SinglePostReportRequest, user=Depends(aut
         report_count = len(reports.data)
 
         # 6️⃣ whether current user has reported
-        user_report = supabase.table("post_reports") \
+        user_report = await supabase.table("post_reports") \
             .select("post_report_id") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -145,7 +139,7 @@ async def get_reported_posts(data: ReportedPostsRequest, user=Depends(auth_guard
         limit = data.limit
 
         # get reports with post info
-        reports = supabase.table("post_reports") \
+        reports = await supabase.table("post_reports") \
             .select("post_report_id, post_id, user_id, report_reason, status, created_at") \
             .order("created_at", desc=True) \
             .range(skip, skip + limit - 1) \
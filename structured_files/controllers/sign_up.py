@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, EmailStr
-from argon2 import PasswordHasher
 from datetime import datetime, timedelta
 import uuid, random
 
@@ -9,9 +8,9 @@ from ..utils.email_sender import send_otp_email
 from ..utils.refer_id_gen import generate_referral_id
 from ..utils.otp_gen import generate_otp
 from ..utils.username_gen import  generate_unique_username
+from ..utils.password_hashing import hash_password
 
 router = APIRouter()
-ph = PasswordHasher()
 
 
 
@@ -38,16 +37,16 @@ class SignUpRequest(BaseModel):
 async def sign_up(user: SignUpRequest):
 
     # 1️⃣ Check email
-    if supabase.table("users").select("user_id").eq("user_email", user.user_email).execute().data:
+    if (await supabase.table("users").select("user_id").eq("user_email", user.user_email).execute()).data:
         raise HTTPException(400, "Email already exists")
 
     # 2️⃣ Generate username automatically
-    user_name = generate_unique_username()
+    user_name = await generate_unique_username()
 
     # 3️⃣ Generate values
     user_id = str(uuid.uuid4())
-    hashed_password = ph.hash(user.password)
-    refer_id = generate_referral_id()
+    hashed_password = await hash_password(user.password)
+    refer_id = await generate_referral_id()
     otp = generate_otp()
     otp_expiry = datetime.utcnow() + timedelta(minutes=10)
 
@@ -67,7 +66,7 @@ async def sign_up(user: SignUpRequest):
         "modified_by": user_id
     }
 
-    response = supabase.table("users").insert(user_data).execute()
+    response = await supabase.table("users").insert(user_data).execute()
     if not response.data:
         raise HTTPException(500, "User creation failed")
 
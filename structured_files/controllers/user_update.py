@@ -5,12 +5,13 @@ import uuid
 
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..services import user_cards
 
 STORAGE_BUCKET = "users"
 router = APIRouter()
 
 
-def upload_profile_image(user_id: str, file: UploadFile):
+async def upload_profile_image(user_id: str, file: UploadFile):
     ext = file.filename.split(".")[-1] if file.filename else "jpg"
     filename = f"profile_{uuid.uuid4()}.{ext}"
     storage_path = f"{user_id}/profile_img/{filename}"
@@ -18,7 +19,7 @@ def upload_profile_image(user_id: str, file: UploadFile):
     file.file.seek(0)
     file_bytes = file.file.read()
 
-    response = supabase.storage.from_(STORAGE_BUCKET).upload(
+    response = await supabase.storage.from_(STORAGE_BUCKET).upload(
         path=storage_path,
         file=file_bytes
     )
@@ -26,13 +27,13 @@ def upload_profile_image(user_id: str, file: UploadFile):
     if hasattr(response, "error") and response.error:
         raise Exception(response.error)
 
-    public_url = supabase.storage.from_(STORAGE_BUCKET).get_public_url(storage_path)
+    public_url = await supabase.storage.from_(STORAGE_BUCKET).get_public_url(storage_path)
     return public_url, storage_path
 
 
-def delete_file(path: str):
+async def delete_file(path: str):
     try:
-        result = supabase.storage.from_(STORAGE_BUCKET).remove([path])
+        result = await supabase.storage.from_(STORAGE_BUCKET).remove([path])
         return isinstance(result, list) and len(result) > 0
     except Exception:
         return False
@@ -52,7 +53,7 @@ async def update_profile(
 
     # Fetch existing user
     
-    result = supabase.table("users").select(
+    result = await supabase.table("users").select(
         "user_name, full_name, bio, profile_img_url"
     ).eq("user_id", user_id).limit(1).execute()
 
@@ -65,7 +66,7 @@ async def update_profile(
         # ✅ Check if username already exists (excluding current user)
     if user_name:
         existing_username = (
-            supabase.table("users")
+            await supabase.table("users")
             .select("user_id")
             .ilike("user_name", user_name)
             .execute()
@@ -90,19 +91,20 @@ async def update_profile(
         update_data["bio"] = bio
 
     if profile_pic:
-        new_url, new_path = upload_profile_image(user_id, profile_pic)
+        new_url, new_path = await upload_profile_image(user_id, profile_pic)
 
         old_url = existing.get("profile_img_url")
         if old_url and STORAGE_BUCKET in old_url:
             old_path = old_url.split(f"/{STORAGE_BUCKET}/")[-1]
-            delete_file(old_path)
+            await delete_file(old_path)
 
         update_data["profile_img_url"] = new_url
 
 
     update_data["modified_at"] = datetime.now(timezone.utc).isoformat()
     update_data["modified_by"] = user_id    
-    supabase.table("users").update(update_data).eq("user_id", user_id).execute()
+    await supabase.table("users").update(update_data).eq("user_id", user_id).execute()
+    user_cards.invalidate(user_id)
 
     return {
         "status": 200,
@@ -3,6 +3,8 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
 from ..config.supabase_config import supabase
 from ..middleware.jwt_auth import auth_guard
+from ..services.post_hydration import hydrate_posts
+from ..services import user_cards
 
 
 
@@ -35,7 +37,7 @@ async def search_users(
         }
 
         # 1. Call SQL function
-        response = supabase.rpc("search_users", params).execute()
+        response = await supabase.rpc("search_users", params).execute()
         rows = response.data
 
         if not rows:
@@ -74,21 +76,12 @@ async def search_users(
         # ------------------------------------------------------------
         user_ids = [u["user_id"] for u in merged_users]
 
-        details_response = (
-            supabase
-            .from_("users")
-            .select("user_id, user_name, full_name, profile_img_url")
-            .in_("user_id", user_ids)
-            .execute()
-        )
-        details = details_response.data
-
-        details_map = {d["user_id"]: d for d in details}
+        details_map = await user_cards.get_cards(user_ids)
 
         # Merge final data
         final_users = []
         for u in merged_users:
-            info = details_map.get(u["user_id"], {})
+            info = details_map.get(u["user_id"]) or {}
             final_users.append({
                 "user_id": u["user_id"],
                 "user_name": info.get("user_name"),
@@ -142,7 +135,7 @@ async def search_posts(payload: PostSearchPayload, user=Depends(auth_guard)):
         }
 
         # 1. Call SQL function
-        response = supabase.rpc("search_posts", params).execute()
+        response = await supabase.rpc("search_posts", params).execute()
         rows = response.data
 
         if not rows:
@@ -165,39 +158,9 @@ async def search_posts(payload: PostSearchPayload, user=Depends(auth_guard)):
 
         merged_posts = list(merged.values())
 
-        # 3. Fetch full post details
+        # 3. + 4. Post details + images ( hydration cache )
         post_ids = [p["post_id"] for p in merged_posts]
-        posts_query = (
-            supabase
-            .from_("posts")
-            .select("post_id, post_title, post_content")
-            .in_("post_id", post_ids)
-            .execute()
-        )
-        posts_details = posts_query.data
-        posts_map = {p["post_id"]: p for p in posts_details}
-
-        # 4. Fetch images for posts
-        images_query = (
-            supabase
-            .from_("post_images")
-            .select("post_id, image_url, position")
-            .in_("post_id", post_ids)
-            .order("position", desc=False)  # ascending
-            .execute()
-        )
-        images = images_query.data
-
-        # Map post_id -> list of images
-        images_map = {}
-        for img in images:
-            pid = img["post_id"]
-            if pid not in images_map:
-                images_map[pid] = []
-            images_map[pid].append({
-                "url": img["image_url"],
-                "position": img["position"]
-            })
+        posts_map = {p["post_id"]: p for p in await hydrate_posts(post_ids)}
 
         # 5. Build final post objects
         final_posts = []
@@ -208,7 +171,10 @@ async def search_posts(payload: PostSearchPayload, user=Depends(auth_guard)):
                 "post_id": pid,
                 "post_title": info.get("post_title"),
                 "post_content": info.get("post_content"),
-                "images": images_map.get(pid, []),
+                "images": [
+                    {"url": img["image_url"], "position": img["position"]}
+                    for img in info.get("images", [])
+                ],
                 "rank": post["rank"],
                 "similarity": post["similarity"],
                 "score": post["similarity"] or post["rank"]
@@ -1,8 +1,15 @@
 from fastapi import Header, HTTPException
 from ..utils.jwt_utils import verify_auth_token
+from ..utils import auth_token_cache
 
 async def auth_guard(auth_token: str = Header(..., convert_underscores=False)):
-    payload = verify_auth_token(auth_token)
+    # same token on every request for a week → skip RS256 on repeats
+    payload = auth_token_cache.get(auth_token)
+
+    if payload is None:
+        payload = verify_auth_token(auth_token)
+        if payload and payload.get("user_id"):
+            auth_token_cache.put(auth_token, payload)
 
     if not payload:
         raise HTTPException(status_code=401, detail="Auth expired")
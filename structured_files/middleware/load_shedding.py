@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+# ============================================================
+# ADAPTIVE LOAD SHEDDING ( ASGI middleware )
+# - expensive routes get their own concurrency budget, so a burst on
+#   /trending_post/feed can't starve /like or /comment in the same
+#   worker; other routes pass straight through
+# - over budget → wait in a FIFO queue for at most
+#   LOAD_SHED_QUEUE_TIMEOUT_MS; queue full or deadline passed →
+#   503 + Retry-After right away ( the client retries, the worker
+#   keeps answering what it already accepted )
+# - budgets adapt AIMD style to the latency the route observes:
+#     latency <= target → limit += 1 / limit   ( ~ +1 per window )
+#     latency >  target or 5xx → limit *= 0.7  ( once per window )
+#   so when supabase slows down fewer requests are let in and the
+#   limit grows back once it recovers
+#
+# LOAD_SHEDDING=1 turns it on ( off by default → pass-through )
+# routes: DEFAULT_ROUTES below, or LOAD_SHED_ROUTES ( JSON )
+#   {"/trending_post/feed": {"initial": 16, "min": 2, "max": 64, "target_ms": 400}}
+#   an invalid LOAD_SHED_ROUTES is logged and DEFAULT_ROUTES is used
+# ============================================================
+
+LOAD_SHEDDING = os.getenv("LOAD_SHEDDING", "0") == "1"
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("LOAD_SHED_QUEUE_TIMEOUT_MS", 500)) / 1000
+MAX_QUEUE_FACTOR = float(os.getenv("LOAD_SHED_MAX_QUEUE_FACTOR", 2))   # queue ≤ limit * factor
+RETRY_AFTER_SECONDS = 1
+
+INCREASE = 1.0
+DECREASE = 0.7
+
+ROUTE_KEYS = {"initial", "min", "max", "target_ms"}
+
+DEFAULT_ROUTES = {
+    "/trending_post/feed": {"initial": 16, "min": 2, "max": 64, "target_ms": 400},
+    "/get/category/feed": {"initial": 16, "min": 2, "max": 64, "target_ms": 400},
+    "/search/search/posts": {"initial": 8, "min": 1, "max": 32, "target_ms": 600},
+    "/auth/login": {"initial": 8, "min": 1, "max": 32, "target_ms": 500},
+}
+
+logger = logging.getLogger(__name__)
+
+
+class RouteLimiter:
+
+    def __init__(self, path: str, initial: float, min: float, max: float, target_ms: float):
+        self.path = path
+        self.limit = float(initial)
+        self.min_limit = max(1.0, float(min))   # never below one slot
+        self.max_limit = float(max)
+        self.target = target_ms / 1000
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+        self.accepted = 0
+        self.shed = 0
+        self.latency_ewma: Optional[float] = None
+
+    # ---------------- admission ----------------
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.accepted += 1
+            return True
+
+        if len(self._waiters) >= max(1, int(self.limit * MAX_QUEUE_FACTOR)):
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=QUEUE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as the deadline hit → use it
+                self.accepted += 1
+                return True
+            waiter.cancel()
+            self._remove(waiter)
+            self.shed += 1
+            return False
+        except BaseException:
+            # client went away while queued: give back a handed-over slot
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            raise
+
+        self.accepted += 1
+        return True
+
+    def _remove(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        # hand free slots to the oldest waiters; in_flight moves with them
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    # ---------------- AIMD ----------------
+
+    def observe(self, latency: float, failed: bool):
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+        now = time.monotonic()
+        if failed or latency > self.target:
+            # one decrease per window, not one per request of the same burst
+            if now - self._last_decrease >= self.target:
+                self.limit = max(self.min_limit, self.limit * DECREASE)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + INCREASE / self.limit)
+            self._wake()
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "accepted": self.accepted,
+            "shed": self.shed,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None,
+            "target_ms": round(self.target * 1000),
+        }
+
+
+def _validate_route(path, config):
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise ValueError(f"{path!r}: route must be a path")
+    if not isinstance(config, dict) or set(config) != ROUTE_KEYS:
+        raise ValueError(f"{path}: expected exactly the keys {sorted(ROUTE_KEYS)}")
+    for key, value in config.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+            raise ValueError(f"{path}: {key} must be a positive number")
+    # a limit under 1 admits nothing, observe() never runs again to raise it
+    if config["min"] < 1:
+        raise ValueError(f"{path}: min must be at least 1")
+    if not config["min"] <= config["initial"] <= config["max"]:
+        raise ValueError(f"{path}: expected min <= initial <= max")
+
+
+def _route_config() -> Dict[str, dict]:
+    raw = os.getenv("LOAD_SHED_ROUTES")
+    if not raw:
+        return DEFAULT_ROUTES
+
+    # a typo in the env must not keep the app from starting
+    try:
+        routes = json.loads(raw)
+        if not isinstance(routes, dict):
+            raise ValueError("expected an object of path -> limits")
+        for path, config in routes.items():
+            _validate_route(path, config)
+    except ValueError as e:
+        logger.warning("LOAD_SHED_ROUTES_INVALID: %s, using the default routes", e)
+        return DEFAULT_ROUTES
+    return routes
+
+
+limiters: Dict[str, RouteLimiter] = {
+    path: RouteLimiter(path, **config) for path, config in _route_config().items()
+}
+
+
+def stats() -> dict:
+    return {path: limiter.stats() for path, limiter in limiters.items()}
+
+
+async def _send_503(send):
+    body = b'{"detail":"Server busy, please retry"}'
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(RETRY_AFTER_SECONDS).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class LoadSheddingMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        limiter = limiters.get(scope.get("path")) if scope["type"] == "http" and LOAD_SHEDDING else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            await _send_503(send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            limiter.observe(time.perf_counter() - started, failed=status >= 500)
+            limiter.release()
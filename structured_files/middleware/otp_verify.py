@@ -17,7 +17,7 @@ async def verify_otp(payload: OTPVerifyPayload):
 
     # 1️⃣ Fetch user INCLUDING otp fields
     user_resp = (
-        supabase.table("users")
+        await supabase.table("users")
         .select(
             "user_id, user_name, user_email, verified, otp, otp_expiry"
         )
@@ -48,7 +48,7 @@ async def verify_otp(payload: OTPVerifyPayload):
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
     # 5️⃣ Mark verified & clear OTP
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "verified": True,
         "otp": None,
         "otp_expiry": None,
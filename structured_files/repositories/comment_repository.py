@@ -31,7 +31,7 @@ class CommentsRepository:
             "modified_by": None
         }
 
-        return supabase.table("comments").insert(data).execute()
+        return await supabase.table("comments").insert(data).execute()
 
     # 2️⃣ Update a comment (only by owner)
     @staticmethod
@@ -40,7 +40,7 @@ class CommentsRepository:
         if new_comment_for not in ["support", "deny"]:
             raise ValueError("Invalid comment_for enum value")
 
-        return supabase.table("comments")\
+        return await supabase.table("comments")\
             .update({
                 "comment_text": new_text,
                 "comment_for": new_comment_for,
@@ -54,7 +54,7 @@ class CommentsRepository:
     # 3️⃣ Delete comment (only owner)
     @staticmethod
     async def delete_comment(comment_id: str, user_id: str):
-        return supabase.table("comments")\
+        return await supabase.table("comments")\
             .delete()\
             .eq("comment_id", comment_id)\
             .eq("user_id", user_id)\
@@ -63,7 +63,7 @@ class CommentsRepository:
     # 4️⃣ Get top-level comments for post (paginated)
     @staticmethod
     async def get_comments_for_post(post_id: str, skip=0, limit=20):
-        return supabase.table("comments")\
+        return await supabase.table("comments")\
             .select("*")\
             .eq("post_id", post_id)\
             .is_("parent_comment_id", None)\
@@ -74,7 +74,7 @@ class CommentsRepository:
     # 5️⃣ Get replies for a specific comment
     @staticmethod
     async def get_replies(comment_id: str, skip=0, limit=50):
-        return supabase.table("comments")\
+        return await supabase.table("comments")\
             .select("*")\
             .eq("parent_comment_id", comment_id)\
             .order("created_at", asc=True)\
@@ -84,7 +84,7 @@ class CommentsRepository:
     # 6️⃣ Count total comments for a post
     @staticmethod
     async def count_comments(post_id: str):
-        res = supabase.table("comments")\
+        res = await supabase.table("comments")\
             .select("comment_id", count="exact")\
             .eq("post_id", post_id)\
             .execute()
@@ -93,7 +93,7 @@ class CommentsRepository:
     # 7️⃣ Count replies for a comment
     @staticmethod
     async def count_replies(comment_id: str):
-        res = supabase.table("comments")\
+        res = await supabase.table("comments")\
             .select("comment_id", count="exact")\
             .eq("parent_comment_id", comment_id)\
             .execute()
@@ -102,7 +102,7 @@ class CommentsRepository:
     # 8️⃣ Check if user owns comment
     @staticmethod
     async def user_owns_comment(comment_id: str, user_id: str):
-        res = supabase.table("comments")\
+        res = await supabase.table("comments")\
             .select("comment_id")\
             .eq("comment_id", comment_id)\
             .eq("user_id", user_id)\
@@ -114,7 +114,7 @@ class CommentsRepository:
     @staticmethod
     async def get_comments_with_user(post_id: str, skip=0, limit=20):
 
-        return supabase.table("comments")\
+        return await supabase.table("comments")\
             .select("""
                 comment_id,
                 post_id,
@@ -136,7 +136,7 @@ class CommentsRepository:
     # 🔟 Get a single comment by ID
     @staticmethod
     async def get_comment_by_id(comment_id: str):
-        return supabase.table("comments")\
+        return await supabase.table("comments")\
             .select("*")\
             .eq("comment_id", comment_id)\
             .single()\
@@ -1,11 +1,13 @@
 import uuid
-from datetime import datetime
+from ..config.http_transport import execute_with_timeout
 from ..config.supabase_config import supabase
 
 
 class FollowingRepository:
 
     # 1️⃣ Follow a user
+    # ( follow row + both counters in one transaction, see
+    #   sql/009_user_follow_stats.sql )
     @staticmethod
     async def follow_user(follower_id: str, following_id: str):
 
@@ -13,38 +15,31 @@ class FollowingRepository:
         if follower_id == following_id:
             raise ValueError("User cannot follow themselves")
 
-        # Check if already following
-        existing = supabase.table("userfollowing")\
-            .select("follow_id")\
-            .eq("follower_id", follower_id)\
-            .eq("following_id", following_id)\
-            .execute()
+        follow_id = str(uuid.uuid4())
+        res = await supabase.rpc("follow_user_counted", {
+            "p_follow_id": follow_id,
+            "p_follower_id": follower_id,
+            "p_following_id": following_id
+        }).execute()
 
-        if existing.data:
+        if not res.data:
             return {"already_following": True}
 
-        data = {
-            "follow_id": str(uuid.uuid4()),
-            "follower_id": follower_id,
-            "following_id": following_id,
-            "created_at": datetime.utcnow().isoformat()
-        }
+        return {"already_following": False, "follow_id": follow_id}
 
-        return supabase.table("userfollowing").insert(data).execute()
-
-    # 2️⃣ Unfollow user
+    # 2️⃣ Unfollow user ( → number of follow rows removed )
     @staticmethod
     async def unfollow_user(follower_id: str, following_id: str):
-        return supabase.table("userfollowing")\
-            .delete()\
-            .eq("follower_id", follower_id)\
-            .eq("following_id", following_id)\
-            .execute()
+        res = await supabase.rpc("unfollow_user_counted", {
+            "p_follower_id": follower_id,
+            "p_following_id": following_id
+        }).execute()
+        return res.data or 0
 
     # 3️⃣ Check if user A follows user B
     @staticmethod
     async def is_following(follower_id: str, following_id: str):
-        res = supabase.table("userfollowing")\
+        res = await supabase.table("userfollowing")\
             .select("follow_id")\
             .eq("follower_id", follower_id)\
             .eq("following_id", following_id)\
@@ -55,7 +50,7 @@ class FollowingRepository:
     # 4️⃣ Get list of users that FOLLOW a specific user
     @staticmethod
     async def get_followers(user_id: str, skip=0, limit=20):
-        return supabase.table("userfollowing")\
+        return await supabase.table("userfollowing")\
             .select("""
                 follower_id,
                 users:follower_id(user_name, full_name, profile_img_url)
@@ -67,7 +62,7 @@ class FollowingRepository:
     # 5️⃣ Get list of users that user is following
     @staticmethod
     async def get_following(user_id: str, skip=0, limit=20):
-        return supabase.table("userfollowing")\
+        return await supabase.table("userfollowing")\
             .select("""
                 following_id,
                 users:following_id(user_name, full_name, profile_img_url)
@@ -76,23 +71,23 @@ class FollowingRepository:
             .range(skip, skip + limit - 1)\
             .execute()
 
-    # 6️⃣ Count followers for user
+    # 6️⃣ Count followers for user ( denormalized counter )
     @staticmethod
     async def count_followers(user_id: str):
-        res = supabase.table("userfollowing")\
-            .select("follow_id", count="exact")\
-            .eq("following_id", user_id)\
-            .execute()
-        return res.count if res else 0
+        res = await execute_with_timeout(supabase.table("user_follow_stats")\
+            .select("followers_count")\
+            .eq("user_id", user_id)\
+            .limit(1))
+        return res.data[0]["followers_count"] if res.data else 0
 
-    # 7️⃣ Count following for user
+    # 7️⃣ Count following for user ( denormalized counter )
     @staticmethod
     async def count_following(user_id: str):
-        res = supabase.table("userfollowing")\
-            .select("follow_id", count="exact")\
-            .eq("follower_id", user_id)\
-            .execute()
-        return res.count if res else 0
+        res = await execute_with_timeout(supabase.table("user_follow_stats")\
+            .select("following_count")\
+            .eq("user_id", user_id)\
+            .limit(1))
+        return res.data[0]["following_count"] if res.data else 0
 
     # 8️⃣ Get mutual follow (friends)
     @staticmethod
@@ -106,7 +101,7 @@ class FollowingRepository:
     async def suggested_users(user_id: str, limit=20):
 
         # Get all followed users
-        followed = supabase.table("userfollowing")\
+        followed = await supabase.table("userfollowing")\
             .select("following_id")\
             .eq("follower_id", user_id)\
             .execute()
@@ -117,7 +112,7 @@ class FollowingRepository:
             followed_ids = ["NOUSER"]  
 
         # Get users NOT followed + not self
-        return supabase.table("users")\
+        return await supabase.table("users")\
             .select("user_id, user_name, full_name, profile_img_url")\
             .not_.in_("user_id", followed_ids + [user_id])\
             .limit(limit)\
@@ -126,10 +121,19 @@ class FollowingRepository:
     # 🔟 Get following list raw IDs only
     @staticmethod
     async def get_following_ids(user_id: str):
-        res = supabase.table("userfollowing")\
+        res = await supabase.table("userfollowing")\
             .select("following_id")\
             .eq("follower_id", user_id)\
             .execute()
 
         return [row["following_id"] for row in res.data]
 
+    # 1️⃣1️⃣ Get followers raw IDs only
+    @staticmethod
+    async def get_follower_ids(user_id: str):
+        res = await supabase.table("userfollowing")\
+            .select("follower_id")\
+            .eq("following_id", user_id)\
+            .execute()
+
+        return [row["follower_id"] for row in res.data]
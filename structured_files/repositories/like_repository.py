@@ -13,12 +13,15 @@ class LikeRepository:
             "created_at": created_at
         }
 
-        response = supabase.table("likes").insert(data).execute()
+        # already liked → no row, no error
+        response = await supabase.table("likes")\
+            .upsert(data, on_conflict="user_id,post_id", ignore_duplicates=True)\
+            .execute()
         return response.data
 
     @staticmethod
     async def remove_like(post_id: str, user_id: str):
-        response = supabase.table("likes") \
+        response = await supabase.table("likes") \
             .delete() \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -27,7 +30,7 @@ class LikeRepository:
 
     @staticmethod
     async def check_if_liked(post_id: str, user_id: str):
-        response = supabase.table("likes") \
+        response = await supabase.table("likes") \
             .select("*") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -37,20 +40,34 @@ class LikeRepository:
 
     @staticmethod
     async def get_likes_count(post_id: str):
-        response = supabase.table("likes") \
-            .select("like_id") \
+        response = await supabase.table("post_stats") \
+            .select("likes_count") \
             .eq("post_id", post_id) \
             .execute()
 
-        return len(response.data)
+        return response.data[0]["likes_count"] if response.data else 0
 
     @staticmethod
     async def get_users_who_liked(post_id: str):
         response = (
-            supabase
+            await supabase
             .table("likes")
             .select("user_id")
             .eq("post_id", post_id)
             .execute()
         )
         return [row["user_id"] for row in response.data]
+
+    # which of these posts the user has liked ( one query for a whole page )
+    @staticmethod
+    async def get_liked_post_ids(user_id: str, post_ids: list):
+        if not post_ids:
+            return set()
+
+        response = await supabase.table("likes") \
+            .select("post_id") \
+            .eq("user_id", user_id) \
+            .in_("post_id", list(post_ids)) \
+            .execute()
+
+        return {row["post_id"] for row in response.data}
@@ -15,19 +15,19 @@ class PostReportRepository:
             "created_at": datetime.utcnow().isoformat()
         }
 
-        response = supabase.table("post_report").insert(data).execute()
+        response = await supabase.table("post_report").insert(data).execute()
         return response.data
 
     @staticmethod
     async def get_reports_by_post_id(post_id: str):
         """Get all reports for a specific post"""
-        response = supabase.table("post_report").select("*").eq("post_id", post_id).execute()
+        response = await supabase.table("post_report").select("*").eq("post_id", post_id).execute()
         return response.data
 
     @staticmethod
     async def get_reports_by_user(user_id: str):
         """Get all reports created by a specific user"""
-        response = supabase.table("post_report").select("*").eq("user_id", user_id).execute()
+        response = await supabase.table("post_report").select("*").eq("user_id", user_id).execute()
         return response.data
 
     @staticmethod
@@ -42,7 +42,7 @@ class PostReportRepository:
         if status:
             query = query.eq("status", status)
 
-        response = query.execute()
+        response = await query.execute()
         return response.data
 
     @staticmethod
@@ -55,7 +55,7 @@ class PostReportRepository:
         if new_status not in ["PENDING", "REVIEWED", "ACTION_TAKEN"]:
             raise ValueError("Invalid value for status")
 
-        response = supabase.table("post_report").update({
+        response = await supabase.table("post_report").update({
             "status": new_status,
             "modified_at": datetime.utcnow().isoformat(),
             "modified_by": admin_user_id
@@ -4,14 +4,14 @@
 from datetime import datetime
 import uuid
 from typing import List, Optional
-from supabase import Client
+from supabase import AsyncClient
 import re
 
 STORAGE_BUCKET = "users"
 
 
 class PostRepository:
-    def __init__(self, supabase: Client):
+    def __init__(self, supabase: AsyncClient):
         self.supabase = supabase
 
     # ======================================================
@@ -22,7 +22,7 @@ class PostRepository:
         timestamp = datetime.utcnow().isoformat()
 
         # insert post
-        self.supabase.table("posts").insert({
+        await self.supabase.table("posts").insert({
             "post_id": post_id,
             "post_title": post_title,
             "content": content,
@@ -46,17 +46,17 @@ class PostRepository:
                 file_bytes = await img.read()
 
                 # Upload to storage
-                self.supabase.storage.from_(STORAGE_BUCKET).upload(
+                await self.supabase.storage.from_(STORAGE_BUCKET).upload(
                     file_path,
                     file_bytes,
                     {"content-type": img.content_type}
                 )
 
-                public_url = self.supabase.storage.from_(STORAGE_BUCKET).get_public_url(file_path)
+                public_url = await self.supabase.storage.from_(STORAGE_BUCKET).get_public_url(file_path)
                 image_urls.append(public_url)
 
                 # Insert into DB
-                self.supabase.table("post_images").insert({
+                await self.supabase.table("post_images").insert({
                     "image_id": image_id,
                     "post_id": post_id,
                     "image_url": public_url,
@@ -70,8 +70,8 @@ class PostRepository:
     # ======================================================
     # UPDATE POST
     # ======================================================
-    def update_post(self, post_id: str, user_id: str, post_title: str, content: str):
-        exists = self.supabase.table("posts") \
+    async def update_post(self, post_id: str, user_id: str, post_title: str, content: str):
+        exists = await self.supabase.table("posts") \
             .select("post_id") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -80,7 +80,7 @@ class PostRepository:
         if not exists.data:
             return False
 
-        self.supabase.table("posts").update({
+        await self.supabase.table("posts").update({
             "post_title": post_title,
             "content": content,
             "modified_at": datetime.utcnow().isoformat(),
@@ -91,9 +91,9 @@ class PostRepository:
     # ======================================================
     # DELETE POST
     # ======================================================
-    def delete_post(self, post_id: str, user_id: str):
+    async def delete_post(self, post_id: str, user_id: str):
 
-        post = self.supabase.table("posts") \
+        post = await self.supabase.table("posts") \
             .select("*") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -103,7 +103,7 @@ class PostRepository:
             return False
 
         # Get images
-        img_rows = self.supabase.table("post_images").select("*").eq("post_id", post_id).execute()
+        img_rows = await self.supabase.table("post_images").select("*").eq("post_id", post_id).execute()
 
         delete_filepaths = []
 
@@ -115,22 +115,22 @@ class PostRepository:
             delete_filepaths.append(file_path)
 
         if delete_filepaths:
-            self.supabase.storage.from_(STORAGE_BUCKET).remove(delete_filepaths)
+            await self.supabase.storage.from_(STORAGE_BUCKET).remove(delete_filepaths)
 
         # delete all post related
-        self.supabase.table("post_images").delete().eq("post_id", post_id).execute()
-        self.supabase.table("comments").delete().eq("post_id", post_id).execute()
-        self.supabase.table("likes").delete().eq("post_id", post_id).execute()
-        self.supabase.table("posts").delete().eq("post_id", post_id).execute()
+        await self.supabase.table("post_images").delete().eq("post_id", post_id).execute()
+        await self.supabase.table("comments").delete().eq("post_id", post_id).execute()
+        await self.supabase.table("likes").delete().eq("post_id", post_id).execute()
+        await self.supabase.table("posts").delete().eq("post_id", post_id).execute()
 
         return True
 
     # ======================================================
     # GET SINGLE POST
     # ======================================================
-    def get_post(self, post_id: str, user_id: str):
+    async def get_post(self, post_id: str, user_id: str):
 
-        post = self.supabase.table("posts") \
+        post = await self.supabase.table("posts") \
             .select("*") \
             .eq("post_id", post_id) \
             .execute()
@@ -141,7 +141,7 @@ class PostRepository:
         post_data = post.data[0]
 
         # images
-        img_rows = self.supabase.table("post_images") \
+        img_rows = await self.supabase.table("post_images") \
             .select("image_url, position") \
             .eq("post_id", post_id) \
             .order("position", desc=False) \
@@ -156,19 +156,19 @@ class PostRepository:
                 })
 
         # likes count
-        likes = self.supabase.table("likes") \
+        likes = await self.supabase.table("likes") \
             .select("like_id") \
             .eq("post_id", post_id) \
             .execute()
 
         # comments count
-        comments = self.supabase.table("comments") \
+        comments = await self.supabase.table("comments") \
             .select("comment_id") \
             .eq("post_id", post_id) \
             .execute()
 
         # user liked?
-        user_like = self.supabase.table("likes") \
+        user_like = await self.supabase.table("likes") \
             .select("like_id") \
             .eq("post_id", post_id) \
             .eq("user_id", user_id) \
@@ -0,0 +1,38 @@
+from ..config.supabase_config import supabase
+
+# counters kept up to date by triggers ( sql/002_post_stats.sql )
+EMPTY_STATS = {
+    "likes_count": 0,
+    "comments_count": 0,
+    "support_count": 0,
+    "deny_count": 0,
+}
+
+
+class PostStatsRepository:
+
+    # post_id -> {likes_count, comments_count, support_count, deny_count}
+    @staticmethod
+    async def get_stats(post_ids: list):
+        if not post_ids:
+            return {}
+
+        res = (
+            await supabase.table("post_stats")
+            .select("post_id, likes_count, comments_count, support_count, deny_count")
+            .in_("post_id", list(post_ids))
+            .execute()
+        )
+        found = {row["post_id"]: row for row in res.data or []}
+        return {pid: found.get(pid, {"post_id": pid, **EMPTY_STATS}) for pid in post_ids}
+
+    # support / deny share of the comments, in percent
+    @staticmethod
+    def percentages(stats: dict):
+        total = stats["support_count"] + stats["deny_count"]
+        if not total:
+            return 0, 0
+        return (
+            round((stats["support_count"] / total) * 100, 2),
+            round((stats["deny_count"] / total) * 100, 2),
+        )
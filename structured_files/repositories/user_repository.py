@@ -1,36 +1,32 @@
 import uuid
 from datetime import datetime, timezone
-from argon2 import PasswordHasher
 from typing import Optional
 from ..config.supabase_config import supabase
 
-ph = PasswordHasher()
-
 STORAGE_BUCKET = "users"
 
 class UserRepository:
   
   #check email already exists
     @staticmethod
-    def get_user_by_email(email: str):
+    async def get_user_by_email(email: str):
         return (
-            supabase.table("users")
+            await supabase.table("users")
             .select("user_id")
             .eq("user_email", email)
             .execute()
-            .data
-        )
+        ).data
     
     # insert new user data
     @staticmethod
-    def create_user(data: dict):
-        return supabase.table("users").insert(data).execute()
+    async def create_user(data: dict):
+        return await supabase.table("users").insert(data).execute()
     
     #get user data using email and pass
     @staticmethod
-    def get_user_by_credential(email: str):
+    async def get_user_by_credential(email: str):
         resp = (
-            supabase.table("users")
+            await supabase.table("users")
             .select("user_id,user_email,password,verified,last_sign_in")
             .eq("user_email", email)
             .execute()
@@ -39,9 +35,9 @@ class UserRepository:
     
     #Update last sign in 
     @staticmethod
-    def update_last_sign_in(user_id: str):
+    async def update_last_sign_in(user_id: str):
         resp = (
-            supabase.table("users")
+            await supabase.table("users")
             .update({
                 "last_sign_in": datetime.now(timezone.utc).isoformat()
             })
@@ -53,7 +49,34 @@ class UserRepository:
             raise Exception("Last sign-in update failed")
 
         return True
-    
 
-   
+    #swap the password hash, only if it is still the one we verified
+    #( a password change in between wins ) → True if it was replaced
+    @staticmethod
+    async def replace_password_hash(user_id: str, old_hash: str, new_hash: str):
+        resp = (
+            await supabase.table("users")
+            .update({"password": new_hash})
+            .eq("user_id", user_id)
+            .eq("password", old_hash)
+            .execute()
+        )
+        return bool(resp.data)
+
+    #author mini cards for many users in one query ( user_id -> card )
+    @staticmethod
+    async def get_user_cards(user_ids: list):
+        if not user_ids:
+            return {}
+
+        resp = (
+            await supabase.table("users")
+            .select("user_id, user_name, full_name, profile_img_url")
+            .in_("user_id", list(user_ids))
+            .execute()
+        )
+        return {u["user_id"]: u for u in resp.data or []}
+
+
+
 
@@ -19,7 +19,7 @@ class UserTokensRepository:
             "created_by": user_id
         }
 
-        response = supabase.table("user_tokens").insert(data).execute()
+        response = await supabase.table("user_tokens").insert(data).execute()
         return response.data
 
     @staticmethod
@@ -29,7 +29,7 @@ class UserTokensRepository:
         Useful to send push notifications to ALL devices
         """
 
-        response = supabase.table("user_tokens").select("*").eq("user_id", user_id).execute()
+        response = await supabase.table("user_tokens").select("*").eq("user_id", user_id).execute()
         return response.data
 
     @staticmethod
@@ -38,7 +38,7 @@ class UserTokensRepository:
         Get a specific device profile from device token
         """
 
-        response = supabase.table("user_tokens").select("*").eq("device_token", device_token).execute()
+        response = await supabase.table("user_tokens").select("*").eq("device_token", device_token).execute()
         return response.data
 
     @staticmethod
@@ -47,7 +47,7 @@ class UserTokensRepository:
         Update FCM token for a specific device
         """
 
-        response = supabase.table("user_tokens").update({
+        response = await supabase.table("user_tokens").update({
             "fcm_token": new_fcm_token,
             "modified_at": datetime.utcnow().isoformat(),
             "modified_by": user_id
@@ -61,7 +61,7 @@ class UserTokensRepository:
         Delete single device token (user logout from one device)
         """
 
-        response = supabase.table("user_tokens").delete().eq("device_token", device_token).execute()
+        response = await supabase.table("user_tokens").delete().eq("device_token", device_token).execute()
         return response.data
 
     @staticmethod
@@ -71,7 +71,7 @@ class UserTokensRepository:
         Used when user resets password / suspicious login / full logout
         """
 
-        response = supabase.table("user_tokens").delete().eq("user_id", user_id).execute()
+        response = await supabase.table("user_tokens").delete().eq("user_id", user_id).execute()
         return response.data
 
     @staticmethod
@@ -80,5 +80,5 @@ class UserTokensRepository:
         Check if given device token already exists
         """
 
-        response = supabase.table("user_tokens").select("device_token").eq("device_token", device_token).execute()
+        response = await supabase.table("user_tokens").select("device_token").eq("device_token", device_token).execute()
         return len(response.data) > 0
@@ -1,4 +1,5 @@
-from argon2 import PasswordHasher, exceptions
+import logging
+from argon2 import exceptions
 from datetime import datetime, timedelta, timezone
 import uuid
 from fastapi import HTTPException
@@ -10,8 +11,9 @@ from ..utils.refer_id_gen import generate_referral_id
 from ..utils.otp_gen import generate_otp
 from ..utils.username_gen import generate_unique_username
 from ..utils.jwt_utils import create_auth_token, create_refresh_token
+from ..utils.password_hashing import hash_password, verify_password, needs_rehash
 
-ph = PasswordHasher()
+logger = logging.getLogger(__name__)
 
 
 # -----------------------------
@@ -19,29 +21,29 @@ ph = PasswordHasher()
 # -----------------------------
 async def signup_user(user):
     # 1️⃣ Check if email exists
-    if UserRepository.get_user_by_email(user.user_email):
+    if await UserRepository.get_user_by_email(user.user_email):
         raise ValueError("Email already exists")
 
     # 2️⃣ Prepare user data
     user_id = str(uuid.uuid4())
     otp = generate_otp()
-    user_name = generate_unique_username()
+    user_name = await generate_unique_username()
 
     user_data = {
         "user_id": user_id,
         "user_email": user.user_email,
         "user_name": user_name,
-        "password": ph.hash(user.password),
+        "password": await hash_password(user.password),
         "otp": otp,
         "otp_expiry": (datetime.utcnow() + timedelta(minutes=10)).isoformat(),
         "verified": False,
         "created_at": datetime.utcnow().isoformat(),
         "modified_at": datetime.utcnow().isoformat(),
-        "refer_id": generate_referral_id()
+        "refer_id": await generate_referral_id()
     }
 
     # 3️⃣ Save user
-    UserRepository.create_user(user_data)
+    await UserRepository.create_user(user_data)
 
     # 4️⃣ Send OTP email
     try:
@@ -55,12 +57,29 @@ async def signup_user(user):
     }
 
 
+# -----------------------------
+# ✅ REHASH ON LOGIN ( background task )
+# stored hash made with older / cheaper argon2 parameters → hash the
+# password again with the current ones while we still have it
+# ( scheduled by login_router.login through BackgroundTasks )
+# -----------------------------
+async def upgrade_password_hash(user_id: str, old_hash: str, password: str):
+    if not needs_rehash(old_hash):
+        return
+    try:
+        new_hash = await hash_password(password)
+        await UserRepository.replace_password_hash(user_id, old_hash, new_hash)
+    except Exception:
+        # old hash keeps working, next login tries again
+        logger.exception("PASSWORD_REHASH_ERROR: %s", user_id)
+
+
 # -----------------------------
 # ✅ LOGIN SERVICE
 # -----------------------------
 async def login_user(payload):
     # 1️⃣ Fetch user by email
-    user_data = UserRepository.get_user_by_credential(payload.user_email)
+    user_data = await UserRepository.get_user_by_credential(payload.user_email)
     if not user_data:
         return {"success": False, "status_code": 400, "message": "User not found"}
 
@@ -71,9 +90,11 @@ async def login_user(payload):
 
     # 2️⃣ Verify password
     try:
-        ph.verify(hashed_pass, payload.password)
+        await verify_password(hashed_pass, payload.password)
     except exceptions.VerifyMismatchError:
         return {"success": False, "status_code": 400, "message": "Invalid email or password"}
+    except HTTPException:
+        raise
     except Exception:
         return {"success": False, "status_code": 500, "message": "Password verification failed"}
 
@@ -83,7 +104,7 @@ async def login_user(payload):
 
     # 4️⃣ Update last_sign_in
     try:
-        UserRepository.update_last_sign_in(user_id)
+        await UserRepository.update_last_sign_in(user_id)
     except:
         return {"success": False, "status_code": 500, "message": "Failed to update last sign-in"}
 
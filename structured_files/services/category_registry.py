@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+from ..config.http_transport import execute_with_timeout
+from ..config.supabase_config import supabase
+
+
+# ============================================================
+# CATEGORY REGISTRY
+# - the categories table is tiny and almost never changes, so
+#   the whole table lives in memory ( loaded at startup )
+# - refreshed once it is older than CATEGORY_TTL_SECONDS
+# - an unknown title / id forces one early refresh ( at most
+#   every CATEGORY_MISS_REFRESH_SECONDS ) so a new category
+#   shows up without waiting for the TTL
+# - title lookups are case-insensitive ( same as ilike before )
+# ============================================================
+
+CATEGORY_TTL_SECONDS = float(os.getenv("CATEGORY_TTL_SECONDS", 600))
+CATEGORY_MISS_REFRESH_SECONDS = float(os.getenv("CATEGORY_MISS_REFRESH_SECONDS", 30))
+
+logger = logging.getLogger(__name__)
+
+
+def _key(title: str) -> str:
+    return title.strip().casefold()
+
+
+class CategoryRegistry:
+
+    def __init__(self, ttl: float = CATEGORY_TTL_SECONDS, miss_refresh: float = CATEGORY_MISS_REFRESH_SECONDS):
+        self.ttl = ttl
+        self.miss_refresh = miss_refresh
+        self._by_title: Dict[str, dict] = {}   # casefolded title -> {cat_id, cat_title}
+        self._by_id: Dict[object, str] = {}    # cat_id -> cat_title
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        # fail fast: callers wait on the lock, a stale copy beats a hang
+        rows = (
+            await execute_with_timeout(
+                supabase.table("categories")
+                .select("cat_id, cat_title")
+            )
+        ).data or []
+
+        self._by_title = {_key(r["cat_title"]): r for r in rows}
+        self._by_id = {r["cat_id"]: r["cat_title"] for r in rows}
+        self._loaded_at = time.monotonic()
+
+    async def _refresh_if_older_than(self, max_age: float):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < max_age:
+            return
+
+        # single flight: concurrent callers wait for the same refresh
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < max_age:
+                return
+            try:
+                await self.refresh()
+            except Exception:
+                if self._loaded_at is None:
+                    raise
+                # keep serving the stale copy, retry on a later call
+                logger.exception("CATEGORY_REFRESH_ERROR")
+                self._loaded_at = time.monotonic() - max(max_age - self.miss_refresh, 0)
+
+    async def resolve(self, title: str) -> Optional[dict]:
+        """cat_title ( any case ) → {cat_id, cat_title} | None"""
+        await self._refresh_if_older_than(self.ttl)
+        row = self._by_title.get(_key(title))
+        if row is None:
+            await self._refresh_if_older_than(self.miss_refresh)
+            row = self._by_title.get(_key(title))
+        return row
+
+    async def titles(self, cat_ids: Iterable) -> Dict[object, Optional[str]]:
+        """batch cat_id → cat_title"""
+        cat_ids = list(cat_ids)
+        await self._refresh_if_older_than(self.ttl)
+        if any(cid not in self._by_id for cid in cat_ids):
+            await self._refresh_if_older_than(self.miss_refresh)
+        return {cid: self._by_id.get(cid) for cid in cat_ids}
+
+
+registry = CategoryRegistry()
+
+
+async def load():
+    """startup warm-up; a failure here just means the first request loads it"""
+    try:
+        await registry.refresh()
+    except Exception:
+        logger.exception("CATEGORY_LOAD_ERROR")
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from ..config.supabase_config import supabase
+
+
+# ============================================================
+# FOLLOW COUNTER RECONCILER
+# - follower / following counts live in user_follow_stats and are
+#   changed together with the follow row ( follow_user_counted /
+#   unfollow_user_counted, see sql/009_user_follow_stats.sql )
+# - rows written around those RPCs ( admin edits, deleted users,
+#   races ) can make a counter drift, so every
+#   FOLLOW_STATS_RECONCILE_SECONDS the counters are recomputed from
+#   userfollowing and the wrong ones repaired
+# - off by default; set FOLLOW_STATS_RECONCILER=1 on ONE worker
+#   ( every extra reconciler is another chance to write a count
+#   computed before a concurrent follow back over it )
+# ============================================================
+
+FOLLOW_STATS_RECONCILER = os.getenv("FOLLOW_STATS_RECONCILER", "0") == "1"
+RECONCILE_SECONDS = float(os.getenv("FOLLOW_STATS_RECONCILE_SECONDS", 3600))
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile() -> int:
+    res = await supabase.rpc("reconcile_user_follow_stats", {}).execute()
+    repaired = res.data or 0
+    if repaired:
+        logger.warning("FOLLOW_STATS_DRIFT: repaired %s counters", repaired)
+    return repaired
+
+
+async def _reconcile_loop():
+    while True:
+        # first pass after one interval, startup stays fast
+        await asyncio.sleep(RECONCILE_SECONDS)
+        try:
+            await reconcile()
+        except Exception:
+            logger.exception("FOLLOW_STATS_RECONCILE_ERROR")
+
+
+_task: Optional[asyncio.Task] = None
+
+
+def start():
+    global _task
+    if FOLLOW_STATS_RECONCILER and _task is None:
+        _task = asyncio.get_running_loop().create_task(_reconcile_loop())
+
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
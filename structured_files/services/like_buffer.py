@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set
+from uuid import uuid4
+
+from ..config.supabase_config import supabase
+from ..repositories.like_repository import LikeRepository
+from . import post_hydration
+
+
+# ============================================================
+# WRITE-BEHIND LIKE BUFFER  ( LIKE_WRITE_BEHIND=1, off by default )
+# - /like/like and /like/unlike only record the wanted state per
+#   (user, post); toggles before a flush collapse into ONE event
+# - flushed every LIKE_FLUSH_INTERVAL_MS or as soon as
+#   LIKE_FLUSH_MAX_EVENTS are waiting, as ONE apply_like_events call
+#   ( see sql/011_apply_like_events.sql )
+# - read-your-writes: overlay() applies pending + in-flight events on
+#   top of what the likes table says ( liked_by_current_user )
+# - a failed flush puts the batch back ( newer toggles win ) and is
+#   retried; stop() flushes whatever is left on shutdown
+# - like counters ( post_stats ) move at flush time, so they can lag
+#   by one interval
+# - events live in this worker's memory: a crash loses at most one
+#   interval of likes
+# ============================================================
+
+LIKE_WRITE_BEHIND = os.getenv("LIKE_WRITE_BEHIND", "0") == "1"
+FLUSH_INTERVAL_SECONDS = float(os.getenv("LIKE_FLUSH_INTERVAL_MS", 250)) / 1000
+FLUSH_MAX_EVENTS = int(os.getenv("LIKE_FLUSH_MAX_EVENTS", 500))
+SHUTDOWN_FLUSH_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    return LIKE_WRITE_BEHIND
+
+
+class LikeBuffer:
+
+    def __init__(self):
+        # user_id -> post_id -> {like_id, liked, at}
+        self._pending: Dict[str, Dict[str, dict]] = {}
+        self._inflight: Dict[str, Dict[str, dict]] = {}
+        self._size = 0
+        self._wake = asyncio.Event()
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    # ---------------- state ----------------
+
+    def state(self, user_id: str, post_id: str) -> Optional[bool]:
+        """True / False if a not yet written event decides it, else None"""
+        for events in (self._pending, self._inflight):
+            event = events.get(user_id, {}).get(post_id)
+            if event is not None:
+                return event["liked"]
+        return None
+
+    def _pending_state(self, user_id: str, post_id: str) -> Optional[bool]:
+        event = self._pending.get(user_id, {}).get(post_id)
+        return None if event is None else event["liked"]
+
+    def overlay(self, user_id: str, post_ids: Iterable[str], liked: Set[str]) -> Set[str]:
+        liked = set(liked)
+        for pid in post_ids:
+            state = self.state(user_id, pid)
+            if state is True:
+                liked.add(pid)
+            elif state is False:
+                liked.discard(pid)
+        return liked
+
+    def _put(self, user_id: str, post_id: str, liked: bool, like_id: Optional[str] = None, at: Optional[str] = None):
+        per_user = self._pending.setdefault(user_id, {})
+        if post_id not in per_user:
+            self._size += 1
+        per_user[post_id] = {
+            "like_id": like_id or str(uuid4()),
+            "liked": liked,
+            "at": at or datetime.now(timezone.utc).isoformat(),
+        }
+        if self._size >= FLUSH_MAX_EVENTS:
+            self._wake.set()
+
+    # ---------------- API side ----------------
+
+    async def _current(self, user_id: str, post_id: str) -> bool:
+        state = self.state(user_id, post_id)
+        if state is not None:
+            return state
+        return await LikeRepository.check_if_liked(post_id, user_id)
+
+    async def like(self, user_id: str, post_id: str) -> Optional[str]:
+        """like_id of the new like, None if it was already liked"""
+        if await self._current(user_id, post_id):
+            return None
+        # another request may have toggled it while the check was awaited
+        if self.state(user_id, post_id) is True:
+            return None
+
+        like_id = str(uuid4())
+        self._put(user_id, post_id, True, like_id=like_id)
+        return like_id
+
+    async def unlike(self, user_id: str, post_id: str) -> bool:
+        """False if there was no like to remove"""
+        if not await self._current(user_id, post_id):
+            return False
+        if self.state(user_id, post_id) is False:
+            return False
+
+        self._put(user_id, post_id, False)
+        return True
+
+    # ---------------- flush ----------------
+
+    async def flush(self) -> int:
+        if not self._pending or self._inflight:
+            return 0
+
+        self._inflight, self._pending = self._pending, {}
+        self._size = 0
+        self._wake.clear()
+
+        events = [
+            {"user_id": uid, "post_id": pid, **event}
+            for uid, per_user in self._inflight.items()
+            for pid, event in per_user.items()
+        ]
+
+        try:
+            await supabase.rpc("apply_like_events", {"p_events": events}).execute()
+        except BaseException:
+            # put the batch back under anything toggled since
+            # ( also when cancelled mid-flush, stop() drains it )
+            self.failed_flushes += 1
+            for event in events:
+                if self._pending_state(event["user_id"], event["post_id"]) is None:
+                    self._put(event["user_id"], event["post_id"], event["liked"], event["like_id"], event["at"])
+            raise
+        finally:
+            self._inflight = {}
+
+        self.flushed += len(events)
+        for pid in {event["post_id"] for event in events}:
+            post_hydration.invalidate(pid)
+        return len(events)
+
+    async def wait(self):
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=FLUSH_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+    def stats(self):
+        return {
+            "pending": self._size,
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+buffer = LikeBuffer()
+
+
+# ============================================================
+# FLUSH LOOP ( startup task )
+# ============================================================
+
+async def _flush_loop():
+    while True:
+        await buffer.wait()
+        try:
+            await buffer.flush()
+        except Exception:
+            logger.exception("LIKE_FLUSH_ERROR")
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+
+
+_task: Optional[asyncio.Task] = None
+
+
+def start():
+    global _task
+    if LIKE_WRITE_BEHIND and _task is None:
+        _task = asyncio.get_running_loop().create_task(_flush_loop())
+
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+    # drain what is left before the process goes away
+    for attempt in range(SHUTDOWN_FLUSH_ATTEMPTS):
+        try:
+            await buffer.flush()
+            return
+        except Exception:
+            logger.exception("LIKE_FLUSH_ERROR: shutdown attempt %s", attempt + 1)
+    if buffer.stats()["pending"]:
+        logger.error("LIKE_FLUSH_ERROR: %s like events not written", buffer.stats()["pending"])
@@ -0,0 +1,135 @@
+import os
+from typing import Dict, List, Optional
+
+from ..config.supabase_config import supabase
+from ..repositories.like_repository import LikeRepository
+from ..repositories.post_stats_repository import PostStatsRepository
+from ..utils.concurrency import gather_bounded
+from ..utils.ttl_cache import TTLCache
+from .category_registry import registry as categories
+from . import user_cards, like_buffer
+
+
+# ============================================================
+# POST HYDRATION ( one place for every endpoint that shows posts )
+# - viewer independent part of a post ( body, images, category,
+#   counters ) is cached per post_id → TTL + LRU
+# - misses of a page are loaded together: posts / images / counters,
+#   then categories, each ONE .in_() query
+# - author cards come from services/user_cards ( own cache, dropped
+#   on profile update ) so a renamed author shows up right away
+# - per viewer fields ( liked_by_current_user ) are overlaid on a
+#   copy, never stored in the cache
+# - counters may lag up to POST_CACHE_TTL_SECONDS on other workers;
+#   writes on this worker call invalidate(post_id)
+# ============================================================
+
+POST_CACHE_TTL_SECONDS = float(os.getenv("POST_CACHE_TTL_SECONDS", 20))
+
+post_cache = TTLCache(
+    maxsize=int(os.getenv("POST_CACHE_SIZE", 5000)),
+    ttl=POST_CACHE_TTL_SECONDS,
+)
+
+EMPTY_AUTHOR = {"user_id": None, "user_name": None, "full_name": None, "profile_img_url": None}
+
+
+def invalidate(post_id: str):
+    post_cache.invalidate(post_id)
+
+
+async def _load_posts(post_ids: List[str]) -> Dict[str, dict]:
+    posts_res, images_res, stats_map = await gather_bounded(
+        supabase.table("posts")
+        .select("post_id, user_id, post_title, post_content, category, created_at, modified_at")
+        .in_("post_id", post_ids)
+        .execute(),
+        supabase.table("post_images")
+        .select("image_id, post_id, image_url, position")
+        .in_("post_id", post_ids)
+        .order("position")
+        .execute(),
+        PostStatsRepository.get_stats(post_ids),
+    )
+    posts = posts_res.data or []
+    if not posts:
+        return {}
+
+    category_ids = list({p["category"] for p in posts if p.get("category") is not None})
+    category_map = await categories.titles(category_ids)
+
+    image_map = {}
+    for img in images_res.data or []:
+        image_map.setdefault(img["post_id"], []).append({
+            "image_id": img["image_id"],
+            "image_url": img["image_url"],
+            "position": img["position"],
+        })
+
+    loaded = {}
+    for post in posts:
+        pid = post["post_id"]
+        stats = {k: v for k, v in stats_map[pid].items() if k != "post_id"}
+        support_percent, deny_percent = PostStatsRepository.percentages(stats)
+
+        loaded[pid] = {
+            "post_id": pid,
+            "user_id": post["user_id"],
+            "post_title": post["post_title"],
+            "post_content": post["post_content"],
+            "category_id": post.get("category"),
+            "category": category_map.get(post.get("category")),
+            "created_at": post["created_at"],
+            "modified_at": post.get("modified_at"),
+            "images": image_map.get(pid, []),
+            "stats": stats,
+            "support_percent": support_percent,
+            "deny_percent": deny_percent,
+        }
+    return loaded
+
+
+async def hydrate_posts(post_ids: List[str], viewer_id: Optional[str] = None) -> List[dict]:
+    """
+    Hydrated posts in the order of post_ids ( unknown / deleted ids are
+    dropped ). Every item is a fresh dict, callers may change it freely:
+
+    post_id, user_id, post_title, post_content, category_id, category,
+    created_at, modified_at, images [{image_id, image_url, position}],
+    author {user_id, user_name, full_name, profile_img_url},
+    stats {likes_count, comments_count, support_count, deny_count},
+    support_percent, deny_percent, liked_by_current_user
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    if not post_ids:
+        return []
+
+    async def no_likes():
+        return set()
+
+    # misses load as one batch, shared with concurrent pages that miss the same posts
+    cached, liked = await gather_bounded(
+        post_cache.get_many_or_load(post_ids, _load_posts),
+        LikeRepository.get_liked_post_ids(viewer_id, post_ids) if viewer_id else no_likes(),
+    )
+
+    # likes still waiting in the write-behind buffer ( read-your-writes )
+    if viewer_id and like_buffer.enabled():
+        liked = like_buffer.buffer.overlay(viewer_id, post_ids, liked)
+
+    # mostly cache hits → usually no query at all
+    authors = await user_cards.get_cards(post["user_id"] for post in cached.values())
+
+    hydrated = []
+    for pid in post_ids:
+        post = cached.get(pid)
+        if post is None:
+            continue
+        hydrated.append({
+            **post,
+            "images": [dict(img) for img in post["images"]],
+            "author": authors.get(post["user_id"]) or {**EMPTY_AUTHOR, "user_id": post["user_id"]},
+            "stats": dict(post["stats"]),
+            "liked_by_current_user": pid in liked,
+        })
+    return hydrated
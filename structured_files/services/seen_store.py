@@ -0,0 +1,97 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..config.supabase_config import supabase
+from ..utils.bloom_filter import BloomFilter
+from ..utils.ttl_cache import TTLCache
+
+
+# ============================================================
+# SEEN-SET PER FEED SESSION ( random category feed )
+# - the client keeps one session_token, the server remembers
+#   which posts that session was already served in a Bloom filter
+#   instead of the client shipping every id back each request
+# - high / low: created_at of the newest / oldest post examined,
+#   everything in between was already served → the feed only
+#   scans above high ( new posts ) and below low ( next page )
+# - sessions expire SEEN_TTL_SECONDS after their last use
+#
+# SEEN_STORE
+#   memory   → per-process ( needs sticky sessions with >1 worker )
+#   supabase → feed_seen_sessions table, see sql/007_feed_seen_sessions.sql
+# ============================================================
+
+SEEN_STORE = os.getenv("SEEN_STORE", "memory").lower()
+SEEN_TTL_SECONDS = int(os.getenv("SEEN_TTL_SECONDS", 1800))
+SEEN_MAX_SESSIONS = int(os.getenv("SEEN_MAX_SESSIONS", 10000))
+SEEN_CAPACITY = int(os.getenv("SEEN_CAPACITY", 10000))
+SEEN_ERROR_RATE = float(os.getenv("SEEN_ERROR_RATE", 0.01))
+
+
+class SeenSession:
+
+    def __init__(self, bloom: Optional[BloomFilter] = None, high: Optional[str] = None, low: Optional[str] = None):
+        self.bloom = bloom or BloomFilter(SEEN_CAPACITY, SEEN_ERROR_RATE)
+        self.high = high
+        self.low = low
+
+    def to_dict(self) -> dict:
+        return {"bloom": self.bloom.to_dict(), "high": self.high, "low": self.low}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SeenSession":
+        return cls(BloomFilter.from_dict(data["bloom"]), data.get("high"), data.get("low"))
+
+
+def _session_key(user_id: str, token: str, category_id) -> str:
+    # bound to the user → a leaked token is useless to anybody else
+    return f"{user_id}:{category_id}:{token}"
+
+
+class MemorySeenStore:
+
+    def __init__(self):
+        self._sessions = TTLCache(maxsize=SEEN_MAX_SESSIONS, ttl=SEEN_TTL_SECONDS)
+
+    async def load(self, key: str) -> Optional[SeenSession]:
+        return self._sessions.get(key)
+
+    async def save(self, key: str, session: SeenSession):
+        # set again → expiry slides with every request
+        self._sessions.set(key, session)
+
+
+class SupabaseSeenStore:
+
+    async def load(self, key: str) -> Optional[SeenSession]:
+        res = (
+            await supabase.table("feed_seen_sessions")
+            .select("state")
+            .eq("session_key", key)
+            .gt("expires_at", datetime.now(timezone.utc).isoformat())
+            .execute()
+        )
+        return SeenSession.from_dict(res.data[0]["state"]) if res.data else None
+
+    async def save(self, key: str, session: SeenSession):
+        await supabase.table("feed_seen_sessions").upsert({
+            "session_key": key,
+            "state": session.to_dict(),
+            "expires_at": (datetime.now(timezone.utc) + timedelta(seconds=SEEN_TTL_SECONDS)).isoformat(),
+        }, on_conflict="session_key").execute()
+
+
+store = SupabaseSeenStore() if SEEN_STORE == "supabase" else MemorySeenStore()
+
+
+async def load_session(user_id: str, token: str, category_id) -> SeenSession:
+    session = await store.load(_session_key(user_id, token, category_id))
+    if session is None or session.bloom.saturated:
+        # unknown / expired / full → start over
+        return SeenSession()
+    return session
+
+
+async def save_session(user_id: str, token: str, category_id, session: SeenSession):
+    await store.save(_session_key(user_id, token, category_id), session)
@@ -0,0 +1,405 @@
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..config.http_transport import execute_with_timeout
+from ..config.supabase_config import supabase
+from ..repositories.follow_repository import FollowingRepository
+from ..utils.feed_cursor import after_cursor_filter
+
+
+# ============================================================
+# FAN-OUT-ON-WRITE TIMELINES ( following feed )
+# - create_post pushes (created_at, post_id) into every
+#   follower's capped timeline ( background task )
+# - get_feed reads a precomputed slice of it
+# - authors with a huge following are NOT fanned out, their
+#   posts are merged in at read time ( fan-out-on-read )
+#
+# TIMELINE_STORE
+#   off      → disabled, get_feed keeps using get_following_feed
+#   memory   → per-process store ( offline / single worker only )
+#   supabase → timelines tables, see sql/005_timelines.sql
+#
+# follow / unfollow merge in / drop the author's posts, a deleted
+# post leaves every timeline ( sql/012_timeline_follow_sync.sql )
+# a fan-out that still fails after retries drops the followers'
+# timelines, their next read rebuilds them ( sql/013 )
+# ============================================================
+
+TIMELINE_STORE = os.getenv("TIMELINE_STORE", "off").lower()
+TIMELINE_MAX_LEN = int(os.getenv("TIMELINE_MAX_LEN", 800))
+CELEBRITY_FOLLOWERS = int(os.getenv("TIMELINE_CELEBRITY_FOLLOWERS", 10000))
+# other workers mark celebrities too → re-read the set this often
+CELEBRITY_TTL_SECONDS = float(os.getenv("TIMELINE_CELEBRITY_TTL_SECONDS", 30))
+FANOUT_ATTEMPTS = 3
+
+Entry = Tuple[datetime, str]   # (created_at, post_id) → sorts like the feed
+
+logger = logging.getLogger(__name__)
+
+
+def _ts(value) -> datetime:
+    """created_at from posts / RPC json / utcnow().isoformat() → aware datetime"""
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _to_dict(entry: Entry) -> dict:
+    return {"created_at": entry[0].isoformat(), "post_id": entry[1]}
+
+
+# ============================================================
+# LOCAL STAND-IN STORE
+# ============================================================
+
+class InMemoryTimelineStore:
+
+    def __init__(self, max_len: int = TIMELINE_MAX_LEN):
+        self.max_len = max_len
+        # user_id -> (created_at, post_id, author_id), oldest first
+        # ( insort keeps it sorted, the author goes when the entry is trimmed )
+        self._timelines: Dict[str, List[Tuple[datetime, str, str]]] = {}
+        self._truncated: Set[str] = set()
+        self._celebrities: Set[str] = set()
+
+    def _insert(self, user_id: str, entry: Tuple[datetime, str, str]):
+        timeline = self._timelines[user_id]
+        if entry in timeline:
+            return
+        insort(timeline, entry)
+        if len(timeline) > self.max_len:
+            del timeline[: len(timeline) - self.max_len]
+            self._truncated.add(user_id)
+
+    async def push(self, author_id: str, post_id: str, created_at) -> int:
+        follower_ids = await FollowingRepository.get_follower_ids(author_id)
+        entry = (_ts(created_at), post_id, author_id)
+        pushed = 0
+        for follower_id in set(follower_ids):
+            # only timelines somebody already reads are kept warm
+            if follower_id in self._timelines:
+                self._insert(follower_id, entry)
+                pushed += 1
+        return pushed
+
+    async def backfill(self, user_id: str, exclude_authors: Set[str]):
+        res = await supabase.rpc(
+            "get_following_feed",
+            {"p_user_id": user_id, "p_limit": self.max_len, "p_skip": 0},
+        ).execute()
+        posts = (res.data or {}).get("posts") or []
+
+        self._timelines[user_id] = sorted(
+            (_ts(p["created_at"]), p["post_id"], p["user_id"])
+            for p in posts
+            if p["user_id"] not in exclude_authors
+        )
+        if len(posts) >= self.max_len:
+            self._truncated.add(user_id)
+        else:
+            self._truncated.discard(user_id)
+
+    async def read(self, user_id: str, cursor: Optional[dict], limit: int):
+        """(materialized, truncated, entries newest first)"""
+        timeline = self._timelines.get(user_id)
+        if timeline is None:
+            return False, False, []
+
+        # oldest first → everything "after" the cursor sits left of it
+        # ( (created_at, post_id) sorts before the entry that carries it )
+        end = bisect_left(timeline, (_ts(cursor["created_at"]), cursor["post_id"])) if cursor else len(timeline)
+        entries = [_to_dict(e) for e in reversed(timeline[max(0, end - limit):end])]
+        return True, user_id in self._truncated, entries
+
+    async def add_author(self, user_id: str, author_id: str):
+        timeline = self._timelines.get(user_id)
+        if timeline is None:
+            return
+
+        res = await (
+            supabase.table("posts")
+            .select("post_id, created_at")
+            .eq("user_id", author_id)
+            .order("created_at", desc=True)
+            .order("post_id", desc=True)
+            .limit(self.max_len)
+            .execute()
+        )
+        # a truncated timeline has no entries below its oldest one,
+        # older posts would sit there without their neighbours
+        floor = timeline[0] if user_id in self._truncated and timeline else None
+        for p in res.data or []:
+            entry = (_ts(p["created_at"]), p["post_id"], author_id)
+            if floor is None or entry >= floor:
+                self._insert(user_id, entry)
+
+    async def remove_author(self, user_id: str, author_id: str):
+        timeline = self._timelines.get(user_id)
+        if timeline is not None:
+            timeline[:] = [e for e in timeline if e[2] != author_id]
+
+    async def remove_post(self, post_id: str):
+        for timeline in self._timelines.values():
+            timeline[:] = [e for e in timeline if e[1] != post_id]
+
+    async def invalidate_followers(self, author_id: str):
+        for follower_id in await FollowingRepository.get_follower_ids(author_id):
+            self._timelines.pop(follower_id, None)
+            self._truncated.discard(follower_id)
+
+    async def mark_celebrity(self, author_id: str):
+        self._celebrities.add(author_id)
+
+    async def celebrities(self) -> Set[str]:
+        return self._celebrities
+
+
+# ============================================================
+# SUPABASE STORE ( sql/005_timelines.sql )
+# ============================================================
+
+class SupabaseTimelineStore:
+
+    def __init__(self, max_len: int = TIMELINE_MAX_LEN):
+        self.max_len = max_len
+        self._celebrities: Optional[Set[str]] = None
+        self._celebrities_at = 0.0
+
+    async def push(self, author_id: str, post_id: str, created_at) -> int:
+        # follower list never leaves the database
+        res = await supabase.rpc(
+            "fanout_post",
+            {
+                "p_post_id": post_id,
+                "p_author_id": author_id,
+                "p_created_at": _ts(created_at).isoformat(),
+                "p_max_len": self.max_len,
+            },
+        ).execute()
+        return res.data or 0
+
+    async def backfill(self, user_id: str, exclude_authors: Set[str]):
+        # celebrities are excluded inside the RPC ( timeline_celebrities )
+        await supabase.rpc(
+            "backfill_timeline",
+            {"p_user_id": user_id, "p_max_len": self.max_len},
+        ).execute()
+
+    async def read(self, user_id: str, cursor: Optional[dict], limit: int):
+        res = await supabase.rpc(
+            "read_timeline",
+            {
+                "p_user_id": user_id,
+                "p_limit": limit,
+                "p_cursor_created_at": cursor["created_at"] if cursor else None,
+                "p_cursor_post_id": cursor["post_id"] if cursor else None,
+            },
+        ).execute()
+        data = res.data or {}
+        return bool(data.get("materialized")), bool(data.get("truncated")), data.get("entries") or []
+
+    async def add_author(self, user_id: str, author_id: str):
+        await supabase.rpc(
+            "timeline_add_author",
+            {"p_user_id": user_id, "p_author_id": author_id, "p_max_len": self.max_len},
+        ).execute()
+
+    async def remove_author(self, user_id: str, author_id: str):
+        await supabase.rpc(
+            "timeline_remove_author",
+            {"p_user_id": user_id, "p_author_id": author_id},
+        ).execute()
+
+    async def remove_post(self, post_id: str):
+        # timelines.post_id REFERENCES posts ON DELETE CASCADE,
+        # deleting the post already emptied every timeline
+        return
+
+    async def invalidate_followers(self, author_id: str):
+        # sql/013_timeline_invalidate_followers.sql
+        await supabase.rpc("invalidate_follower_timelines", {"p_author_id": author_id}).execute()
+
+    async def mark_celebrity(self, author_id: str):
+        await supabase.table("timeline_celebrities").upsert(
+            {"user_id": author_id}, on_conflict="user_id", ignore_duplicates=True
+        ).execute()
+        if self._celebrities is not None:
+            self._celebrities.add(author_id)
+
+    async def celebrities(self) -> Set[str]:
+        # fanout_post already skips a celebrity marked by ANY worker,
+        # a stale set would leave their posts out of the feed here
+        if self._celebrities is None or time.monotonic() - self._celebrities_at >= CELEBRITY_TTL_SECONDS:
+            res = await supabase.table("timeline_celebrities").select("user_id").execute()
+            self._celebrities = {row["user_id"] for row in res.data or []}
+            self._celebrities_at = time.monotonic()
+        return self._celebrities
+
+
+def _make_store():
+    if TIMELINE_STORE == "memory":
+        return InMemoryTimelineStore()
+    if TIMELINE_STORE == "supabase":
+        return SupabaseTimelineStore()
+    return None
+
+
+store = _make_store()
+
+
+def enabled() -> bool:
+    return store is not None
+
+
+# ============================================================
+# WRITE SIDE  ( BackgroundTasks from create_post )
+# ============================================================
+
+async def fan_out_post(post_id: str, author_id: str, created_at):
+    if store is None:
+        return
+
+    # push is idempotent → safe to retry
+    for attempt in range(1, FANOUT_ATTEMPTS + 1):
+        try:
+            if await FollowingRepository.count_followers(author_id) >= CELEBRITY_FOLLOWERS:
+                await store.mark_celebrity(author_id)
+                return
+
+            await store.push(author_id, post_id, created_at)
+            return
+        except Exception:
+            logger.warning("TIMELINE_FANOUT_RETRY: %s attempt %s", post_id, attempt, exc_info=True)
+            if attempt < FANOUT_ATTEMPTS:
+                await asyncio.sleep(attempt)
+
+    # materialized timelines are never rebuilt on their own: drop the
+    # followers' ones so their next read backfills, post included
+    try:
+        await store.invalidate_followers(author_id)
+    except Exception:
+        logger.exception("TIMELINE_FANOUT_ERROR: %s", post_id)
+
+
+_backfilling: Set[str] = set()
+
+
+async def backfill(user_id: str):
+    # several feed requests can miss before the first backfill lands
+    if store is None or user_id in _backfilling:
+        return
+
+    _backfilling.add(user_id)
+    try:
+        await store.backfill(user_id, await store.celebrities())
+    except Exception:
+        logger.exception("TIMELINE_BACKFILL_ERROR: %s", user_id)
+    finally:
+        _backfilling.discard(user_id)
+
+
+async def follow(user_id: str, author_id: str):
+    """merge the newly followed author's recent posts into user_id's timeline"""
+    if store is None:
+        return
+
+    try:
+        # celebrities are merged at read time anyway
+        if author_id in await store.celebrities():
+            return
+        await store.add_author(user_id, author_id)
+    except Exception:
+        logger.exception("TIMELINE_FOLLOW_ERROR: %s -> %s", user_id, author_id)
+
+
+async def unfollow(user_id: str, author_id: str):
+    if store is None:
+        return
+
+    try:
+        await store.remove_author(user_id, author_id)
+    except Exception:
+        logger.exception("TIMELINE_UNFOLLOW_ERROR: %s -> %s", user_id, author_id)
+
+
+async def remove_post(post_id: str):
+    if store is None:
+        return
+
+    try:
+        await store.remove_post(post_id)
+    except Exception:
+        logger.exception("TIMELINE_REMOVE_POST_ERROR: %s", post_id)
+
+
+# ============================================================
+# READ SIDE
+# ============================================================
+
+async def _celebrity_entries(user_id: str, cursor: Optional[dict], limit: int) -> List[dict]:
+    """fan-out-on-read part: newest posts of the celebrities this user follows"""
+    celebrities = await store.celebrities()
+    if not celebrities:
+        return []
+
+    followed = (
+        await execute_with_timeout(
+            supabase.table("userfollowing")
+            .select("following_id")
+            .eq("follower_id", user_id)
+            .in_("following_id", list(celebrities))
+        )
+    ).data or []
+    if not followed:
+        return []
+
+    query = (
+        supabase.table("posts")
+        .select("post_id, created_at")
+        .in_("user_id", list({f["following_id"] for f in followed}))
+        .order("created_at", desc=True)
+        .order("post_id", desc=True)
+        .limit(limit)
+    )
+    if cursor:
+        query = query.or_(after_cursor_filter(cursor))
+    return (await query.execute()).data or []
+
+
+async def read_following_page(user_id: str, cursor: Optional[dict], limit: int) -> Tuple[Optional[List[dict]], bool]:
+    """
+    (posts, materialized)
+    posts: one page of the following feed from the timeline store,
+    [{post_id, created_at}] ordered (created_at desc, post_id desc), bodies
+    come from post_hydration ( deleted posts drop out there ). None → the store
+    can't answer this page ( timeline not built yet, or the page is older
+    than what the capped timeline kept ), use the RPC.
+    materialized: False → the caller should schedule backfill(user_id)
+    """
+    if store is None:
+        return None, False
+
+    try:
+        (materialized, truncated, entries), celebrity_entries = await asyncio.gather(
+            store.read(user_id, cursor, limit),
+            _celebrity_entries(user_id, cursor, limit),
+        )
+    except asyncio.TimeoutError:
+        # slow follow lookup → the RPC path answers this page
+        return None, True
+    if not materialized:
+        return None, False
+    if truncated and len(entries) < limit:
+        return None, True
+
+    merged = {e["post_id"]: (_ts(e["created_at"]), e["post_id"]) for e in entries + celebrity_entries}
+    page = sorted(merged.values(), reverse=True)[:limit]
+    return [_to_dict(entry) for entry in page], True
@@ -0,0 +1,246 @@
+import asyncio
+import heapq
+import logging
+import math
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..config.supabase_config import supabase
+
+
+# ============================================================
+# IN-PROCESS TRENDING ENGINE
+# - every post has a time-decayed score:
+#     sum( weight * 0.5 ^ (age / half_life) )  over post / likes / comments
+# - scores are stored relative to an epoch ( weight * e^(λ(t - epoch)) ),
+#   so an event only touches ONE post and ordering never needs a
+#   re-decay; the epoch is moved forward before the numbers get big
+# - top-K ( global or per category ) = heapq.nlargest over the scores
+# - reconciled from the database ( trending_snapshot RPC, see
+#   sql/006_trending_snapshot.sql ) every TRENDING_RECONCILE_SECONDS,
+#   which also merges in events other workers saw
+# - a like counts once per (user, post) between two reconciles; an
+#   unlike takes back exactly the weight that like added, so toggling
+#   can't pump a score. Unlikes of older likes ( and deleted comments )
+#   undo an event of unknown age → left to the next reconcile
+# - cold ( before the first reconcile ) → callers use the old RPCs
+# ============================================================
+
+TRENDING_ENGINE = os.getenv("TRENDING_ENGINE", "1") == "1"
+HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 12))
+WINDOW_HOURS = float(os.getenv("TRENDING_WINDOW_HOURS", 24 * 7))
+RECONCILE_SECONDS = float(os.getenv("TRENDING_RECONCILE_SECONDS", 300))
+
+WEIGHTS = {
+    "post": float(os.getenv("TRENDING_POST_WEIGHT", 1)),
+    "like": float(os.getenv("TRENDING_LIKE_WEIGHT", 1)),
+    "comment": float(os.getenv("TRENDING_COMMENT_WEIGHT", 2)),
+}
+
+REBASE_EXPONENT = 50.0   # e^50 ≈ 5e21, far from float overflow
+PRUNE_BELOW = 1e-3       # decayed score under this → dropped on rebase
+
+logger = logging.getLogger(__name__)
+
+
+def _seconds(value) -> float:
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return float(value)
+    ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if not ts.tzinfo:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+class TrendingEngine:
+
+    def __init__(self, half_life_hours: float = HALF_LIFE_HOURS, weights: Optional[Dict[str, float]] = None):
+        self.weights = weights or WEIGHTS
+        self._rate = math.log(2) / (half_life_hours * 3600)
+        self._epoch = time.time()
+        self._scores: Dict[str, float] = {}           # post_id -> score relative to epoch
+        self._category: Dict[str, str] = {}           # post_id -> cat_id
+        self._by_category: Dict[str, Set[str]] = {}   # cat_id -> post_ids
+        self._likes: Dict[Tuple[str, str], float] = {}   # (user_id, post_id) -> liked at, since the snapshot
+        self.reconciled_at: Optional[float] = None
+
+    @property
+    def warm(self) -> bool:
+        return self.reconciled_at is not None
+
+    # ---------------- writes ----------------
+
+    def record(self, kind: str, post_id: str, category: Optional[str] = None, at=None, count: int = 1):
+        at = _seconds(at)
+        if category is not None:
+            self._set_category(post_id, category)
+        if count <= 0:
+            # left to reconcile ( see header )
+            return
+
+        self._scores[post_id] = self._scores.get(post_id, 0.0) + self.weights[kind] * count * math.exp(self._rate * (at - self._epoch))
+
+        if self._rate * (at - self._epoch) > REBASE_EXPONENT:
+            self._rebase(at)
+
+    def like(self, user_id: str, post_id: str, at=None):
+        key = (user_id, post_id)
+        if key in self._likes:
+            return
+        self._likes[key] = _seconds(at)
+        self.record("like", post_id, at=self._likes[key])
+
+    def unlike(self, user_id: str, post_id: str):
+        liked_at = self._likes.pop((user_id, post_id), None)
+        if liked_at is None or post_id not in self._scores:
+            # liked before the snapshot → reconcile takes it out
+            return
+        added = self.weights["like"] * math.exp(self._rate * (liked_at - self._epoch))
+        self._scores[post_id] = max(0.0, self._scores[post_id] - added)
+
+    def remove(self, post_id: str):
+        """deleted post; its _likes entries go with the next snapshot"""
+        self._drop(post_id)
+
+    def load_snapshot(self, rows: List[dict], at=None):
+        """replace everything with decayed scores valid at `at`"""
+        self._epoch = _seconds(at)
+        self._scores = {}
+        self._category = {}
+        self._by_category = {}
+        self._likes = {}
+        for row in rows:
+            self._scores[row["post_id"]] = float(row["score"])
+            if row.get("category") is not None:
+                self._set_category(row["post_id"], row["category"])
+        self.reconciled_at = self._epoch
+
+    def _set_category(self, post_id: str, category: str):
+        old = self._category.get(post_id)
+        if old == category:
+            return
+        if old is not None:
+            self._by_category[old].discard(post_id)
+        self._category[post_id] = category
+        self._by_category.setdefault(category, set()).add(post_id)
+
+    def _drop(self, post_id: str):
+        self._scores.pop(post_id, None)
+        category = self._category.pop(post_id, None)
+        if category is not None:
+            self._by_category[category].discard(post_id)
+
+    def _rebase(self, now: float):
+        factor = math.exp(-self._rate * (now - self._epoch))
+        self._epoch = now
+        for post_id, score in list(self._scores.items()):
+            score *= factor
+            if score < PRUNE_BELOW:
+                self._drop(post_id)
+            else:
+                self._scores[post_id] = score
+
+    # ---------------- reads ----------------
+
+    def score(self, post_id: str, at=None) -> float:
+        """decayed score right now ( or at `at` )"""
+        return self._scores.get(post_id, 0.0) * math.exp(-self._rate * (_seconds(at) - self._epoch))
+
+    def top(self, limit: int, offset: int = 0, category: Optional[str] = None) -> List[str]:
+        candidates = self._by_category.get(category, ()) if category is not None else self._scores.keys()
+        return heapq.nlargest(offset + limit, candidates, key=self._scores.__getitem__)[offset:]
+
+
+engine = TrendingEngine()
+
+
+# ============================================================
+# EVENTS ( called from the post / like / comment routes )
+# ============================================================
+
+def record_post(post_id: str, category: str, created_at=None):
+    if TRENDING_ENGINE:
+        engine.record("post", post_id, category=category, at=created_at)
+
+
+def record_like(post_id: str, user_id: str):
+    if TRENDING_ENGINE:
+        engine.like(user_id, post_id)
+
+
+def record_unlike(post_id: str, user_id: str):
+    if TRENDING_ENGINE:
+        engine.unlike(user_id, post_id)
+
+
+def record_comment(post_id: str, delta: int = 1):
+    if TRENDING_ENGINE:
+        engine.record("comment", post_id, count=delta)
+
+
+def remove_post(post_id: str):
+    """deleted post → out of top_post_ids right away, not at the next reconcile"""
+    if TRENDING_ENGINE:
+        engine.remove(post_id)
+
+
+def top_post_ids(limit: int, offset: int = 0, category: Optional[str] = None) -> Optional[List[str]]:
+    """None → engine disabled or still cold, use the database RPC"""
+    if not TRENDING_ENGINE or not engine.warm:
+        return None
+    return engine.top(limit, offset, category)
+
+
+# ============================================================
+# RECONCILIATION ( startup task )
+# ============================================================
+
+async def reconcile():
+    started = time.time()
+    since = datetime.now(timezone.utc) - timedelta(hours=WINDOW_HOURS)
+
+    res = await supabase.rpc(
+        "trending_snapshot",
+        {
+            "p_since": since.isoformat(),
+            "p_half_life_hours": HALF_LIFE_HOURS,
+            "p_post_weight": engine.weights["post"],
+            "p_like_weight": engine.weights["like"],
+            "p_comment_weight": engine.weights["comment"],
+        },
+    ).execute()
+    engine.load_snapshot(res.data or [], at=started)
+
+
+async def _reconcile_loop():
+    while True:
+        try:
+            await reconcile()
+        except Exception:
+            # stays on the previous snapshot ( or cold → RPC fallback )
+            logger.exception("TRENDING_RECONCILE_ERROR")
+        await asyncio.sleep(RECONCILE_SECONDS)
+
+
+_task: Optional[asyncio.Task] = None
+
+
+def start():
+    global _task
+    if TRENDING_ENGINE and _task is None:
+        _task = asyncio.get_running_loop().create_task(_reconcile_loop())
+
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,36 @@
+import os
+from typing import Dict, Iterable, Optional
+
+from ..repositories.user_repository import UserRepository
+from ..utils.ttl_cache import TTLCache
+
+
+# ============================================================
+# AUTHOR MINI-CARDS  {user_id, user_name, full_name, profile_img_url}
+# - hot authors show up on every feed / comment / follow page,
+#   so their cards are cached per process ( TTL + LRU )
+# - get_cards(ids) → cache hits + ONE users query for the misses
+# - update_profile calls invalidate(user_id); other workers pick
+#   the change up within USER_CARD_TTL_SECONDS
+# ============================================================
+
+USER_CARD_TTL_SECONDS = float(os.getenv("USER_CARD_TTL_SECONDS", 120))
+
+card_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CARD_CACHE_SIZE", 20000)),
+    ttl=USER_CARD_TTL_SECONDS,
+)
+
+
+def invalidate(user_id: str):
+    card_cache.invalidate(user_id)
+
+
+async def get_cards(user_ids: Iterable[str]) -> Dict[str, Optional[dict]]:
+    """user_id -> card ( None for unknown users ); returned cards are copies"""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+
+    cards = await card_cache.get_many_or_load(user_ids, UserRepository.get_user_cards)
+    return {uid: dict(cards[uid]) if uid in cards else None for uid in user_ids}
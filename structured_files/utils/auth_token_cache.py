@@ -0,0 +1,57 @@
+import hashlib
+import os
+import time
+from typing import Optional
+
+from .ttl_cache import TTLCache
+
+
+# ============================================================
+# VERIFIED AUTH TOKEN CACHE ( per process )
+# - auth tokens live a week and are sent on every request, so the
+#   RS256 verify result is kept: sha256(token) -> decoded payload
+# - an entry expires at the token's own `exp` ( or earlier with
+#   AUTH_TOKEN_CACHE_MAX_TTL_SECONDS ), so expired tokens always go
+#   back through jwt.decode and get the normal "Auth expired"
+# - only successful verifications are stored; the raw token never is
+# - clear() drops every cached verification ( e.g. after removing a
+#   signing key ); tokens can't be revoked one by one yet, a
+#   per-user hook belongs here once they can
+# ============================================================
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 50000))
+MAX_TTL_SECONDS = float(os.getenv("AUTH_TOKEN_CACHE_MAX_TTL_SECONDS", 7 * 24 * 3600))
+
+token_cache = TTLCache(maxsize=AUTH_TOKEN_CACHE_SIZE, ttl=MAX_TTL_SECONDS)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def get(token: str) -> Optional[dict]:
+    payload = token_cache.get(_digest(token))
+    if payload is not None:
+        token_cache.hits += 1
+        return payload
+
+    token_cache.misses += 1
+    return None
+
+
+def put(token: str, payload: dict):
+    exp = payload.get("exp")
+    if exp is None:
+        return
+
+    ttl = min(float(exp) - time.time(), token_cache.ttl)
+    if ttl > 0:
+        token_cache.set(_digest(token), payload, ttl=ttl)
+
+
+def clear():
+    token_cache.clear()
+
+
+def stats() -> dict:
+    return token_cache.stats()
@@ -0,0 +1,62 @@
+import base64
+import hashlib
+import math
+
+
+# ============================================================
+# BLOOM FILTER
+# - fixed size bitset sized for `capacity` items at `error_rate`
+#   false positives ( 10k ids @ 1% ≈ 12 KB )
+# - no false negatives: an added id is ALWAYS reported as seen
+# - k bit positions per item via double hashing of one blake2b digest
+# ============================================================
+
+class BloomFilter:
+
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, items):
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def saturated(self) -> bool:
+        """past capacity the false-positive rate climbs above error_rate"""
+        return self.count >= self.capacity
+
+    # ---------------- serialization ( supabase seen store ) ----------------
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "count": self.count,
+            "bits": base64.b64encode(bytes(self.bits)).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BloomFilter":
+        bloom = cls(data["capacity"], data["error_rate"])
+        bloom.bits = bytearray(base64.b64decode(data["bits"]))
+        bloom.count = data["count"]
+        return bloom
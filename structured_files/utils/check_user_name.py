@@ -17,7 +17,7 @@ async def check_username(payload: UsernameCheckPayload):
 
     try:
         # Query Supabase for existing username
-        response = supabase.table("users").select("user_id").eq("user_name", user_name).execute()
+        response = await supabase.table("users").select("user_id").eq("user_name", user_name).execute()
 
         if response.data:  # Username exists
             return {"available": False, "message": "Username already taken"}
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import time
+from contextlib import contextmanager
+
+# max queries one request keeps in flight at once ( protects the shared pool )
+FANOUT_LIMIT = int(os.getenv("FANOUT_LIMIT", 6))
+
+
+async def gather_bounded(*aws, limit: int = FANOUT_LIMIT):
+    """asyncio.gather, but never more than `limit` awaitables running at once"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+
+class StageTimer:
+    """Per-stage wall-clock timings ( ms ) for the debug output of an endpoint"""
+
+    def __init__(self):
+        self.timings = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    async def timed(self, name: str, aw):
+        with self.stage(name):
+            return await aw
+
+    def report(self) -> dict:
+        return {
+            "timings_ms": self.timings,
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 2),
+        }
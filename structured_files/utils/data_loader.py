@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+from ..services import user_cards
+
+
+# ============================================================
+# DATA LOADER
+# - load(key) calls made in the same event-loop tick are merged
+#   into ONE batch_fn(keys) call ( e.g. one .in_() query )
+# - results are memoized for the life of the loader, so create
+#   one loader per request ( see get_loaders below )
+# ============================================================
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+
+    def __init__(self, batch_fn: BatchFn, max_batch_size: int = 200):
+        self._batch_fn = batch_fn
+        self._max_batch_size = max_batch_size
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        if key in self._futures:
+            return self._futures[key]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+        self._queue.append(key)
+
+        # first key of this tick → dispatch once everything queued
+        # in the current tick has had a chance to call load()
+        if len(self._queue) == 1:
+            loop.call_soon(self._dispatch)
+
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> list:
+        return list(await asyncio.gather(*(self.load(k) for k in keys)))
+
+    def _dispatch(self):
+        keys, self._queue = self._queue, []
+        for i in range(0, len(keys), self._max_batch_size):
+            asyncio.ensure_future(self._run_batch(keys[i:i + self._max_batch_size]))
+
+    async def _run_batch(self, keys: List[Hashable]):
+        try:
+            results = await self._batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                # drop failed keys so a later load() can retry
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(results.get(key))
+
+
+# ============================================================
+# REQUEST SCOPED LOADERS ( FastAPI dependency )
+# ============================================================
+
+class RequestLoaders:
+
+    def __init__(self):
+        # user_id -> {user_id, user_name, full_name, profile_img_url} | None
+        # ( backed by the process-wide card cache )
+        self.users = DataLoader(user_cards.get_cards)
+
+
+def get_loaders() -> RequestLoaders:
+    return RequestLoaders()
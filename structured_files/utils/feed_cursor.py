@@ -0,0 +1,37 @@
+import base64
+import json
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+# ============================================================
+# OPAQUE KEYSET CURSOR ( created_at, post_id )
+# - clients just echo back the next_cursor they were given
+# - (created_at desc, post_id desc) is a total order, so the
+#   next page is an index seek that new posts can't shift
+# ============================================================
+
+def encode_cursor(post: dict) -> str:
+    raw = json.dumps({"created_at": post["created_at"], "post_id": post["post_id"]})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return {"created_at": data["created_at"], "post_id": data["post_id"]}
+    except Exception:
+        raise HTTPException(status_code=400, detail="INVALID_CURSOR")
+
+
+
+def after_cursor_filter(cursor: Optional[dict]) -> Optional[str]:
+    """PostgREST or_() filter for rows strictly after the cursor in (created_at desc, post_id desc)"""
+    if not cursor:
+        return None
+
+    # quoted → the ':' and '+' of the timestamp survive the or=(...) syntax
+    ts = f'"{cursor["created_at"]}"'
+    pid = cursor["post_id"]
+    return f"created_at.lt.{ts},and(created_at.eq.{ts},post_id.lt.{pid})"
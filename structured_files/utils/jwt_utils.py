@@ -1,11 +1,9 @@
 import jwt
 from datetime import datetime, timedelta,timezone
 from fastapi import HTTPException
-from .rsa_keys import PRIVATE_KEY, PUBLIC_KEY
+from .token_engine import engine
 
-
-
-ALGORITHM = "RS256"
+# signing key / algorithm come from the key ring ( utils/token_engine.py )
 
 #create the token ----------------------------
 
@@ -14,7 +12,7 @@ def create_auth_token(user_id: str):
         "user_id": user_id,
         "exp": datetime.utcnow() + timedelta(weeks=1)
     }
-    return jwt.encode(payload, PRIVATE_KEY, algorithm=ALGORITHM)
+    return engine.encode(payload)
 
 
 def create_refresh_token(user_id: str):
@@ -22,7 +20,7 @@ def create_refresh_token(user_id: str):
         "user_id": user_id,
         "exp": datetime.utcnow() + timedelta(days=30)
     }
-    return jwt.encode(payload, PRIVATE_KEY, algorithm=ALGORITHM)
+    return engine.encode(payload)
 
 #verify the token -------------------------------
 
@@ -30,7 +28,7 @@ def create_refresh_token(user_id: str):
 
 def verify_auth_token(token: str):
     try:
-        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[ALGORITHM])
+        payload = engine.decode(token)
         return payload
     except jwt.ExpiredSignatureError:
         return None  # auth expired → frontend must use refresh token
@@ -40,7 +38,7 @@ def verify_auth_token(token: str):
 
 def verify_refresh_token(token: str):
     try:
-        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[ALGORITHM])
+        payload = engine.decode(token)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Refresh token expired")
@@ -55,13 +53,13 @@ def create_verification_token(user_id: str) -> str:
         "user_id": user_id,
         "exp": datetime.now(timezone.utc) + timedelta(minutes=10)
     }
-    token = jwt.encode(payload, PRIVATE_KEY, algorithm="RS256")
+    token = engine.encode(payload)
     return token
 
 def verify_verification_token(token: str) -> str:
    
     try:
-        payload = jwt.decode(token, PUBLIC_KEY, algorithms=["RS256"])
+        payload = engine.decode(token)
         return payload["user_id"]
     except jwt.ExpiredSignatureError:
         raise Exception("Verification token has expired")
@@ -25,7 +25,7 @@ async def resend_otp(payload: OTPResendPayload):
 
    
     user_resp = (
-        supabase.table("users")
+        await supabase.table("users")
         .select("user_id, user_name, user_email, verified")
         .eq("user_email", payload.user_email)
         .limit(1)
@@ -44,7 +44,7 @@ async def resend_otp(payload: OTPResendPayload):
     otp_expiry = datetime.utcnow() + timedelta(minutes=10)
 
     # 3️⃣ Update user record
-    supabase.table("users").update({
+    await supabase.table("users").update({
         "otp": otp,
         "otp_expiry": otp_expiry.isoformat()
     }).eq("user_id", user["user_id"]).execute() 
@@ -0,0 +1,194 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from argon2 import PasswordHasher
+from fastapi import HTTPException
+
+
+# ============================================================
+# PASSWORD HASHING EXECUTOR
+# - argon2 hash / verify cost tens of ms of CPU; run on the event
+#   loop they stall every other request of the worker, so they run
+#   on a dedicated pool instead
+# - at most PASSWORD_HASH_WORKERS run at once, at most
+#   PASSWORD_HASH_MAX_QUEUE wait behind them; past that the request
+#   is rejected right away with 503 + Retry-After ( a login storm
+#   must not turn into minutes of queueing )
+# - PASSWORD_HASH_EXECUTOR=thread ( default, argon2-cffi releases
+#   the GIL while hashing ) or process ( isolated CPU, small pickling
+#   cost per call )
+# - argon2 exceptions ( VerifyMismatchError, ... ) reach the caller
+#   unchanged
+#
+# ONE shared hasher for the whole app, cost from the environment:
+#   ARGON2_TIME_COST / ARGON2_MEMORY_COST ( KiB ) / ARGON2_PARALLELISM
+#   ( unset → argon2-cffi defaults ); pick them with
+#   `python -m benchmarks.argon2_calibrate --target-ms 250` on the
+#   production hardware. Stored hashes with other parameters keep
+#   verifying and are upgraded on the next login ( needs_rehash ).
+# ============================================================
+
+EXECUTOR_KIND = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", WORKERS * 8))
+RETRY_AFTER_SECONDS = 1
+
+ARGON2_ENV = {
+    "time_cost": "ARGON2_TIME_COST",
+    "memory_cost": "ARGON2_MEMORY_COST",
+    "parallelism": "ARGON2_PARALLELISM",
+}
+
+
+def hasher_from_env() -> PasswordHasher:
+    params = {name: int(os.environ[env]) for name, env in ARGON2_ENV.items() if os.getenv(env)}
+    return PasswordHasher(**params)
+
+
+ph = hasher_from_env()
+
+
+def needs_rehash(hashed: str) -> bool:
+    """stored hash made with other parameters than the current hasher"""
+    try:
+        return ph.check_needs_rehash(hashed)
+    except Exception:
+        # not an argon2 hash we can read → verify already decided
+        return False
+
+
+def calibrate(target_ms: float, memory_cost: int = 65536, parallelism: int = 4,
+              max_time_cost: int = 20, min_memory_cost: int = 19456, samples: int = 3) -> dict:
+    """
+    Largest time_cost whose hash time stays within target_ms on THIS
+    machine; memory is halved ( not below min_memory_cost, OWASP's
+    19 MiB ) when even time_cost=1 is over budget.
+    """
+    def measure(t, m):
+        hasher = PasswordHasher(time_cost=t, memory_cost=m, parallelism=parallelism)
+        runs = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            hasher.hash("calibration password")
+            runs.append((time.perf_counter() - start) * 1000)
+        return sorted(runs)[len(runs) // 2]
+
+    while measure(1, memory_cost) > target_ms and memory_cost // 2 >= min_memory_cost:
+        memory_cost //= 2
+
+    best_t, best_ms = 1, measure(1, memory_cost)
+    for t in range(2, max_time_cost + 1):
+        ms = measure(t, memory_cost)
+        if ms > target_ms:
+            break
+        best_t, best_ms = t, ms
+
+    return {
+        "time_cost": best_t,
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+        "hash_ms": round(best_ms, 1),
+    }
+
+
+# ---------------- run inside the pool ----------------
+
+def _hash(password: str) -> str:
+    return ph.hash(password)
+
+
+def _verify(hashed: str, password: str) -> bool:
+    return ph.verify(hashed, password)
+
+
+# ---------------- event loop side ----------------
+
+class HashingPool:
+
+    def __init__(self, kind: str = EXECUTOR_KIND, workers: int = WORKERS, max_queue: int = MAX_QUEUE):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self.running = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+
+    def _ensure(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="argon2")
+            self._slots = asyncio.Semaphore(self.workers)
+
+    async def run(self, fn, *args):
+        self._ensure()
+
+        if self.running + self.queued >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, please retry",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+        queued_at = time.perf_counter()
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+
+        started = time.perf_counter()
+        self._wait_total += started - queued_at
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._run_total += time.perf_counter() - started
+            self._slots.release()
+
+    def stats(self) -> dict:
+        done = self.completed or 1
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self._wait_total / done * 1000, 2),
+            "avg_run_ms": round(self._run_total / done * 1000, 2),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+pool = HashingPool()
+
+
+async def hash_password(password: str) -> str:
+    return await pool.run(_hash, password)
+
+
+async def verify_password(hashed: str, password: str) -> bool:
+    """True, or raises argon2 VerifyMismatchError / VerificationError / InvalidHashError"""
+    return await pool.run(_verify, hashed, password)
@@ -28,7 +28,7 @@ def _generate_candidate() -> str:
     return letters + numbers
 
 
-def generate_referral_id() -> str:
+async def generate_referral_id() -> str:
     """
     Generates a unique refer_id with DB check and safety fallback.
     """
@@ -36,7 +36,7 @@ def generate_referral_id() -> str:
         refer_id = _generate_candidate()
 
         exists = (
-            supabase.table("users")
+            await supabase.table("users")
             .select("user_id")
             .eq("refer_id", refer_id)
             .limit(1)
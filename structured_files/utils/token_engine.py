@@ -0,0 +1,124 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from .rsa_keys import PRIVATE_KEY, PUBLIC_KEY
+
+
+# ============================================================
+# TOKEN ENGINE ( JWT sign / verify with a key ring )
+# - every key is parsed ONCE at import into a cryptography key
+#   object; PyJWT gets the object, not the PEM, on each call
+# - RS256 / ES256 / EdDSA keys live side by side, picked by the
+#   `kid` header: new tokens are signed with JWT_SIGNING_KID, any
+#   key in the ring can verify
+# - each key is pinned to its algorithm ( no alg confusion )
+# - tokens without a kid ( issued before the ring ) verify with the
+#   legacy PRIVATE_KEY / PUBLIC_KEY pair, kid JWT_LEGACY_KID
+#
+# key ring: JWT_KEYRING ( JSON ) or JWT_KEYRING_FILE ( path to JSON )
+#   [{"kid": "es-2026-01", "alg": "ES256",
+#     "private_key": "<PEM, optional>", "public_key": "<PEM>"}, ...]
+# rotation: add the new key → point JWT_SIGNING_KID at it → drop
+#   the private_key of the old one → remove it after its tokens expire
+# ============================================================
+
+LEGACY_KID = os.getenv("JWT_LEGACY_KID", "legacy-rs256")
+SIGNING_KID = os.getenv("JWT_SIGNING_KID", LEGACY_KID)
+
+KEY_TYPES = {
+    "RS256": (rsa.RSAPrivateKey, rsa.RSAPublicKey),
+    "ES256": (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey),
+    "EdDSA": (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey),
+}
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    alg: str
+    public_key: Any
+    private_key: Optional[Any] = None   # None → verify only ( retired key )
+
+
+def _as_bytes(pem) -> bytes:
+    if isinstance(pem, bytes):
+        return pem
+    # .env values often carry literal "\n"
+    return pem.replace("\\n", "\n").encode()
+
+
+def load_key(kid: str, alg: str, public_pem, private_pem=None) -> SigningKey:
+    if alg not in KEY_TYPES:
+        raise ValueError(f"JWT key {kid}: unsupported alg {alg}")
+    private_type, public_type = KEY_TYPES[alg]
+
+    private_key = None
+    if private_pem:
+        private_key = serialization.load_pem_private_key(_as_bytes(private_pem), password=None)
+        if not isinstance(private_key, private_type):
+            raise ValueError(f"JWT key {kid}: private key does not match {alg}")
+
+    if public_pem:
+        public_key = serialization.load_pem_public_key(_as_bytes(public_pem))
+    elif private_key is not None:
+        public_key = private_key.public_key()
+    else:
+        raise ValueError(f"JWT key {kid}: no key material")
+
+    if not isinstance(public_key, public_type):
+        raise ValueError(f"JWT key {kid}: public key does not match {alg}")
+
+    return SigningKey(kid=kid, alg=alg, public_key=public_key, private_key=private_key)
+
+
+class TokenEngine:
+
+    def __init__(self, keys: List[SigningKey], signing_kid: str, default_kid: Optional[str] = None):
+        self.keys: Dict[str, SigningKey] = {k.kid: k for k in keys}
+        self.default_kid = default_kid
+
+        signing = self.keys.get(signing_kid)
+        if signing is None or signing.private_key is None:
+            raise ValueError(f"JWT signing key {signing_kid} missing or has no private key")
+        self.signing = signing
+
+    def encode(self, payload: dict) -> str:
+        key = self.signing
+        return jwt.encode(payload, key.private_key, algorithm=key.alg, headers={"kid": key.kid})
+
+    def decode(self, token: str) -> dict:
+        """jwt.decode semantics: raises ExpiredSignatureError / InvalidTokenError"""
+        kid = jwt.get_unverified_header(token).get("kid") or self.default_kid
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key {kid}")
+        return jwt.decode(token, key.public_key, algorithms=[key.alg])
+
+
+def _keyring_config() -> List[dict]:
+    raw = os.getenv("JWT_KEYRING")
+    path = os.getenv("JWT_KEYRING_FILE")
+    if path:
+        with open(path) as f:
+            raw = f.read()
+    return json.loads(raw) if raw else []
+
+
+def load_engine() -> TokenEngine:
+    keys = []
+    if PUBLIC_KEY or PRIVATE_KEY:
+        keys.append(load_key(LEGACY_KID, "RS256", PUBLIC_KEY, PRIVATE_KEY))
+
+    for entry in _keyring_config():
+        keys.append(load_key(entry["kid"], entry["alg"], entry.get("public_key"), entry.get("private_key")))
+
+    return TokenEngine(keys, signing_kid=SIGNING_KID, default_kid=LEGACY_KID)
+
+
+engine = load_engine()
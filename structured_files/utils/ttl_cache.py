@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# ============================================================
+# TTL + LRU CACHE ( per process )
+# - entries expire after `ttl` seconds
+# - at most `maxsize` entries, least recently used dropped first
+# - get_or_set is single flight: concurrent misses on the same
+#   key share ONE loader call instead of stampeding the database
+# - get_many_or_load does the same for batches: ONE loader call for
+#   the misses, keys another batch is loading are waited for
+# - values are returned as stored → callers must not mutate them
+# ============================================================
+
+_MISSING = object()
+
+
+class TTLCache:
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()   # key -> (expires_at, value)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._batch_inflight: Dict[Hashable, asyncio.Future] = {}   # key -> value | _MISSING
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    async def get_or_set(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # the load runs in its own task, not in the first caller's,
+            # so cancelling any caller ( the first included ) leaves it
+            # running for the others
+            inflight = asyncio.ensure_future(loader())
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda task: self._loaded(key, task, ttl))
+
+        # shield → one cancelled waiter doesn't cancel the shared load
+        return await asyncio.shield(inflight)
+
+    def _loaded(self, key: Hashable, task: asyncio.Future, ttl: Optional[float]):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # .exception() also marks it retrieved when nobody waits anymore
+        if not task.cancelled() and task.exception() is None:
+            self.set(key, task.result(), ttl)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        """(hits {key: value}, missing keys), counted in hits / misses"""
+        found, missing = {}, []
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    async def get_many_or_load(self, keys: Iterable[Hashable],
+                               loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+                               ttl: Optional[float] = None) -> Dict[Hashable, Any]:
+        """
+        {key: value} for the keys found: cache hits + ONE loader(missing)
+        call, which returns {key: value} for the keys it knows
+        """
+        found, missing = self.get_many(dict.fromkeys(keys))
+
+        waiting = {key: self._batch_inflight[key] for key in missing if key in self._batch_inflight}
+        to_load = [key for key in missing if key not in waiting]
+        if to_load:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in to_load}
+            self._batch_inflight.update(futures)
+            # own task, like get_or_set: a cancelled caller doesn't cancel the load
+            task = asyncio.ensure_future(loader(to_load))
+            task.add_done_callback(lambda done: self._batch_loaded(futures, done, ttl))
+            waiting.update(futures)
+
+        if waiting:
+            values = await asyncio.shield(asyncio.gather(*waiting.values()))
+            found.update((key, value) for key, value in zip(waiting, values) if value is not _MISSING)
+        return found
+
+    def _batch_loaded(self, futures: Dict[Hashable, asyncio.Future], task: asyncio.Future, ttl: Optional[float]):
+        for key, future in futures.items():
+            if self._batch_inflight.get(key) is future:
+                del self._batch_inflight[key]
+
+        if task.cancelled():
+            for future in futures.values():
+                future.cancel()
+            return
+
+        error = task.exception()
+        if error is not None:
+            for future in futures.values():
+                future.set_exception(error)
+                # nobody may be waiting anymore, don't log "never retrieved"
+                future.exception()
+            return
+
+        loaded = task.result()
+        for key, future in futures.items():
+            value = loaded.get(key, _MISSING)
+            if value is not _MISSING:
+                self.set(key, value, ttl)
+            future.set_result(value)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
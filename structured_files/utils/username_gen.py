@@ -11,18 +11,17 @@ from ..config.supabase_config import supabase
 
 
 
-def generate_unique_username():
+async def generate_unique_username():
     MAX_ATTEMPTS = 10
 
     for _ in range(MAX_ATTEMPTS):
         username = f"user_{random.randint(100000, 999999)}"
         exists = (
-            supabase.table("users")
+            await supabase.table("users")
             .select("user_id")
             .ilike("user_name", username)
             .execute()
-            .data
-        )
+        ).data
         if not exists:
             return username
 